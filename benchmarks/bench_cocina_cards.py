@@ -0,0 +1,135 @@
+"""
+Benchmark: coste de refresco del tablero de cocina con 200 tickets.
+
+Compara la reconstrucción completa (todas las tarjetas se destruyen y se
+vuelven a crear, como antes) con la reconciliación por orden_id/detalle_id
+cuando no cambia nada, cuando cambia un ticket y cuando cambian 10.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_cocina_cards.py [num_tickets] [repeticiones]
+"""
+import copy
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+import app.db.connection as connection  # noqa: E402
+
+ESTADOS = ("pendiente", "preparando", "listo")
+
+
+def generar_tickets(num: int):
+    ordenes = []
+    detalle_id = 1
+    for orden_id in range(1, num + 1):
+        items = []
+        for j in range(3):
+            items.append({
+                "detalle_id": detalle_id,
+                "nombre": f"Item {detalle_id}",
+                "cantidad": j + 1,
+                "estado_cocina": ESTADOS[(orden_id + j) % 2],
+            })
+            detalle_id += 1
+        ordenes.append({
+            "orden_id": orden_id,
+            "mesa_nombre": f"Mesa {orden_id}",
+            "cliente_nombre": f"Cliente {orden_id}",
+            "fecha": "2026-01-01 12:00:00",
+            "minutos_transcurridos": orden_id % 30,
+            "items": items,
+        })
+    return ordenes
+
+
+def con_cambios(ordenes, num_cambios: int):
+    """Copia de los tickets con `num_cambios` items avanzados de estado."""
+    nuevas = copy.deepcopy(ordenes)
+    for orden in nuevas[:num_cambios]:
+        item = orden["items"][0]
+        item["estado_cocina"] = ESTADOS[(ESTADOS.index(item["estado_cocina"]) + 1) % 3]
+    return nuevas
+
+
+def medir(app, vista, preparar, refrescar, repeticiones: int):
+    latencias = []
+    for _ in range(repeticiones):
+        preparar(vista)
+        app.processEvents()
+        inicio = time.perf_counter()
+        refrescar(vista)
+        # Incluir destrucción diferida y layout
+        app.processEvents()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def main():
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.DB_PATH = Path(tmp) / "bench.db"
+        from app.db.init_db import inicializar_base_datos
+        inicializar_base_datos()
+
+        from app.db.cambios import ObservadorCambios
+        from app.views import cambios_dispatcher
+        from app.views.cocina.cocina_view import CocinaView
+
+        # El observador por defecto apunta a config.DB_PATH, no a la BD temporal
+        cambios_dispatcher._dispatcher = cambios_dispatcher.CambiosDispatcher(
+            ObservadorCambios(connection.DB_PATH)
+        )
+
+        app = QApplication.instance() or QApplication([])
+        vista = CocinaView()
+        vista.resize(1280, 900)
+        vista.show()
+
+        conteos = {"pendiente": 0, "preparando": 0, "listo": 0}
+        base = generar_tickets(num)
+        un_cambio = con_cambios(base, 1)
+        diez_cambios = con_cambios(base, 10)
+
+        def cargar_base(v):
+            v.renderizar(base, conteos)
+
+        def reconstruir(v):
+            # Comportamiento anterior: destruir todas las tarjetas y recrearlas
+            for orden_id in list(v._cards):
+                v._quitar_card(orden_id)
+            v._orden_grid = []
+            v.renderizar(base, conteos)
+
+        casos = (
+            ("reconstrucción completa", cargar_base, reconstruir),
+            ("reconciliar, sin cambios", cargar_base, lambda v: v.renderizar(base, conteos)),
+            ("reconciliar, 1 cambio", cargar_base, lambda v: v.renderizar(un_cambio, conteos)),
+            ("reconciliar, 10 cambios", cargar_base, lambda v: v.renderizar(diez_cambios, conteos)),
+        )
+        for etiqueta, preparar, refrescar in casos:
+            lat = sorted(medir(app, vista, preparar, refrescar, repeticiones))
+            print(
+                f"{etiqueta:26s} tickets={num} "
+                f"media={statistics.mean(lat):.2f} ms "
+                f"p50={lat[len(lat) // 2]:.2f} ms "
+                f"max={lat[-1]:.2f} ms"
+            )
+
+        vista.close()
+        cambios_dispatcher.detener_dispatcher()
+        connection.cerrar_conexiones_pool()
+
+
+if __name__ == "__main__":
+    main()
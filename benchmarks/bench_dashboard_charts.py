@@ -0,0 +1,129 @@
+"""
+Benchmark: coste por refresco de los gráficos del dashboard.
+
+Compara el render completo (figura nueva en cada refresco, como antes;
+reproducido aquí con render_sales_chart/render_table_status) con los
+gráficos persistentes que solo actualizan sus artistas, tanto con datos
+que cambian como con datos iguales (refresco sin cambios).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_dashboard_charts.py [num_refrescos]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Sequence, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from app.views.dashboard import dashboard_charts  # noqa: E402
+
+MESES = ["Ene", "Feb", "Mar", "Abr", "May", "Jun", "Jul", "Ago", "Sep", "Oct", "Nov", "Dic"]
+SALES_SIZE = (600, 300)
+TABLE_SIZE = (300, 300)
+
+
+# ---- Render anterior: una figura nueva por refresco ----
+
+
+def render_sales_chart(
+    months: Sequence[str],
+    sales: Sequence[float],
+    size_px: Tuple[int, int] = (0, 0),
+    dpi: float = dashboard_charts.DEFAULT_DPI,
+):
+    """Gráfico de barras de ventas mensuales."""
+    figure = dashboard_charts._new_figure(size_px, dashboard_charts.SALES_FIGSIZE, dpi)
+    ax = figure.add_subplot(111)
+    bars = ax.bar(months, sales, color="#42A5F5", edgecolor="#1976D2", linewidth=1.5)
+    for bar in bars:
+        bar.set_alpha(0.8)
+    dashboard_charts._style_sales_axes(ax)
+    figure.tight_layout()
+    return dashboard_charts.figure_to_qimage(figure)
+
+
+def render_table_status(
+    libres: int,
+    ocupadas: int,
+    reservadas: int,
+    size_px: Tuple[int, int] = (0, 0),
+    dpi: float = dashboard_charts.DEFAULT_DPI,
+):
+    """Gráfico de dona con el estado de las mesas."""
+    figure = dashboard_charts._new_figure(size_px, dashboard_charts.TABLE_FIGSIZE, dpi)
+    ax = figure.add_subplot(111)
+    sizes = [libres, ocupadas, reservadas]
+    ax.pie(
+        sizes,
+        colors=dashboard_charts.TABLE_COLORS,
+        startangle=90,
+        wedgeprops=dict(width=0.4, edgecolor=dashboard_charts.BG_COLOR, linewidth=2),
+    )
+    ax.text(0, 0, str(sum(sizes)), ha="center", va="center",
+            fontsize=18, fontweight="bold", color="#ffffff")
+    ax.text(0, -0.3, "Total", ha="center", va="center", fontsize=10, color="#cccccc")
+    figure.tight_layout()
+    return dashboard_charts.figure_to_qimage(figure)
+
+
+def datos(i: int, cambiar: bool):
+    rnd = random.Random(i if cambiar else 0)
+    ventas = tuple((mes, round(rnd.uniform(500, 5000), 2)) for mes in MESES)
+    mesas = (rnd.randint(0, 20), rnd.randint(0, 20), rnd.randint(0, 5))
+    return ventas, mesas
+
+
+def medir_render_completo(num: int, cambiar: bool):
+    latencias = []
+    for i in range(num):
+        ventas, mesas = datos(i, cambiar)
+        inicio = time.perf_counter()
+        render_sales_chart([m for m, _ in ventas], [v for _, v in ventas], SALES_SIZE)
+        render_table_status(*mesas, TABLE_SIZE)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def medir_persistente(num: int, cambiar: bool):
+    sales_chart = dashboard_charts.SalesChart()
+    table_chart = dashboard_charts.TableStatusChart()
+    # Primer dibujo (creación de la figura) fuera de la medición
+    ventas, mesas = datos(-1, True)
+    sales_chart.update(ventas, SALES_SIZE)
+    table_chart.update(mesas, TABLE_SIZE)
+
+    latencias = []
+    for i in range(num):
+        ventas, mesas = datos(i, cambiar)
+        inicio = time.perf_counter()
+        sales_chart.update(ventas, SALES_SIZE)
+        table_chart.update(mesas, TABLE_SIZE)
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return latencias
+
+
+def main():
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    casos = (
+        ("completo, datos nuevos", medir_render_completo, True),
+        ("completo, mismos datos", medir_render_completo, False),
+        ("persistente, datos nuevos", medir_persistente, True),
+        ("persistente, mismos datos", medir_persistente, False),
+    )
+    for etiqueta, funcion, cambiar in casos:
+        lat = sorted(funcion(num, cambiar))
+        print(
+            f"{etiqueta:28s} refrescos={num} "
+            f"media={statistics.mean(lat):.3f} ms "
+            f"p50={lat[len(lat) // 2]:.3f} ms "
+            f"max={lat[-1]:.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
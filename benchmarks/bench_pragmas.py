@@ -0,0 +1,60 @@
+"""
+Benchmark: latencia de commit con la configuración por defecto de SQLite
+frente al perfil de ajuste de config.DB_PRAGMAS (WAL, synchronous=NORMAL, ...).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_pragmas.py [num_commits]
+"""
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from app.config import DB_PRAGMAS  # noqa: E402
+from app.db.connection import aplicar_pragmas  # noqa: E402
+
+
+def medir(db_path: Path, pragmas, num_commits: int):
+    conn = sqlite3.connect(str(db_path))
+    if pragmas:
+        aplicar_pragmas(conn, pragmas)
+    conn.execute(
+        "CREATE TABLE ordenes (id INTEGER PRIMARY KEY, cliente_nombre TEXT, total REAL, fecha TIMESTAMP)"
+    )
+    conn.commit()
+
+    latencias = []
+    for i in range(num_commits):
+        inicio = time.perf_counter()
+        conn.execute(
+            "INSERT INTO ordenes (cliente_nombre, total, fecha) VALUES (?, ?, datetime('now'))",
+            (f"Cliente {i}", 10.0 + i),
+        )
+        conn.commit()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    modo = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    conn.close()
+    return modo, latencias
+
+
+def main():
+    num_commits = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        for etiqueta, pragmas in (("por defecto", None), ("perfil", DB_PRAGMAS)):
+            modo, lat = medir(Path(tmp) / f"{etiqueta}.db", pragmas, num_commits)
+            lat.sort()
+            print(
+                f"{etiqueta:12s} journal={modo:8s} commits={num_commits} "
+                f"media={statistics.mean(lat):.3f} ms "
+                f"p50={lat[len(lat) // 2]:.3f} ms "
+                f"p99={lat[int(len(lat) * 0.99) - 1]:.3f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
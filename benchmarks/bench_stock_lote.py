@@ -0,0 +1,114 @@
+"""
+Benchmark: ajustes de stock por lotes de 1000 productos (p. ej. el conteo
+de inventario nocturno).
+
+Compara:
+  - el motor anterior (lectura previa + un UPDATE por producto),
+  - ajustar_stock llamado una vez por producto (una transacción cada uno),
+  - aplicar_cambios_stock_atomic (un executemany con guarda + diario),
+  - registrar_conteo (conteo físico: stock absoluto por producto).
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/bench_stock_lote.py [num_productos] [repeticiones]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import app.db.connection as connection  # noqa: E402
+
+
+def crear_productos(num: int):
+    with connection.ConnectionManager() as conn:
+        cur = conn.cursor()
+        cur.executemany(
+            "INSERT INTO productos (nombre, precio, stock) VALUES (?, ?, ?)",
+            [(f"Producto {i}", 1.0, 1000) for i in range(num)],
+        )
+        cur.execute(
+            "INSERT INTO movimientos_stock (producto_id, cantidad, motivo) "
+            "SELECT id, stock, 'alta' FROM productos"
+        )
+        return [r[0] for r in cur.execute("SELECT id FROM productos ORDER BY id")]
+
+
+def motor_anterior(cambios):
+    """Reproducción del aplicar_cambios_stock_atomic anterior."""
+    with connection.ConnectionManager() as conn:
+        cur = conn.cursor()
+        ids = list(cambios)
+        placeholders = ",".join("?" for _ in ids)
+        cur.execute(f"SELECT id, stock FROM productos WHERE id IN ({placeholders})", ids)
+        stocks = {r[0]: r[1] for r in cur.fetchall()}
+        for pid, diff in cambios.items():
+            if diff > 0 and stocks[pid] < diff:
+                conn.rollback()
+                return False
+        for pid, diff in cambios.items():
+            cur.execute("UPDATE productos SET stock = stock - ? WHERE id = ?", (diff, pid))
+    return True
+
+
+def medir(funcion, repeticiones: int):
+    latencias = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        latencias.append((time.perf_counter() - inicio) * 1000)
+    return sorted(latencias)
+
+
+def main():
+    num = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.DB_PATH = Path(tmp) / "bench.db"
+        from app.db.init_db import inicializar_base_datos
+        inicializar_base_datos()
+
+        from app.services.inventario_service import ajustar_stock, registrar_conteo
+        from app.services.stock_service import aplicar_cambios_stock_atomic, auditar_stock
+
+        ids = crear_productos(num)
+        rng = random.Random(42)
+
+        def diffs():
+            # Consumos y reposiciones pequeñas que se compensan entre rondas
+            return {pid: rng.choice((-2, -1, 1, 2)) for pid in ids}
+
+        def ajustes_individuales():
+            for pid, diff in diffs().items():
+                ajustar_stock(pid, -diff)
+
+        def conteo():
+            registrar_conteo({pid: 1000 + rng.randint(-5, 5) for pid in ids}, "bench")
+
+        casos = (
+            ("motor anterior (1 UPDATE/producto)", lambda: motor_anterior(diffs())),
+            ("ajustar_stock x producto", ajustes_individuales),
+            ("aplicar_cambios_stock_atomic", lambda: aplicar_cambios_stock_atomic(diffs())),
+            ("registrar_conteo", conteo),
+        )
+        for etiqueta, funcion in casos:
+            lat = medir(funcion, repeticiones)
+            print(
+                f"{etiqueta:36s} productos={num} "
+                f"media={statistics.mean(lat):.2f} ms "
+                f"p50={lat[len(lat) // 2]:.2f} ms "
+                f"max={lat[-1]:.2f} ms"
+            )
+
+        # El motor anterior no escribe en el diario
+        print(f"productos descuadrados (por el motor anterior): {len(auditar_stock())}")
+        connection.cerrar_conexiones_pool()
+
+
+if __name__ == "__main__":
+    main()
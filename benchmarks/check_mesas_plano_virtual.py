@@ -0,0 +1,117 @@
+"""
+Comprobación: el plano de mesas cruza el umbral del plano virtual en ambos
+sentidos sin perder la colocación de los widgets.
+
+Con el umbral bajado a 20 mesas: parte de las 10 mesas iniciales (plano con
+widgets), agrega mesas hasta pasar al plano virtual y las vuelve a borrar.
+Al regresar, cada MesaWidget recreado debe estar en el grid de su sección
+(no suelto en scroll_content, pintado en (0,0)). Muestra además cuánto
+tarda cada transición.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/check_mesas_plano_virtual.py [mesas_extra]
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+# Debe fijarse antes de importar app.config
+os.environ["APP_MESAS_VIRTUAL_UMBRAL"] = "20"
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+import app.db.connection as connection  # noqa: E402
+
+
+def widgets_mal_colocados(vista):
+    """Ids de las mesas cuyo widget no está en el grid de su sección."""
+    fallos = []
+    for mesa_id, widget in vista._widgets_por_id.items():
+        grupo = vista._grupos.get(widget.seccion_id)
+        if grupo is None:
+            fallos.append(mesa_id)
+            continue
+        box, inner = grupo
+        if inner.indexOf(widget) < 0 or widget.parentWidget() is not box:
+            fallos.append(mesa_id)
+    return fallos
+
+
+def refrescar(app, vista, etiqueta):
+    inicio = time.perf_counter()
+    vista.actualizar_mesas()
+    # Incluir destrucción diferida y layout
+    app.processEvents()
+    ms = (time.perf_counter() - inicio) * 1000
+    modo = "virtual" if vista._plano_virtual_activo else "widgets"
+    print(
+        f"{etiqueta:28s} mesas={len(vista._all_mesas_cache):4d} plano={modo:8s} "
+        f"widgets={len(vista._widgets_por_id):4d} {ms:.2f} ms"
+    )
+
+
+def main() -> int:
+    extra = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+
+    with tempfile.TemporaryDirectory() as tmp:
+        connection.DB_PATH = Path(tmp) / "check.db"
+        from app.db.init_db import inicializar_base_datos
+        inicializar_base_datos()
+
+        from app.db.cambios import ObservadorCambios
+        from app.views import cambios_dispatcher
+        from app.views.mesas.mesas_view import MesasView
+
+        # El observador por defecto apunta a config.DB_PATH, no a la BD temporal
+        cambios_dispatcher._dispatcher = cambios_dispatcher.CambiosDispatcher(
+            ObservadorCambios(connection.DB_PATH)
+        )
+
+        app = QApplication.instance() or QApplication([])
+        vista = MesasView()
+        vista.resize(1280, 900)
+        vista.show()
+        app.processEvents()
+
+        errores = []
+        refrescar(app, vista, "inicial")
+        if vista._plano_virtual_activo or widgets_mal_colocados(vista):
+            errores.append("el plano inicial no coloca todas las mesas")
+
+        with connection.ConnectionManager() as conn:
+            seccion_id = conn.execute("SELECT id FROM secciones ORDER BY id LIMIT 1").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO mesas (numero, seccion_id, estado) VALUES (?, ?, 'libre')",
+                [(f"Extra {i}", seccion_id) for i in range(extra)],
+            )
+        refrescar(app, vista, "sobre el umbral")
+        if not vista._plano_virtual_activo or vista._widgets_por_id:
+            errores.append("sobre el umbral no se activó el plano virtual")
+
+        with connection.ConnectionManager() as conn:
+            conn.execute("DELETE FROM mesas WHERE numero LIKE 'Extra %'")
+        refrescar(app, vista, "de vuelta bajo el umbral")
+        mal = widgets_mal_colocados(vista)
+        if vista._plano_virtual_activo:
+            errores.append("bajo el umbral sigue activo el plano virtual")
+        if mal:
+            errores.append(f"mesas fuera del grid de su sección: {sorted(mal)}")
+
+        vista.close()
+        cambios_dispatcher.detener_dispatcher()
+        connection.cerrar_conexiones_pool()
+
+    for error in errores:
+        print(f"ERROR: {error}")
+    if not errores:
+        print("OK: los widgets vuelven a su sección al salir del plano virtual")
+    return 1 if errores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
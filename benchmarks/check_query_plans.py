@@ -0,0 +1,75 @@
+"""
+Comprobación: las consultas por rango de fecha de reportes y dashboard usan
+los índices idx_ordenes_fecha / idx_ordenes_estado_fecha / idx_facturas_fecha
+en lugar de recorrer la tabla completa.
+
+Ejecuta los servicios reales contra una BD temporal, captura el SQL emitido
+y muestra el EXPLAIN QUERY PLAN de cada consulta sobre `fecha`.
+
+Uso (desde la raíz del proyecto):
+    python benchmarks/check_query_plans.py
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from app.db import connection  # noqa: E402
+
+TABLAS_FECHA = re.compile(r"\b(ordenes|facturas)\b")
+SCAN_COMPLETO = re.compile(r"^SCAN (ordenes|facturas|o|f)\b")
+
+
+def main() -> int:
+    tmp = tempfile.mkdtemp()
+    connection.DB_PATH = Path(tmp) / "plan.db"
+
+    from app.db.init_db import inicializar_base_datos
+    from app.services import dashboard_service, reportes_service
+
+    inicializar_base_datos()
+
+    capturadas = []
+    conn = connection.obtener_conexion_pool()
+    conn.set_trace_callback(capturadas.append)
+
+    hoy = date.today()
+    inicio = (hoy - timedelta(days=30)).isoformat()
+    fin = hoy.isoformat()
+    reportes_service.obtener_ventas_por_periodo(inicio, fin)
+    reportes_service.obtener_ventas_diarias(inicio, fin)
+    reportes_service.obtener_productos_mas_vendidos(inicio, fin)
+    reportes_service.obtener_productos_por_ingresos(inicio, fin)
+    reportes_service.calcular_total_ingresos(inicio, fin)
+    reportes_service.obtener_resumen_ventas_dia(fin)
+    dashboard_service.get_today_orders_count()
+    dashboard_service.get_today_sales()
+
+    conn.set_trace_callback(None)
+
+    fallos = 0
+    for sql in capturadas:
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        if not TABLAS_FECHA.search(sql) or "fecha >=" not in sql:
+            continue
+        plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+        primera = " ".join(sql.split())[:90]
+        print(f"\n{primera}...")
+        for linea in plan:
+            print(f"    {linea}")
+        if any(SCAN_COMPLETO.match(linea) for linea in plan):
+            print("    !! recorrido completo de la tabla")
+            fallos += 1
+
+    print(f"\n{'OK' if not fallos else 'FALLO'}: {fallos} consulta(s) sin índice")
+    connection.cerrar_conexiones_pool()
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
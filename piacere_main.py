@@ -20,6 +20,11 @@ if src_path.exists():
 
 # Importar y ejecutar
 if __name__ == "__main__":
+    # Los procesos hijos del ejecutable (hash de contraseñas al migrar)
+    # deben terminar aquí en lugar de abrir otra ventana
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     from PySide6.QtGui import QPalette, QColor
     from PySide6.QtWidgets import QApplication
     from PySide6.QtCore import QTranslator, QLibraryInfo
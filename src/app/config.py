@@ -22,8 +22,35 @@ DB_PATH: Path = BASE_DIR / "data" / "restaurante.db"
 DEBUG: bool = os.environ.get("APP_DEBUG", "1") not in ("0", "False", "false")
 LOG_LEVEL: str = os.environ.get("APP_LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
 
+# Conexiones a la BD: reutilizar una conexión persistente por hilo
+DB_POOL_ENABLED: bool = os.environ.get("APP_DB_POOL", "1") not in ("0", "False", "false")
+
+# Perfil de ajuste aplicado a cada conexión nueva (PRAGMA nombre = valor).
+# WAL permite que cocina, dashboard y caja lean mientras otro escribe;
+# busy_timeout espera el lock en vez de fallar con "database is locked".
+DB_TUNING_ENABLED: bool = os.environ.get("APP_DB_TUNING", "1") not in ("0", "False", "false")
+DB_PRAGMAS = {
+    "busy_timeout": int(os.environ.get("APP_DB_BUSY_TIMEOUT", "5000")),  # ms
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,  # negativo = KiB (~16 MB)
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+# Al facturar, si el stock registrado no alcanza para las recetas de la
+# orden: por defecto la factura se rechaza; con esta opción se descuenta
+# lo disponible y el resto se registra en faltantes_stock para conciliarlo
+# después (p. ej. una entrada de mercancía aún no cargada).
+FACTURAR_CON_FALTANTE_STOCK: bool = os.environ.get("APP_FACTURAR_CON_FALTANTE", "0") not in ("0", "False", "false")
+
 # Opciones de UI / defaults
 DEFAULT_WINDOW_SIZE = (1024, 768)
+
+# A partir de este número de mesas el plano usa la vista virtualizada
+# (modelo + delegado) en lugar de un MesaWidget por mesa
+MESAS_PLANO_VIRTUAL_UMBRAL: int = int(os.environ.get("APP_MESAS_VIRTUAL_UMBRAL", "150"))
 APP_NAME = "Piacere"
 
 
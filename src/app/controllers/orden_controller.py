@@ -66,12 +66,14 @@ def generar_factura_flow(
     orden_id: int,
     cliente: str,
     total: float,
-    numero_factura: str,
+    numero_factura: Optional[str] = None,
     forma_pago: str = "Efectivo",
-) -> Tuple[bool, Optional[str]]:
+) -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Genera factura y cierra la orden.
-    Calcula total_ves usando la tasa del día.
+    Calcula total_ves usando la tasa del día. Sin numero_factura se asigna
+    el siguiente de la secuencia del día.
+    Devuelve (ok, numero_factura, mensaje_error).
     """
     # Obtener tasa del día para calcular total_ves
     from ..services import tasa_cambio_service
@@ -80,10 +82,9 @@ def generar_factura_flow(
     tasa = tasa_obj.tasa if tasa_obj else 1.0
     total_ves = round(total * tasa, 2)
 
-    ok, err = orden_service.insertar_factura(
+    return orden_service.insertar_factura(
         orden_id, numero_factura, cliente, forma_pago, total, total_ves
     )
-    return ok, err
 
 
 def cancelar_orden_flow(orden_id: int) -> Tuple[bool, Optional[str]]:
@@ -0,0 +1,103 @@
+# src/app/db/busqueda.py
+"""
+Índices de búsqueda de texto completo (FTS5).
+
+Tablas FTS5 de contenido externo sobre:
+    menu_items(nombre, descripcion)       -> menu_items_fts
+    facturas(cliente_nombre, numero_factura) -> facturas_fts
+    ordenes(cliente_nombre)               -> ordenes_fts
+
+El tokenizador unicode61 con remove_diacritics ignora mayúsculas y tildes
+("tiramisu" encuentra "Tiramisú"); los índices de prefijo aceleran las
+búsquedas mientras se escribe. Los triggers mantienen cada índice al día en
+la misma transacción que modifica la tabla base.
+
+Si la biblioteca SQLite no incluye FTS5 la migración no crea nada y los
+servicios siguen usando LIKE.
+"""
+import logging
+import re
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+TOKENIZADOR = "unicode61 remove_diacritics 2"
+
+# tabla FTS -> (tabla base, columnas indexadas)
+INDICES_FTS = {
+    "menu_items_fts": ("menu_items", ("nombre", "descripcion")),
+    "facturas_fts": ("facturas", ("cliente_nombre", "numero_factura")),
+    "ordenes_fts": ("ordenes", ("cliente_nombre",)),
+}
+
+# Índices FTS confirmados en esta BD (solo se cachean los positivos)
+_fts_listos = set()
+
+
+def fts5_soportado(cur) -> bool:
+    try:
+        cur.execute("CREATE VIRTUAL TABLE temp._fts5_prueba USING fts5(x)")
+        cur.execute("DROP TABLE temp._fts5_prueba")
+        return True
+    except Exception:
+        return False
+
+
+def _ddl_indice(fts: str, base: str, columnas) -> list:
+    cols = ", ".join(columnas)
+    new_cols = ", ".join(f"new.{c}" for c in columnas)
+    old_cols = ", ".join(f"old.{c}" for c in columnas)
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {cols}, content='{base}', content_rowid='id',
+            tokenize='{TOKENIZADOR}', prefix='2 3'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_ins AFTER INSERT ON {base}
+        BEGIN
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_del AFTER DELETE ON {base}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS trg_{fts}_upd AFTER UPDATE OF {cols} ON {base}
+        BEGIN
+            INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols});
+            INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols});
+        END""",
+    ]
+
+
+def crear_indices_busqueda(cur) -> None:
+    """Crea las tablas FTS5 y sus triggers, y las llena desde las tablas base."""
+    if not fts5_soportado(cur):
+        logger.warning("SQLite sin FTS5: las búsquedas seguirán usando LIKE")
+        return
+    for fts, (base, columnas) in INDICES_FTS.items():
+        for sql in _ddl_indice(fts, base, columnas):
+            cur.execute(sql)
+        cur.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def fts_listo(conn, fts: str) -> bool:
+    """Indica si el índice FTS existe en la BD de esta conexión."""
+    if fts in _fts_listos:
+        return True
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)
+    ).fetchone()
+    if row:
+        _fts_listos.add(fts)
+    return bool(row)
+
+
+def consulta_prefijo(termino: str) -> Optional[str]:
+    """
+    Convierte lo que escribe el usuario en una consulta FTS5 de prefijos:
+    "tira mis" -> '"tira"* "mis"*' (todas las palabras, cada una como
+    prefijo). Devuelve None si el término no tiene palabras.
+    """
+    palabras = re.findall(r"\w+", termino or "")
+    if not palabras:
+        return None
+    return " ".join(f'"{p}"*' for p in palabras)
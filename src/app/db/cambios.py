@@ -0,0 +1,115 @@
+# src/app/db/cambios.py
+"""
+Registro de cambios por tabla para refrescar las vistas solo cuando hace falta.
+
+La tabla `cambios` guarda una versión monótona por tabla observada; los
+triggers la incrementan en la misma transacción que modifica la tabla, así
+que cualquier servicio (órdenes, cocina, facturas, mesas...) la mantiene
+sin código adicional.
+
+ObservadorCambios usa una conexión propia y consulta `PRAGMA data_version`,
+que solo cambia cuando otra conexión confirma una transacción: mientras no
+haya escrituras no se lee ninguna tabla. Cuando cambia, compara las
+versiones de `cambios` y devuelve las tablas modificadas.
+"""
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+from ..config import DB_PATH
+
+logger = logging.getLogger(__name__)
+
+# Tablas cuyas modificaciones se notifican a las vistas
+TABLAS_OBSERVADAS = (
+    "ordenes",
+    "orden_detalles",
+    "facturas",
+    "mesas",
+    "secciones",
+    "tasas_cambio",
+    "menu_sections",
+    "menu_items",
+    "menu_item_variant",
+)
+
+_OPERACIONES = ("INSERT", "UPDATE", "DELETE")
+
+
+def crear_registro_cambios(cur) -> None:
+    """Crea la tabla cambios y los triggers de las tablas observadas."""
+    cur.execute(
+        """CREATE TABLE IF NOT EXISTS cambios (
+            tabla TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )"""
+    )
+    for tabla in TABLAS_OBSERVADAS:
+        cur.execute("INSERT OR IGNORE INTO cambios (tabla, version) VALUES (?, 0)", (tabla,))
+        for operacion in _OPERACIONES:
+            cur.execute(
+                f"""CREATE TRIGGER IF NOT EXISTS trg_cambios_{tabla}_{operacion.lower()}
+                AFTER {operacion} ON {tabla}
+                BEGIN
+                    UPDATE cambios SET version = version + 1 WHERE tabla = '{tabla}';
+                END"""
+            )
+
+
+def leer_versiones(conn) -> Dict[str, int]:
+    """Devuelve {tabla: versión} del registro de cambios."""
+    return {tabla: version for tabla, version in conn.execute("SELECT tabla, version FROM cambios")}
+
+
+class ObservadorCambios:
+    """
+    Detecta qué tablas cambiaron desde la última comprobación.
+
+    Uso:
+        observador = ObservadorCambios()
+        tablas = observador.comprobar()  # set() si no hubo commits
+
+    No es thread-safe: se usa desde un único hilo (el de la interfaz).
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else Path(DB_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._data_version: Optional[int] = None
+        self._versiones: Dict[str, int] = {}
+
+    def _conexion(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # Conexión propia en autocommit: data_version solo refleja
+            # commits de otras conexiones y no se retiene ninguna lectura.
+            self._conn = sqlite3.connect(str(self.path), isolation_level=None)
+            self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            self._versiones = leer_versiones(self._conn)
+        return self._conn
+
+    def comprobar(self) -> Set[str]:
+        """Devuelve el conjunto de tablas modificadas desde la última llamada."""
+        try:
+            conn = self._conexion()
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if data_version == self._data_version:
+                return set()
+            self._data_version = data_version
+
+            versiones = leer_versiones(conn)
+            cambiadas = {t for t, v in versiones.items() if self._versiones.get(t) != v}
+            self._versiones = versiones
+            return cambiadas
+        except sqlite3.Error:
+            logger.exception("No se pudo comprobar el registro de cambios")
+            self.cerrar()
+            return set()
+
+    def cerrar(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
@@ -1,13 +1,41 @@
 # src/app/db/connection.py
 from pathlib import Path
 import sqlite3
+import threading
 from sqlite3 import Error
-from typing import Optional
-from ..config import DB_PATH
+from typing import Dict, Optional
+from ..config import DB_PATH, DB_POOL_ENABLED, DB_PRAGMAS, DB_TUNING_ENABLED
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Conexiones persistentes por hilo: {ruta_bd: conexión}
+_pool_local = threading.local()
+
+
+def aplicar_pragmas(conn: sqlite3.Connection, pragmas: Optional[Dict] = None) -> None:
+    """
+    Aplica el perfil de ajuste (config.DB_PRAGMAS) a una conexión.
+    Un PRAGMA que falle se registra y se omite sin invalidar la conexión.
+    """
+    if pragmas is None:
+        if not DB_TUNING_ENABLED:
+            return
+        pragmas = DB_PRAGMAS
+    for nombre, valor in pragmas.items():
+        try:
+            conn.execute(f"PRAGMA {nombre} = {valor}")
+        except Error:
+            logger.warning("PRAGMA %s = %s no aplicado", nombre, valor)
+
+
+def _abrir_conexion(db_path: Path) -> sqlite3.Connection:
+    # timeout en segundos; busy_timeout del perfil lo sobrescribe si está activo
+    conn = sqlite3.connect(str(db_path), timeout=5.0)
+    conn.row_factory = sqlite3.Row
+    aplicar_pragmas(conn)
+    return conn
+
 
 def crear_conexion(path: Optional[Path] = None) -> Optional[sqlite3.Connection]:
     """Crear y devolver una conexión sqlite3; devuelve None en fallo."""
@@ -17,14 +45,75 @@ def crear_conexion(path: Optional[Path] = None) -> Optional[sqlite3.Connection]:
     db_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-        return conn
+        return _abrir_conexion(db_path)
     except Error:
         logger.exception("No se pudo crear la conexión a la BD (%s)", db_path)
         return None
 
 
+def _conexiones_del_hilo() -> Dict[str, sqlite3.Connection]:
+    conexiones = getattr(_pool_local, "conexiones", None)
+    if conexiones is None:
+        conexiones = {}
+        _pool_local.conexiones = conexiones
+        _pool_local.profundidad = {}
+    return conexiones
+
+
+def obtener_conexion_pool(path: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Devuelve la conexión persistente del hilo actual para la BD indicada,
+    creándola la primera vez. La conexión conserva su caché de sentencias
+    y de páginas entre llamadas.
+    """
+    db_path = Path(path) if path else Path(DB_PATH)
+    key = str(db_path)
+    conexiones = _conexiones_del_hilo()
+
+    conn = conexiones.get(key)
+    if conn is not None:
+        return conn
+
+    conn = crear_conexion(db_path)
+    if conn is None:
+        raise Error(f"No se pudo abrir la conexión ({db_path})")
+    conexiones[key] = conn
+    return conn
+
+
+def cerrar_conexiones_pool() -> None:
+    """Cierra las conexiones persistentes del hilo actual (p. ej. al salir)."""
+    conexiones = _conexiones_del_hilo()
+    for key, conn in list(conexiones.items()):
+        try:
+            conn.close()
+        except Error:
+            logger.exception("Error cerrando la conexión (%s)", key)
+    conexiones.clear()
+    _pool_local.profundidad.clear()
+
+
+def _savepoint(nivel: int) -> str:
+    return f"cm_nivel_{nivel}"
+
+
+def revertir_transaccion(conn: sqlite3.Connection) -> None:
+    """
+    Deshace lo escrito en el bloque `with ConnectionManager()` actual sin
+    salir de él, para los caminos de error que devuelven (False, mensaje).
+    En un bloque anidado vuelve a su savepoint y deja intacto lo del bloque
+    exterior; en el bloque exterior (o sin pool) hace rollback.
+    """
+    for key, conexion in _conexiones_del_hilo().items():
+        if conexion is conn:
+            nivel = _pool_local.profundidad.get(key, 0)
+            if nivel > 1:
+                conn.execute(f"ROLLBACK TO {_savepoint(nivel)}")
+                return
+            break
+    conn.rollback()
+
+
 class ConnectionManager:
     """Context manager para conexiones sqlite3.
 
@@ -32,10 +121,22 @@ class ConnectionManager:
         with ConnectionManager() as conn:
             cur = conn.cursor()
             ...
+
+    Con DB_POOL_ENABLED cada hilo reutiliza una conexión persistente y el
+    bloque `with` delimita solo la transacción (commit/rollback al salir).
+    Los bloques anidados en el mismo hilo comparten la transacción del
+    bloque exterior, que es el único que hace commit o rollback; cada
+    bloque anidado es un SAVEPOINT que se libera al salir o se deshace si
+    sale con excepción.
+
+    Dentro del bloque no se llama a conn.commit() ni a conn.rollback()
+    (confirmarían o desharían también la transacción del bloque exterior):
+    para deshacer sin lanzar excepción se usa revertir_transaccion(conn).
     """
 
-    def __init__(self, path: Optional[Path] = None):
+    def __init__(self, path: Optional[Path] = None, pooled: Optional[bool] = None):
         self.path = Path(path) if path else Path(DB_PATH)
+        self.pooled = DB_POOL_ENABLED if pooled is None else pooled
         self.conn: Optional[sqlite3.Connection] = None
 
     def __enter__(self):
@@ -43,8 +144,20 @@ class ConnectionManager:
         self.path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            self.conn = sqlite3.connect(str(self.path))
-            self.conn.row_factory = sqlite3.Row
+            if self.pooled:
+                self.conn = obtener_conexion_pool(self.path)
+                profundidad = _pool_local.profundidad
+                key = str(self.path)
+                nivel = profundidad.get(key, 0) + 1
+                if nivel > 1:
+                    # Bloque anidado: savepoint dentro de la transacción
+                    # exterior (se abre aquí si el exterior aún no escribió)
+                    if not self.conn.in_transaction:
+                        self.conn.execute("BEGIN")
+                    self.conn.execute(f"SAVEPOINT {_savepoint(nivel)}")
+                profundidad[key] = nivel
+            else:
+                self.conn = _abrir_conexion(self.path)
             return self.conn
         except Error:
             logger.exception("No se pudo abrir la conexión (%s)", self.path)
@@ -53,6 +166,9 @@ class ConnectionManager:
     def __exit__(self, exc_type, exc_val, exc_tb):
         if not self.conn:
             return
+        if self.pooled:
+            self._exit_pooled(exc_type)
+            return
         try:
             if exc_type:
                 self.conn.rollback()
@@ -61,3 +177,37 @@ class ConnectionManager:
         finally:
             self.conn.close()
             self.conn = None
+
+    def _exit_pooled(self, exc_type) -> None:
+        profundidad = _pool_local.profundidad
+        key = str(self.path)
+        nivel = profundidad.get(key, 1)
+        profundidad[key] = nivel - 1
+        conn, self.conn = self.conn, None
+        if nivel > 1:
+            # Bloque anidado: la transacción pertenece al bloque exterior
+            nombre = _savepoint(nivel)
+            try:
+                if exc_type:
+                    conn.execute(f"ROLLBACK TO {nombre}")
+                conn.execute(f"RELEASE {nombre}")
+            except Error:
+                logger.exception("Error cerrando el savepoint %s (%s)", nombre, self.path)
+                if not exc_type:
+                    raise
+            return
+        try:
+            if exc_type:
+                conn.rollback()
+            else:
+                conn.commit()
+        except Error:
+            # Conexión inutilizable: descartarla para que se reabra
+            logger.exception("Error finalizando la transacción (%s)", self.path)
+            _conexiones_del_hilo().pop(key, None)
+            try:
+                conn.close()
+            except Error:
+                pass
+            if not exc_type:
+                raise
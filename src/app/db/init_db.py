@@ -1,216 +1,404 @@
 # src/app/db/init_db.py
 from .connection import crear_conexion
+from .rollups import crear_ventas_diarias, crear_ventas_items_diarias
+from .cambios import crear_registro_cambios
+from .busqueda import crear_indices_busqueda
+from .secuencias import crear_secuencias_factura
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from sqlite3 import Error
+from typing import Optional
 import logging
+import os
 
 logger = logging.getLogger(__name__)
 
 
-def migrar_usuarios_agregar_email_y_recovery():
+# ==========================================
+# MIGRACIONES VERSIONADAS (PRAGMA user_version)
+# ==========================================
+# Cada paso recibe un cursor dentro de la transacción común y lanza una
+# excepción si falla. Los pasos se ejecutan en orden y solo una vez: al
+# terminar se guarda su versión en PRAGMA user_version.
+
+
+def migrar_mesas_a_texto(cur) -> None:
     """
-    Migra la tabla usuarios para agregar campos email, reset_token y reset_token_expiry
+    Migra el campo numero de INTEGER a TEXT y convierte los datos existentes
+    al nuevo formato (ej: numero=1 en seccion 'Principal' -> 'Mesa P1')
     """
-    conn = crear_conexion()
-    if not conn:
-        logger.error("No se pudo conectar para migrar usuarios")
-        return False
+    cur.execute("PRAGMA table_info(mesas)")
+    columns = {row[1]: row[2] for row in cur.fetchall()}
 
-    try:
-        cur = conn.cursor()
+    if "numero" not in columns or columns["numero"] != "INTEGER":
+        logger.info("La tabla mesas ya tiene el formato correcto")
+        return
 
-        # Verificar si la tabla usuarios existe y necesita migración
-        cur.execute("PRAGMA table_info(usuarios)")
-        columns = {row[1]: row[2] for row in cur.fetchall()}
+    logger.info("Migrando tabla mesas de INTEGER a TEXT...")
 
-        needs_migration = False
-        if "email" not in columns:
-            logger.info("Agregando campo email a tabla usuarios...")
-            cur.execute("ALTER TABLE usuarios ADD COLUMN email TEXT")
-            needs_migration = True
+    # Obtener todas las mesas actuales con sus secciones
+    cur.execute(
+        """
+        SELECT m.id, m.numero, m.estado, m.seccion_id, s.nombre
+        FROM mesas m
+        LEFT JOIN secciones s ON m.seccion_id = s.id
+    """
+    )
+    mesas_actuales = cur.fetchall()
 
-        if "reset_token" not in columns:
-            logger.info("Agregando campo reset_token a tabla usuarios...")
-            cur.execute("ALTER TABLE usuarios ADD COLUMN reset_token TEXT")
-            needs_migration = True
+    # Crear tabla temporal con el nuevo esquema
+    cur.execute(
+        """
+        CREATE TABLE mesas_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            numero TEXT UNIQUE NOT NULL,
+            estado TEXT NOT NULL DEFAULT 'libre',
+            seccion_id INTEGER NOT NULL,
+            FOREIGN KEY (seccion_id) REFERENCES secciones (id)
+        )
+    """
+    )
 
-        if "reset_token_expiry" not in columns:
-            logger.info("Agregando campo reset_token_expiry a tabla usuarios...")
-            cur.execute("ALTER TABLE usuarios ADD COLUMN reset_token_expiry TIMESTAMP")
-            needs_migration = True
+    # Migrar datos al nuevo formato
+    for mesa_id, numero, estado, seccion_id, seccion_nombre in mesas_actuales:
+        # Obtener inicial de la sección
+        inicial = seccion_nombre[0].upper() if seccion_nombre else "M"
+        nuevo_nombre = f"Mesa {inicial}{numero}"
 
-        if needs_migration:
-            conn.commit()
-            logger.info("Migración de usuarios completada exitosamente")
-        else:
-            logger.info("La tabla usuarios ya tiene todos los campos necesarios")
+        cur.execute(
+            """
+            INSERT INTO mesas_new (id, numero, estado, seccion_id)
+            VALUES (?, ?, ?, ?)
+        """,
+            (mesa_id, nuevo_nombre, estado, seccion_id),
+        )
 
-        return True
+    # Eliminar tabla antigua y renombrar la nueva
+    cur.execute("DROP TABLE mesas")
+    cur.execute("ALTER TABLE mesas_new RENAME TO mesas")
+    logger.info("Migración de mesas completada exitosamente")
 
-    except Error as e:
-        logger.exception(f"Error durante la migración de usuarios: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+
+def migrar_usuarios_agregar_email_y_recovery(cur) -> None:
+    """
+    Migra la tabla usuarios para agregar campos email, reset_token y reset_token_expiry
+    """
+    cur.execute("PRAGMA table_info(usuarios)")
+    columns = {row[1]: row[2] for row in cur.fetchall()}
+
+    if "email" not in columns:
+        logger.info("Agregando campo email a tabla usuarios...")
+        cur.execute("ALTER TABLE usuarios ADD COLUMN email TEXT")
+
+    if "reset_token" not in columns:
+        logger.info("Agregando campo reset_token a tabla usuarios...")
+        cur.execute("ALTER TABLE usuarios ADD COLUMN reset_token TEXT")
+
+    if "reset_token_expiry" not in columns:
+        logger.info("Agregando campo reset_token_expiry a tabla usuarios...")
+        cur.execute("ALTER TABLE usuarios ADD COLUMN reset_token_expiry TIMESTAMP")
 
 
-def migrar_hashear_passwords_existentes():
+def migrar_hashear_passwords_existentes(cur) -> None:
     """
     Migra las contraseñas en texto plano a hash bcrypt/SHA256.
     Detecta contraseñas que no son hash y las convierte.
-    """
-    conn = crear_conexion()
-    if not conn:
-        logger.error("No se pudo conectar para migrar contraseñas")
-        return False
 
-    try:
-        from ..models import Usuario
-        cur = conn.cursor()
+    bcrypt tarda a propósito; con varios usuarios en texto plano los hashes
+    se calculan en paralelo en un ProcessPoolExecutor (el GIL no deja
+    aprovechar hilos). Si el pool no puede arrancar se hashea en serie.
+    """
+    from ..models import Usuario
+
+    cur.execute("SELECT id, clave FROM usuarios")
+    usuarios = cur.fetchall()
+
+    pendientes = []
+    for user_id, clave in usuarios:
+        # Verificar si la contraseña ya está hasheada
+        # Bcrypt empieza con $2
+        # SHA256 tiene exactamente 64 caracteres hexadecimales
+        is_bcrypt = clave.startswith('$2')
+        is_sha256 = len(clave) == 64 and all(c in '0123456789abcdef' for c in clave.lower())
+
+        if not is_bcrypt and not is_sha256:
+            # Es texto plano, convertir a hash
+            logger.info(f"Hasheando contraseña para usuario ID {user_id}...")
+            pendientes.append((user_id, clave))
+
+    if not pendientes:
+        logger.info("Migración de contraseñas completada: 0 contraseñas hasheadas")
+        return
+
+    claves = [clave for _, clave in pendientes]
+    hashes = None
+    if len(claves) > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=min(len(claves), os.cpu_count() or 1)) as pool:
+                hashes = list(pool.map(Usuario.hash_password, claves))
+        except (OSError, BrokenProcessPool) as e:
+            logger.warning("No se pudo hashear en paralelo, se hace en serie: %s", e)
+    if hashes is None:
+        hashes = [Usuario.hash_password(clave) for clave in claves]
 
-        # Obtener todos los usuarios
-        cur.execute("SELECT id, clave FROM usuarios")
-        usuarios = cur.fetchall()
-
-        passwords_migrated = 0
-        for user_id, clave in usuarios:
-            # Verificar si la contraseña ya está hasheada
-            # Bcrypt empieza con $2
-            # SHA256 tiene exactamente 64 caracteres hexadecimales
-            is_bcrypt = clave.startswith('$2')
-            is_sha256 = len(clave) == 64 and all(c in '0123456789abcdef' for c in clave.lower())
-            
-            if not is_bcrypt and not is_sha256:
-                # Es texto plano, convertir a hash
-                logger.info(f"Hasheando contraseña para usuario ID {user_id}...")
-                clave_hash = Usuario.hash_password(clave)
-                cur.execute("UPDATE usuarios SET clave = ? WHERE id = ?", (clave_hash, user_id))
-                passwords_migrated += 1
-
-        if passwords_migrated > 0:
-            conn.commit()
-            logger.info(f"Migración de contraseñas completada: {passwords_migrated} contraseñas hasheadas")
-        else:
-            logger.info("Todas las contraseñas ya están hasheadas correctamente")
+    cur.executemany(
+        "UPDATE usuarios SET clave = ? WHERE id = ?",
+        [(clave_hash, user_id) for (user_id, _), clave_hash in zip(pendientes, hashes)],
+    )
 
-        return True
+    logger.info(f"Migración de contraseñas completada: {len(pendientes)} contraseñas hasheadas")
 
-    except Error as e:
-        logger.exception(f"Error durante la migración de contraseñas: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
 
-
-def migrar_mesas_a_texto():
+def migrar_orden_detalles_agregar_estado_cocina(cur) -> None:
     """
-    Migra el campo numero de INTEGER a TEXT y convierte los datos existentes
-    al nuevo formato (ej: numero=1 en seccion 'Principal' -> 'Mesa P1')
+    Migra la tabla orden_detalles para agregar el campo estado_cocina
     """
-    conn = crear_conexion()
-    if not conn:
-        logger.error("No se pudo conectar para migrar mesas")
-        return False
+    cur.execute("PRAGMA table_info(orden_detalles)")
+    columns = {row[1]: row[2] for row in cur.fetchall()}
 
-    try:
-        cur = conn.cursor()
+    if "estado_cocina" not in columns:
+        logger.info("Agregando campo estado_cocina a tabla orden_detalles...")
+        cur.execute("ALTER TABLE orden_detalles ADD COLUMN estado_cocina TEXT DEFAULT 'pendiente'")
 
-        # Verificar si la tabla mesas existe y tiene el formato antiguo
-        cur.execute("PRAGMA table_info(mesas)")
-        columns = {row[1]: row[2] for row in cur.fetchall()}
 
-        if "numero" in columns and columns["numero"] == "INTEGER":
-            logger.info("Migrando tabla mesas de INTEGER a TEXT...")
+def crear_indices_fecha(cur) -> None:
+    """
+    Índices para los filtros por rango de fecha de reportes y dashboard
+    (fecha >= ? AND fecha < ?).
+    """
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_ordenes_fecha ON ordenes(fecha)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_ordenes_estado_fecha ON ordenes(estado, fecha)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_facturas_fecha ON facturas(fecha)")
 
-            # Obtener todas las mesas actuales con sus secciones
-            cur.execute(
-                """
-                SELECT m.id, m.numero, m.estado, m.seccion_id, s.nombre
-                FROM mesas m
-                LEFT JOIN secciones s ON m.seccion_id = s.id
-            """
-            )
-            mesas_actuales = cur.fetchall()
-
-            # Crear tabla temporal con el nuevo esquema
-            cur.execute(
-                """
-                CREATE TABLE mesas_new (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    numero TEXT UNIQUE NOT NULL,
-                    estado TEXT NOT NULL DEFAULT 'libre',
-                    seccion_id INTEGER NOT NULL,
-                    FOREIGN KEY (seccion_id) REFERENCES secciones (id)
-                )
-            """
-            )
 
-            # Migrar datos al nuevo formato
-            for mesa_id, numero, estado, seccion_id, seccion_nombre in mesas_actuales:
-                # Obtener inicial de la sección
-                inicial = seccion_nombre[0].upper() if seccion_nombre else "M"
-                nuevo_nombre = f"Mesa {inicial}{numero}"
+def crear_indice_cocina(cur) -> None:
+    """
+    Índice cubriente para la pantalla de cocina: el filtro por estado de
+    las líneas de cada orden se resuelve solo con el índice.
+    """
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_orden_detalles_orden_estado "
+        "ON orden_detalles(orden_id, estado_cocina)"
+    )
 
-                cur.execute(
-                    """
-                    INSERT INTO mesas_new (id, numero, estado, seccion_id)
-                    VALUES (?, ?, ?, ?)
-                """,
-                    (mesa_id, nuevo_nombre, estado, seccion_id),
-                )
 
-            # Eliminar tabla antigua y renombrar la nueva
-            cur.execute("DROP TABLE mesas")
-            cur.execute("ALTER TABLE mesas_new RENAME TO mesas")
+def crear_indices_paginacion_facturas(cur) -> None:
+    """
+    Índices para recorrer facturas por páginas ordenadas por cliente, total
+    o total en Bs (fecha y número ya tienen índice). El id va implícito en
+    cada índice, así que la condición (columna, id) < (?, ?) es un rango.
+    """
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_facturas_cliente ON facturas(cliente_nombre)"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_facturas_total ON facturas(total)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_facturas_total_ves ON facturas(total_ves)")
 
-            conn.commit()
-            logger.info("Migración de mesas completada exitosamente")
-            return True
-        else:
-            logger.info("La tabla mesas ya tiene el formato correcto")
-            return True
 
-    except Error as e:
-        logger.exception(f"Error durante la migración: {e}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
+def _fk_on_delete(cur, tabla: str, columna: str) -> Optional[str]:
+    """Acción ON DELETE de la FK de tabla.columna (None si no tiene FK)."""
+    for fk in cur.execute(f"PRAGMA foreign_key_list({tabla})").fetchall():
+        if fk[3] == columna:
+            return fk[6]
+    return None
 
 
-def migrar_orden_detalles_agregar_estado_cocina():
+def _reconstruir_tabla(cur, tabla: str, ddl: str) -> None:
     """
-    Migra la tabla orden_detalles para agregar el campo estado_cocina
+    Reemplaza `tabla` por la definida en `ddl` (plantilla con {tabla}, mismas
+    columnas en el mismo orden) conservando filas, ids e índices. Requiere
+    las FKs desactivadas, como en ejecutar_migraciones.
     """
-    conn = crear_conexion()
-    if not conn:
-        logger.error("No se pudo conectar para migrar orden_detalles")
-        return False
+    cur.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (tabla,),
+    )
+    indices = [row[0] for row in cur.fetchall()]
+    cur.execute(ddl.format(tabla=f"{tabla}_new"))
+    cur.execute(f"INSERT INTO {tabla}_new SELECT * FROM {tabla}")
+    cur.execute(f"DROP TABLE {tabla}")
+    cur.execute(f"ALTER TABLE {tabla}_new RENAME TO {tabla}")
+    for sql in indices:
+        cur.execute(sql)
+
+
+# El diario no se borra con el producto: los productos con movimientos se
+# dan de baja lógica (productos.activo = 0)
+MOVIMIENTOS_STOCK_DDL = """CREATE TABLE IF NOT EXISTS {tabla} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    producto_id INTEGER NOT NULL,
+    cantidad INTEGER NOT NULL,
+    motivo TEXT NOT NULL,
+    referencia TEXT DEFAULT NULL,
+    fecha TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    FOREIGN KEY (producto_id) REFERENCES productos (id) ON DELETE RESTRICT
+)"""
+
+
+def crear_movimientos_stock(cur) -> None:
+    """
+    Diario de movimientos de inventario (solo se agregan filas). `cantidad`
+    es el cambio con signo del stock (positivo entra, negativo sale), así
+    que SUM(cantidad) por producto reproduce productos.stock. El stock
+    existente se registra como saldo inicial.
+    """
+    cur.execute(MOVIMIENTOS_STOCK_DDL.format(tabla="movimientos_stock"))
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_movimientos_stock_producto_fecha "
+        "ON movimientos_stock(producto_id, fecha)"
+    )
+    cur.execute(
+        """INSERT INTO movimientos_stock (producto_id, cantidad, motivo)
+        SELECT id, stock, 'saldo_inicial' FROM productos WHERE stock != 0"""
+    )
+
+
+# Un producto usado en recetas no se puede borrar: los platos dejarían de
+# consumirlo sin aviso (inventario_service.eliminar_producto lo informa)
+RECETAS_DDL = """CREATE TABLE IF NOT EXISTS {tabla} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    menu_item_id INTEGER NOT NULL,
+    variant_id INTEGER DEFAULT NULL,
+    producto_id INTEGER NOT NULL,
+    cantidad INTEGER NOT NULL CHECK (cantidad > 0),
+    FOREIGN KEY (menu_item_id) REFERENCES menu_items (id) ON DELETE CASCADE,
+    FOREIGN KEY (variant_id) REFERENCES menu_item_variant (id) ON DELETE CASCADE,
+    FOREIGN KEY (producto_id) REFERENCES productos (id) ON DELETE RESTRICT
+)"""
+
+
+def crear_recetas(cur) -> None:
+    """
+    Recetas: ingredientes (productos de inventario) de cada item del menú.
+    Las filas con variant_id NULL son la receta base del item; si una
+    variante tiene filas propias, estas reemplazan a la receta base.
+    `cantidad` va en la unidad de stock del producto.
+    """
+    cur.execute(RECETAS_DDL.format(tabla="recetas"))
+    cur.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_recetas_item_variante_producto "
+        "ON recetas(menu_item_id, COALESCE(variant_id, 0), producto_id)"
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_recetas_variante ON recetas(variant_id) "
+        "WHERE variant_id IS NOT NULL"
+    )
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_recetas_producto ON recetas(producto_id)")
+    # Para reponer el consumo exacto de una orden al anular su factura
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_movimientos_stock_referencia "
+        "ON movimientos_stock(referencia)"
+    )
+
+
+def proteger_movimientos_stock(cur) -> None:
+    """
+    El diario de stock sobrevive a la baja de un producto: la FK pasa de
+    ON DELETE CASCADE a RESTRICT y productos recibe la columna `activo`
+    para la baja lógica de los productos con movimientos.
+    """
+    if _fk_on_delete(cur, "movimientos_stock", "producto_id") != "RESTRICT":
+        logger.info("Reconstruyendo movimientos_stock con ON DELETE RESTRICT...")
+        _reconstruir_tabla(cur, "movimientos_stock", MOVIMIENTOS_STOCK_DDL)
 
-    try:
-        cur = conn.cursor()
+    cur.execute("PRAGMA table_info(productos)")
+    columns = {row[1] for row in cur.fetchall()}
+    if "activo" not in columns:
+        logger.info("Agregando campo activo a tabla productos...")
+        cur.execute("ALTER TABLE productos ADD COLUMN activo INTEGER NOT NULL DEFAULT 1")
 
-        # Verificar si la columna ya existe
-        cur.execute("PRAGMA table_info(orden_detalles)")
-        columns = {row[1]: row[2] for row in cur.fetchall()}
 
-        if "estado_cocina" not in columns:
-            logger.info("Agregando campo estado_cocina a tabla orden_detalles...")
-            cur.execute("ALTER TABLE orden_detalles ADD COLUMN estado_cocina TEXT DEFAULT 'pendiente'")
-            conn.commit()
-            logger.info("Migración de orden_detalles completada exitosamente")
-        else:
-            logger.info("La tabla orden_detalles ya tiene el campo estado_cocina")
+def proteger_recetas_y_crear_faltantes(cur) -> None:
+    """
+    recetas.producto_id pasa de ON DELETE CASCADE a RESTRICT, y se crea
+    faltantes_stock: lo que una venta debió consumir y no había en stock
+    cuando se factura con config.FACTURAR_CON_FALTANTE_STOCK.
+    """
+    if _fk_on_delete(cur, "recetas", "producto_id") != "RESTRICT":
+        logger.info("Reconstruyendo recetas con ON DELETE RESTRICT...")
+        _reconstruir_tabla(cur, "recetas", RECETAS_DDL)
 
+    cur.execute(
+        """CREATE TABLE IF NOT EXISTS faltantes_stock (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            producto_id INTEGER NOT NULL,
+            cantidad INTEGER NOT NULL CHECK (cantidad > 0),
+            referencia TEXT DEFAULT NULL,
+            fecha TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+            FOREIGN KEY (producto_id) REFERENCES productos (id) ON DELETE RESTRICT
+        )"""
+    )
+    cur.execute(
+        "CREATE INDEX IF NOT EXISTS idx_faltantes_stock_referencia "
+        "ON faltantes_stock(referencia)"
+    )
+
+
+# Registro ordenado: (versión, descripción, función). Solo se agregan pasos
+# al final; nunca se renumeran los existentes.
+MIGRACIONES = [
+    (1, "mesas.numero INTEGER -> TEXT", migrar_mesas_a_texto),
+    (2, "usuarios: email y recuperación", migrar_usuarios_agregar_email_y_recovery),
+    (3, "usuarios: hashear contraseñas en texto plano", migrar_hashear_passwords_existentes),
+    (4, "orden_detalles: estado_cocina", migrar_orden_detalles_agregar_estado_cocina),
+    (5, "índices de fecha en ordenes y facturas", crear_indices_fecha),
+    (6, "rollup ventas_diarias mantenido por triggers", crear_ventas_diarias),
+    (7, "rollup ventas_items_diarias por item de menú", crear_ventas_items_diarias),
+    (8, "índice orden_detalles(orden_id, estado_cocina)", crear_indice_cocina),
+    (9, "registro de cambios por tabla (notificación a vistas)", crear_registro_cambios),
+    (10, "índices FTS5 de menú, facturas y órdenes", crear_indices_busqueda),
+    (11, "índices de paginación de facturas (cliente, total)", crear_indices_paginacion_facturas),
+    (12, "diario de movimientos de stock", crear_movimientos_stock),
+    (13, "recetas de items del menú (ingredientes de inventario)", crear_recetas),
+    (14, "secuencias de numeración de facturas por serie y día", crear_secuencias_factura),
+    (15, "movimientos_stock: FK RESTRICT y baja lógica de productos", proteger_movimientos_stock),
+    (16, "recetas: FK RESTRICT de productos; faltantes_stock", proteger_recetas_y_crear_faltantes),
+    # Repite el paso 11 (idempotente) para agregar idx_facturas_total_ves
+    (17, "índice de paginación de facturas por total en Bs", crear_indices_paginacion_facturas),
+    # Repite el paso 9 (idempotente) para los triggers de las tablas del menú
+    (18, "registro de cambios de menu_sections, menu_items y variantes", crear_registro_cambios),
+]
+
+ESQUEMA_VERSION = MIGRACIONES[-1][0]
+
+
+def obtener_version_esquema(conn) -> int:
+    """Devuelve la versión de esquema guardada en PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def ejecutar_migraciones(conn) -> bool:
+    """
+    Ejecuta los pasos de MIGRACIONES con versión mayor a la actual en una
+    sola transacción y actualiza PRAGMA user_version.
+    No hace nada si el esquema ya está al día.
+    """
+    version_actual = obtener_version_esquema(conn)
+    pendientes = [m for m in MIGRACIONES if m[0] > version_actual]
+    if not pendientes:
         return True
 
-    except Error as e:
-        logger.exception(f"Error durante la migración de orden_detalles: {e}")
+    # Las reconstrucciones de tablas requieren FKs desactivadas, y este
+    # PRAGMA no tiene efecto dentro de una transacción.
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        cur = conn.cursor()
+        cur.execute("BEGIN")
+        for version, descripcion, paso in pendientes:
+            logger.info("Aplicando migración %s: %s", version, descripcion)
+            paso(cur)
+        cur.execute(f"PRAGMA user_version = {pendientes[-1][0]}")
+        conn.commit()
+        logger.info(
+            "Esquema migrado de la versión %s a la %s", version_actual, pendientes[-1][0]
+        )
+        return True
+    except Exception:
+        logger.exception("Error durante las migraciones; se revierten todos los pasos")
         conn.rollback()
         return False
     finally:
-        conn.close()
+        conn.execute("PRAGMA foreign_keys = ON")
 
 
 def inicializar_base_datos() -> bool:
@@ -347,6 +535,10 @@ def inicializar_base_datos() -> bool:
         return False
 
     try:
+        # Esquema al día: no hay nada que crear ni migrar
+        if obtener_version_esquema(conn) >= ESQUEMA_VERSION:
+            return True
+
         cur = conn.cursor()
 
         # Asegurar que SQLite respete FKs
@@ -594,14 +786,8 @@ def inicializar_base_datos() -> bool:
         except Error:
             logger.exception("Error al insertar datos iniciales")
 
-        # Ejecutar migraciones
-        conn.close()
-        migrar_mesas_a_texto()
-        migrar_usuarios_agregar_email_y_recovery()
-        migrar_hashear_passwords_existentes()
-        migrar_orden_detalles_agregar_estado_cocina()
-
-        return True
+        # Ejecutar migraciones pendientes
+        return ejecutar_migraciones(conn)
     except Error:
         logger.exception("Error inicializando la base de datos")
         return False
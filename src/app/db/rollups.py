@@ -0,0 +1,201 @@
+# src/app/db/rollups.py
+"""
+Tablas de resumen (rollups) mantenidas de forma incremental.
+
+ventas_diarias: una fila por (día, forma de pago) con número de facturas y
+totales USD/VES. Los triggers sobre `facturas` la mantienen al día en la
+misma transacción que inserta, modifica o elimina la factura, así que los
+reportes y el dashboard leen ~365 filas por año en vez de todas las
+facturas.
+
+ventas_items_diarias: una fila por (día de la orden, item, variante) con
+cantidad e ingresos de las órdenes cerradas. orden_service.insertar_factura
+la acumula al cerrar la orden y factura_service.eliminar_factura la
+descuenta. variant_id y menu_item_id usan 0 en lugar de NULL para que la
+clave primaria funcione con ON CONFLICT.
+
+Reconstrucción desde el histórico (desde src/):
+    python -m app.db.rollups
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+VENTAS_DIARIAS_DDL = [
+    """CREATE TABLE IF NOT EXISTS ventas_diarias (
+        fecha DATE NOT NULL,
+        forma_pago TEXT NOT NULL,
+        num_facturas INTEGER NOT NULL DEFAULT 0,
+        total_usd REAL NOT NULL DEFAULT 0,
+        total_ves REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (fecha, forma_pago)
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS trg_facturas_ventas_diarias_ins
+    AFTER INSERT ON facturas
+    BEGIN
+        INSERT INTO ventas_diarias (fecha, forma_pago, num_facturas, total_usd, total_ves)
+        VALUES (DATE(NEW.fecha), NEW.forma_pago, 1, NEW.total, NEW.total_ves)
+        ON CONFLICT(fecha, forma_pago) DO UPDATE SET
+            num_facturas = num_facturas + 1,
+            total_usd = total_usd + excluded.total_usd,
+            total_ves = total_ves + excluded.total_ves;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_facturas_ventas_diarias_del
+    AFTER DELETE ON facturas
+    BEGIN
+        UPDATE ventas_diarias SET
+            num_facturas = num_facturas - 1,
+            total_usd = total_usd - OLD.total,
+            total_ves = total_ves - OLD.total_ves
+        WHERE fecha = DATE(OLD.fecha) AND forma_pago = OLD.forma_pago;
+        DELETE FROM ventas_diarias
+        WHERE fecha = DATE(OLD.fecha) AND forma_pago = OLD.forma_pago
+        AND num_facturas <= 0;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS trg_facturas_ventas_diarias_upd
+    AFTER UPDATE OF fecha, forma_pago, total, total_ves ON facturas
+    BEGIN
+        UPDATE ventas_diarias SET
+            num_facturas = num_facturas - 1,
+            total_usd = total_usd - OLD.total,
+            total_ves = total_ves - OLD.total_ves
+        WHERE fecha = DATE(OLD.fecha) AND forma_pago = OLD.forma_pago;
+        DELETE FROM ventas_diarias
+        WHERE fecha = DATE(OLD.fecha) AND forma_pago = OLD.forma_pago
+        AND num_facturas <= 0;
+        INSERT INTO ventas_diarias (fecha, forma_pago, num_facturas, total_usd, total_ves)
+        VALUES (DATE(NEW.fecha), NEW.forma_pago, 1, NEW.total, NEW.total_ves)
+        ON CONFLICT(fecha, forma_pago) DO UPDATE SET
+            num_facturas = num_facturas + 1,
+            total_usd = total_usd + excluded.total_usd,
+            total_ves = total_ves + excluded.total_ves;
+    END""",
+]
+
+
+def crear_ventas_diarias(cur) -> None:
+    """Crea la tabla ventas_diarias y sus triggers, y la llena desde facturas."""
+    for sql in VENTAS_DIARIAS_DDL:
+        cur.execute(sql)
+    reconstruir_ventas_diarias(cur)
+
+
+def reconstruir_ventas_diarias(cur) -> None:
+    """Recalcula ventas_diarias completa a partir de la tabla facturas."""
+    cur.execute("DELETE FROM ventas_diarias")
+    cur.execute(
+        """
+        INSERT INTO ventas_diarias (fecha, forma_pago, num_facturas, total_usd, total_ves)
+        SELECT DATE(fecha), forma_pago, COUNT(*),
+               COALESCE(SUM(total), 0), COALESCE(SUM(total_ves), 0)
+        FROM facturas
+        GROUP BY DATE(fecha), forma_pago
+        """
+    )
+
+
+VENTAS_ITEMS_DIARIAS_DDL = [
+    """CREATE TABLE IF NOT EXISTS ventas_items_diarias (
+        fecha DATE NOT NULL,
+        menu_item_id INTEGER NOT NULL,
+        variant_id INTEGER NOT NULL DEFAULT 0,
+        cantidad INTEGER NOT NULL DEFAULT 0,
+        ingresos REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (fecha, menu_item_id, variant_id)
+    )""",
+]
+
+
+def crear_ventas_items_diarias(cur) -> None:
+    """Crea la tabla ventas_items_diarias y la llena desde las órdenes cerradas."""
+    for sql in VENTAS_ITEMS_DIARIAS_DDL:
+        cur.execute(sql)
+    reconstruir_ventas_items_diarias(cur)
+
+
+def acumular_ventas_items(cur, orden_id: int, signo: int = 1) -> None:
+    """
+    Suma (signo=1) o descuenta (signo=-1) las líneas de una orden en
+    ventas_items_diarias con una sola sentencia agregada.
+    Debe llamarse dentro de la transacción que cierra o elimina la orden.
+    """
+    cur.execute(
+        """
+        INSERT INTO ventas_items_diarias (fecha, menu_item_id, variant_id, cantidad, ingresos)
+        SELECT DATE(o.fecha),
+               COALESCE(od.menu_item_id, 0),
+               COALESCE(od.variant_id, 0),
+               ? * SUM(od.cantidad),
+               ? * SUM(od.subtotal)
+        FROM orden_detalles od
+        JOIN ordenes o ON o.id = od.orden_id
+        WHERE od.orden_id = ?
+        GROUP BY 1, 2, 3
+        ON CONFLICT(fecha, menu_item_id, variant_id) DO UPDATE SET
+            cantidad = cantidad + excluded.cantidad,
+            ingresos = ingresos + excluded.ingresos
+        """,
+        (signo, signo, orden_id),
+    )
+    if signo < 0:
+        cur.execute(
+            """
+            DELETE FROM ventas_items_diarias
+            WHERE cantidad <= 0
+            AND fecha = (SELECT DATE(fecha) FROM ordenes WHERE id = ?)
+            """,
+            (orden_id,),
+        )
+
+
+def reconstruir_ventas_items_diarias(cur) -> None:
+    """Recalcula ventas_items_diarias a partir de las órdenes cerradas."""
+    cur.execute("DELETE FROM ventas_items_diarias")
+    cur.execute(
+        """
+        INSERT INTO ventas_items_diarias (fecha, menu_item_id, variant_id, cantidad, ingresos)
+        SELECT DATE(o.fecha),
+               COALESCE(od.menu_item_id, 0),
+               COALESCE(od.variant_id, 0),
+               SUM(od.cantidad),
+               COALESCE(SUM(od.subtotal), 0)
+        FROM orden_detalles od
+        JOIN ordenes o ON o.id = od.orden_id
+        WHERE o.estado = 'cerrada'
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+# Rollups registrados: nombre -> función de reconstrucción
+RECONSTRUCTORES = {
+    "ventas_diarias": reconstruir_ventas_diarias,
+    "ventas_items_diarias": reconstruir_ventas_items_diarias,
+}
+
+
+def reconstruir_rollups(conn, nombres=None) -> None:
+    """
+    Reconstruye los rollups indicados (todos por defecto) en una sola
+    transacción sobre la conexión dada.
+    """
+    nombres = list(nombres or RECONSTRUCTORES)
+    cur = conn.cursor()
+    try:
+        for nombre in nombres:
+            logger.info("Reconstruyendo rollup %s...", nombre)
+            RECONSTRUCTORES[nombre](cur)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
+if __name__ == "__main__":
+    import sys
+    from .connection import ConnectionManager
+
+    logging.basicConfig(level=logging.INFO)
+    with ConnectionManager() as conn:
+        reconstruir_rollups(conn, sys.argv[1:] or None)
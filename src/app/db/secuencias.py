@@ -0,0 +1,74 @@
+# src/app/db/secuencias.py
+"""
+Secuencias de numeración de facturas por serie y día.
+
+`secuencias_factura` guarda el último número entregado de cada (serie,
+día). Tomar un número es un UPSERT que incrementa el contador dentro de la
+transacción del llamador: si la factura se inserta en la misma transacción
+la numeración no tiene huecos (un rollback devuelve el número) ni
+colisiones entre cajas, porque SQLite serializa las escrituras.
+
+Para varias terminales se puede reservar un rango de una vez; los números
+reservados que no se usen quedan como huecos de la serie.
+"""
+from typing import Tuple
+
+SERIE_FACTURA = "FACT"
+
+
+def crear_secuencias_factura(cur) -> None:
+    """
+    Crea la tabla de secuencias y la inicializa con el mayor número ya
+    usado por día en facturas con formato FACT-AAAAMMDD-NNNN, para que los
+    números nuevos no choquen con los existentes.
+    """
+    cur.execute(
+        """CREATE TABLE IF NOT EXISTS secuencias_factura (
+            serie TEXT NOT NULL,
+            fecha DATE NOT NULL,
+            ultimo INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (serie, fecha)
+        ) WITHOUT ROWID"""
+    )
+    cur.execute(
+        f"""INSERT OR IGNORE INTO secuencias_factura (serie, fecha, ultimo)
+        SELECT '{SERIE_FACTURA}',
+               substr(numero_factura, 6, 4) || '-' || substr(numero_factura, 10, 2)
+                   || '-' || substr(numero_factura, 12, 2),
+               MAX(CAST(substr(numero_factura, 15) AS INTEGER))
+        FROM facturas
+        WHERE numero_factura GLOB '{SERIE_FACTURA}-[0-9][0-9][0-9][0-9][0-9][0-9][0-9][0-9]-[0-9]*'
+        GROUP BY 2"""
+    )
+
+
+def formatear_numero(serie: str, fecha: str, numero: int) -> str:
+    """FACT, 2026-01-05, 7 -> 'FACT-20260105-0007'."""
+    return f"{serie}-{fecha.replace('-', '')}-{numero:04d}"
+
+
+def reservar_rango(cur, serie: str, fecha: str, cantidad: int = 1) -> Tuple[int, int]:
+    """
+    Reserva `cantidad` números consecutivos de (serie, fecha) dentro de la
+    transacción de `cur` y devuelve (primero, último).
+    """
+    if cantidad <= 0:
+        raise ValueError("La cantidad a reservar debe ser positiva")
+    cur.execute(
+        """INSERT INTO secuencias_factura (serie, fecha, ultimo) VALUES (?, ?, ?)
+        ON CONFLICT(serie, fecha) DO UPDATE SET ultimo = ultimo + excluded.ultimo""",
+        (serie, fecha, cantidad),
+    )
+    # Esta transacción ya tiene el bloqueo de escritura: la lectura es consistente
+    cur.execute(
+        "SELECT ultimo FROM secuencias_factura WHERE serie = ? AND fecha = ?",
+        (serie, fecha),
+    )
+    ultimo = cur.fetchone()[0]
+    return ultimo - cantidad + 1, ultimo
+
+
+def siguiente_numero(cur, serie: str, fecha: str) -> str:
+    """Entrega el siguiente número de factura formateado de (serie, fecha)."""
+    numero, _ = reservar_rango(cur, serie, fecha, 1)
+    return formatear_numero(serie, fecha, numero)
@@ -1,4 +1,5 @@
 import sys
+import multiprocessing
 from PySide6.QtGui import QPalette, QColor
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTranslator, QLibraryInfo
@@ -6,6 +7,8 @@ from PySide6.QtCore import QTranslator, QLibraryInfo
 from .views.login.login import LoginWindow
 from .utils.logging_config import configure_logging
 from .db.init_db import inicializar_base_datos
+from .db.connection import cerrar_conexiones_pool
+from .views.cambios_dispatcher import detener_dispatcher
 from .styles import DARK_STYLES
 
 
@@ -34,8 +37,12 @@ def main():
     login_window = LoginWindow()
     login_window.show()
 
-    sys.exit(app.exec())
+    exit_code = app.exec()
+    detener_dispatcher()
+    cerrar_conexiones_pool()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
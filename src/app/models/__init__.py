@@ -16,6 +16,7 @@ from .mesa import Mesa
 from .menu_section import MenuSection
 from .menu_item import MenuItem
 from .menu_item_variant import MenuItemVariant
+from .menu_catalog import MenuCatalog
 
 # Modelos de órdenes
 from .orden import Orden
@@ -29,6 +30,10 @@ from .tasa_cambio import TasaCambio
 
 # Modelos de inventario
 from .producto import Producto
+from .receta import RecetaIngrediente
+
+# Modelos del dashboard
+from .dashboard_snapshot import DashboardSnapshot
 
 # Exportar todos los modelos
 __all__ = [
@@ -39,9 +44,12 @@ __all__ = [
     'MenuSection',
     'MenuItem',
     'MenuItemVariant',
+    'MenuCatalog',
     'Orden',
     'OrdenDetalle',
     'Factura',
     'TasaCambio',
     'Producto',
+    'RecetaIngrediente',
+    'DashboardSnapshot',
 ]
@@ -0,0 +1,34 @@
+"""
+Modelo de instantánea del Dashboard
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """
+    Métricas del dashboard leídas en una sola transacción de lectura.
+    Inmutable: la vista puede compararla con la anterior para saber si
+    algo cambió (generado_en no participa en la comparación).
+    """
+    tasa: float                      # tasa más reciente registrada
+    tasa_hoy: Optional[float]        # tasa registrada para hoy, si existe
+    ordenes_hoy: int
+    ventas_hoy_usd: float
+    ventas_hoy_ves: float
+    mesas_libres: int
+    mesas_ocupadas: int
+    mesas_reservadas: int
+    ventas_mensuales: Tuple[Tuple[str, float], ...]
+    ultimas_facturas: Tuple[Tuple[str, str, str, str], ...]  # (numero, cliente, monto, hora)
+    generado_en: datetime = field(default_factory=datetime.now, compare=False)
+
+    def estado_mesas(self) -> dict:
+        """Retorna el estado de mesas con las claves de get_table_status"""
+        return {
+            "libre": self.mesas_libres,
+            "ocupado": self.mesas_ocupadas,
+            "reservada": self.mesas_reservadas,
+        }
@@ -0,0 +1,78 @@
+"""
+Modelo del catálogo del menú (secciones, items y variantes)
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .menu_section import MenuSection
+from .menu_item import MenuItem
+from .menu_item_variant import MenuItemVariant
+
+
+@dataclass(frozen=True)
+class MenuCatalog:
+    """
+    Foto completa del menú en un momento dado, identificada por `version`.
+    Las listas conservan el orden de la BD (position, nombre). Los objetos
+    se comparten entre todos los lectores: deben tratarse como de solo
+    lectura.
+    """
+    version: int
+    secciones: Tuple[MenuSection, ...]
+    items: Tuple[MenuItem, ...]
+    variantes: Tuple[MenuItemVariant, ...]
+    _items_por_seccion: Dict[int, List[MenuItem]] = field(
+        init=False, repr=False, compare=False
+    )
+    _items_por_id: Dict[int, MenuItem] = field(init=False, repr=False, compare=False)
+    _variantes_por_item: Dict[int, List[MenuItemVariant]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        por_seccion: Dict[int, List[MenuItem]] = {}
+        for item in self.items:
+            por_seccion.setdefault(item.section_id, []).append(item)
+        por_item: Dict[int, List[MenuItemVariant]] = {}
+        for variante in self.variantes:
+            por_item.setdefault(variante.menu_item_id, []).append(variante)
+        object.__setattr__(self, "_items_por_seccion", por_seccion)
+        object.__setattr__(self, "_items_por_id", {i.id: i for i in self.items})
+        object.__setattr__(self, "_variantes_por_item", por_item)
+
+    def listar_secciones(self, only_active: bool = True) -> List[MenuSection]:
+        if only_active:
+            return [s for s in self.secciones if s.active]
+        return list(self.secciones)
+
+    def obtener_seccion(self, section_id: int) -> Optional[MenuSection]:
+        for seccion in self.secciones:
+            if seccion.id == section_id:
+                return seccion
+        return None
+
+    def items_de_seccion(self, section_id: int, only_disponible: bool = True) -> List[MenuItem]:
+        items = self._items_por_seccion.get(section_id, [])
+        if only_disponible:
+            return [i for i in items if i.disponible]
+        return list(items)
+
+    def obtener_item(self, item_id: int) -> Optional[MenuItem]:
+        return self._items_por_id.get(item_id)
+
+    def variantes_de_item(self, item_id: int, only_active: bool = True) -> List[MenuItemVariant]:
+        variantes = self._variantes_por_item.get(item_id, [])
+        if only_active:
+            return [v for v in variantes if v.active]
+        return list(variantes)
+
+    def buscar_items(self, term: str, only_disponible: bool = True) -> List[MenuItem]:
+        """Búsqueda por nombre (sin distinguir mayúsculas) en todo el menú."""
+        term = (term or "").lower()
+        encontrados = [
+            i
+            for i in self.items
+            if term in (i.nombre or "").lower() and (i.disponible or not only_disponible)
+        ]
+        encontrados.sort(key=lambda i: (i.section_id, i.position or 0, i.nombre))
+        return encontrados
@@ -0,0 +1,24 @@
+"""
+Modelo de Receta (ingredientes de inventario de un item del menú)
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RecetaIngrediente:
+    """Cantidad de un producto de inventario que consume una unidad del item o variante"""
+    id: Optional[int]
+    menu_item_id: int
+    variant_id: Optional[int]  # None = receta base del item
+    producto_id: int
+    cantidad: int  # En la unidad de stock del producto
+    producto_nombre: Optional[str] = None
+
+    def es_de_variante(self) -> bool:
+        """Indica si la fila pertenece a la receta de una variante"""
+        return self.variant_id is not None
+
+    def __str__(self) -> str:
+        nombre = self.producto_nombre or f"Producto {self.producto_id}"
+        return f"{nombre} x {self.cantidad}"
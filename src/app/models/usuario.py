@@ -85,6 +85,11 @@ class Usuario:
             import hashlib
             return hashlib.sha256(password.encode()).hexdigest()
     
+    @staticmethod
+    def necesita_rehash(hashed: str) -> bool:
+        """Indica si el hash es de un formato anterior y debe pasarse a bcrypt"""
+        return bcrypt is not None and not hashed.startswith('$2')
+
     @staticmethod
     def verify_password(password: str, hashed: str) -> bool:
         """Verifica una contraseña contra su hash"""
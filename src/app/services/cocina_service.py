@@ -3,8 +3,7 @@
 Servicio para gestionar el flujo de órdenes en la cocina
 """
 from typing import List, Tuple, Optional, Dict
-from datetime import datetime
-from ..db.connection import ConnectionManager
+from ..db.connection import ConnectionManager, revertir_transaccion
 
 
 def obtener_ordenes_para_cocina() -> List[Dict]:
@@ -30,68 +29,59 @@ def obtener_ordenes_para_cocina() -> List[Dict]:
     """
     with ConnectionManager() as conn:
         cur = conn.cursor()
-        
-        # Obtener órdenes abiertas con items que no estén todos listos
+
+        # Una sola consulta: órdenes abiertas con algún item no listo, con
+        # todas sus líneas, ordenadas por orden y línea. Los minutos se
+        # calculan en SQL (fecha se guarda en hora local).
         cur.execute("""
-            SELECT DISTINCT 
+            SELECT
                 o.id as orden_id,
                 m.numero as mesa_nombre,
                 o.cliente_nombre,
-                o.fecha
+                o.fecha,
+                COALESCE(
+                    CAST((julianday('now', 'localtime') - julianday(o.fecha)) * 1440 AS INTEGER),
+                    0
+                ) as minutos_transcurridos,
+                od.id as detalle_id,
+                COALESCE(mi.nombre, 'Item #' || od.menu_item_id) as nombre,
+                od.cantidad,
+                COALESCE(od.estado_cocina, 'pendiente') as estado_cocina
             FROM ordenes o
             JOIN mesas m ON o.mesa_id = m.id
-            JOIN orden_detalles od ON o.id = od.orden_id
+            JOIN orden_detalles od ON od.orden_id = o.id
+            LEFT JOIN menu_items mi ON od.menu_item_id = mi.id
             WHERE o.estado = 'abierta'
-            AND od.estado_cocina != 'listo'
-            ORDER BY o.fecha ASC
+            AND EXISTS (
+                SELECT 1 FROM orden_detalles p
+                WHERE p.orden_id = o.id AND p.estado_cocina != 'listo'
+            )
+            ORDER BY o.fecha ASC, o.id ASC, od.id ASC
         """)
-        ordenes_rows = cur.fetchall()
-        
+
+        # Agrupar en una pasada: las filas de cada orden llegan contiguas
         result = []
-        for orden_row in ordenes_rows:
-            orden_id, mesa_nombre, cliente_nombre, fecha_str = orden_row
-            
-            # Calcular tiempo transcurrido
-            try:
-                if isinstance(fecha_str, str):
-                    fecha = datetime.fromisoformat(fecha_str.replace(' ', 'T'))
-                else:
-                    fecha = fecha_str
-                minutos = int((datetime.now() - fecha).total_seconds() / 60)
-            except:
-                minutos = 0
-            
-            # Obtener detalles de esta orden
-            cur.execute("""
-                SELECT 
-                    od.id as detalle_id,
-                    COALESCE(mi.nombre, 'Item #' || od.menu_item_id) as nombre,
-                    od.cantidad,
-                    COALESCE(od.estado_cocina, 'pendiente') as estado_cocina
-                FROM orden_detalles od
-                LEFT JOIN menu_items mi ON od.menu_item_id = mi.id
-                WHERE od.orden_id = ?
-                ORDER BY od.id
-            """, (orden_id,))
-            
-            items = []
-            for detalle_row in cur.fetchall():
-                items.append({
-                    'detalle_id': detalle_row[0],
-                    'nombre': detalle_row[1],
-                    'cantidad': detalle_row[2],
-                    'estado_cocina': detalle_row[3] or 'pendiente'
-                })
-            
-            result.append({
-                'orden_id': orden_id,
-                'mesa_nombre': mesa_nombre,
-                'cliente_nombre': cliente_nombre,
-                'fecha': fecha_str,
-                'minutos_transcurridos': minutos,
-                'items': items
+        actual = None
+        for row in cur.fetchall():
+            (orden_id, mesa_nombre, cliente_nombre, fecha_str, minutos,
+             detalle_id, nombre, cantidad, estado_cocina) = row
+            if actual is None or actual['orden_id'] != orden_id:
+                actual = {
+                    'orden_id': orden_id,
+                    'mesa_nombre': mesa_nombre,
+                    'cliente_nombre': cliente_nombre,
+                    'fecha': fecha_str,
+                    'minutos_transcurridos': minutos,
+                    'items': []
+                }
+                result.append(actual)
+            actual['items'].append({
+                'detalle_id': detalle_id,
+                'nombre': nombre,
+                'cantidad': cantidad,
+                'estado_cocina': estado_cocina
             })
-        
+
         return result
 
 
@@ -111,14 +101,13 @@ def cambiar_estado_item(detalle_id: int, nuevo_estado: str) -> Tuple[bool, Optio
                 "UPDATE orden_detalles SET estado_cocina = ? WHERE id = ?",
                 (nuevo_estado, detalle_id)
             )
-            conn.commit()
             
             if cur.rowcount == 0:
                 return False, "Item no encontrado"
             
             return True, None
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e)
 
 
@@ -143,10 +132,9 @@ def marcar_todos_preparando(orden_id: int) -> Tuple[bool, Optional[str]]:
                    WHERE orden_id = ? AND estado_cocina = 'pendiente'""",
                 (orden_id,)
             )
-            conn.commit()
             return True, None
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e)
 
 
@@ -161,10 +149,9 @@ def marcar_todos_listos(orden_id: int) -> Tuple[bool, Optional[str]]:
                    WHERE orden_id = ? AND estado_cocina != 'listo'""",
                 (orden_id,)
             )
-            conn.commit()
             return True, None
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e)
 
 
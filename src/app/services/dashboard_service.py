@@ -6,6 +6,8 @@ Proporciona métricas, estadísticas y datos para visualización.
 from typing import Dict, List, Tuple
 from datetime import datetime
 from ..db.connection import ConnectionManager
+from ..models import DashboardSnapshot
+from ..utils.fechas import rango_dia
 from . import tasa_cambio_service
 
 
@@ -23,7 +25,7 @@ def get_today_orders_count() -> int:
     Cuenta el número de órdenes creadas hoy.
     Retorna el total de órdenes del día.
     """
-    today = datetime.now().date().isoformat()
+    desde, hasta = rango_dia(datetime.now().date())
 
     with ConnectionManager() as conn:
         cur = conn.cursor()
@@ -31,9 +33,9 @@ def get_today_orders_count() -> int:
             """
             SELECT COUNT(*) 
             FROM ordenes 
-            WHERE DATE(fecha) = ?
+            WHERE fecha >= ? AND fecha < ?
         """,
-            (today,),
+            (desde, hasta),
         )
         result = cur.fetchone()
         return result[0] if result else 0
@@ -44,7 +46,7 @@ def get_today_sales() -> Dict[str, float]:
     Obtiene las ventas totales del día en USD y VES.
     Retorna dict con {usd: float, ves: float}
     """
-    today = datetime.now().date().isoformat()
+    desde, hasta = rango_dia(datetime.now().date())
 
     with ConnectionManager() as conn:
         cur = conn.cursor()
@@ -55,9 +57,9 @@ def get_today_sales() -> Dict[str, float]:
                 COALESCE(SUM(total), 0) as total_usd,
                 COALESCE(SUM(total_ves), 0) as total_ves
             FROM facturas
-            WHERE DATE(fecha) = ?
+            WHERE fecha >= ? AND fecha < ?
         """,
-            (today,),
+            (desde, hasta),
         )
         result = cur.fetchone()
 
@@ -68,7 +70,7 @@ def get_today_sales() -> Dict[str, float]:
 
 def get_monthly_sales(months: int = 12) -> List[Tuple[str, float]]:
     """
-    Obtiene las ventas mensuales de los últimos N meses.
+    Obtiene las ventas mensuales de los últimos N meses (rollup ventas_diarias).
     Retorna lista de tuplas (mes, total_ventas)
     """
     with ConnectionManager() as conn:
@@ -79,28 +81,39 @@ def get_monthly_sales(months: int = 12) -> List[Tuple[str, float]]:
             """
             SELECT 
                 strftime('%Y-%m', fecha) as mes,
-                COALESCE(SUM(total), 0) as total
-            FROM facturas
-            WHERE fecha >= date('now', '-12 months')
+                COALESCE(SUM(total_usd), 0) as total
+            FROM ventas_diarias
+            WHERE fecha >= date('now', ?)
             GROUP BY mes
             ORDER BY mes ASC
-        """
+        """,
+            (f"-{int(months)} months",),
         )
 
-        results = cur.fetchall()
+        return _formatear_meses(cur.fetchall())
+
 
-        # Convertir a formato legible
-        monthly_data = []
-        for mes_str, total in results:
-            # Convertir "2024-11" a "Nov"
-            try:
-                date_obj = datetime.strptime(mes_str, "%Y-%m")
-                mes_nombre = date_obj.strftime("%b")
-                monthly_data.append((mes_nombre, float(total)))
-            except Exception:
-                monthly_data.append((mes_str, float(total)))
+def _formatear_meses(results) -> List[Tuple[str, float]]:
+    """Convierte filas (YYYY-MM, total) a formato legible ("Nov", total)."""
+    monthly_data = []
+    for mes_str, total in results:
+        # Convertir "2024-11" a "Nov"
+        try:
+            date_obj = datetime.strptime(mes_str, "%Y-%m")
+            mes_nombre = date_obj.strftime("%b")
+            monthly_data.append((mes_nombre, float(total)))
+        except Exception:
+            monthly_data.append((mes_str, float(total)))
+    return monthly_data
 
-        return monthly_data
+
+def _extraer_hora(fecha) -> str:
+    """Extrae HH:MM de un timestamp de la BD."""
+    try:
+        fecha_obj = datetime.fromisoformat(fecha.replace(" ", "T"))
+        return fecha_obj.strftime("%H:%M")
+    except Exception:
+        return "N/A"
 
 
 def get_table_status() -> Dict[str, int]:
@@ -162,37 +175,106 @@ def get_recent_invoices(limit: int = 5) -> List[Dict]:
 
         invoices = []
         for numero, cliente, total, fecha in results:
-            # Extraer solo la hora de la fecha
-            try:
-                fecha_obj = datetime.fromisoformat(fecha.replace(" ", "T"))
-                hora = fecha_obj.strftime("%H:%M")
-            except Exception:
-                hora = "N/A"
-
             invoices.append(
                 {
                     "numero": numero,
                     "cliente": cliente,
                     "monto": f"${total:.2f}",
-                    "hora": hora,
+                    "hora": _extraer_hora(fecha),
                 }
             )
 
         return invoices
 
 
+def get_dashboard_snapshot(months: int = 12, invoices_limit: int = 5) -> DashboardSnapshot:
+    """
+    Obtiene todas las métricas del dashboard en una sola conexión y una
+    sola transacción de lectura, de modo que los valores son coherentes
+    entre sí. Retorna un DashboardSnapshot inmutable.
+    """
+    hoy = datetime.now().date()
+    desde, hasta = rango_dia(hoy)
+
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        if not conn.in_transaction:
+            cur.execute("BEGIN")
+
+        # Métricas escalares en una sola sentencia
+        cur.execute(
+            """
+            SELECT
+                (SELECT tasa FROM tasas_cambio ORDER BY fecha DESC LIMIT 1),
+                (SELECT tasa FROM tasas_cambio WHERE fecha = ?),
+                (SELECT COUNT(*) FROM ordenes WHERE fecha >= ? AND fecha < ?),
+                (SELECT COALESCE(SUM(total_usd), 0) FROM ventas_diarias WHERE fecha = ?),
+                (SELECT COALESCE(SUM(total_ves), 0) FROM ventas_diarias WHERE fecha = ?),
+                (SELECT COUNT(*) FROM mesas WHERE LOWER(estado) = 'libre'),
+                (SELECT COUNT(*) FROM mesas WHERE LOWER(estado) = 'ocupado'),
+                (SELECT COUNT(*) FROM mesas WHERE LOWER(estado) = 'reservada')
+            """,
+            (hoy.isoformat(), desde, hasta, hoy.isoformat(), hoy.isoformat()),
+        )
+        (tasa, tasa_hoy, ordenes_hoy, ventas_usd, ventas_ves,
+         libres, ocupadas, reservadas) = cur.fetchone()
+
+        cur.execute(
+            """
+            SELECT strftime('%Y-%m', fecha) as mes, COALESCE(SUM(total_usd), 0)
+            FROM ventas_diarias
+            WHERE fecha >= date('now', ?)
+            GROUP BY mes
+            ORDER BY mes ASC
+            """,
+            (f"-{int(months)} months",),
+        )
+        mensuales = _formatear_meses(cur.fetchall())
+
+        cur.execute(
+            """
+            SELECT numero_factura, cliente_nombre, total, fecha
+            FROM facturas
+            ORDER BY fecha DESC
+            LIMIT ?
+            """,
+            (invoices_limit,),
+        )
+        facturas = tuple(
+            (numero, cliente, f"${total:.2f}", _extraer_hora(fecha))
+            for numero, cliente, total, fecha in cur.fetchall()
+        )
+
+    return DashboardSnapshot(
+        tasa=float(tasa or 0.0),
+        tasa_hoy=float(tasa_hoy) if tasa_hoy is not None else None,
+        ordenes_hoy=int(ordenes_hoy),
+        ventas_hoy_usd=float(ventas_usd),
+        ventas_hoy_ves=float(ventas_ves),
+        mesas_libres=int(libres),
+        mesas_ocupadas=int(ocupadas),
+        mesas_reservadas=int(reservadas),
+        ventas_mensuales=tuple(mensuales),
+        ultimas_facturas=facturas,
+    )
+
+
 def get_dashboard_summary() -> Dict:
     """
     Obtiene un resumen completo de todos los datos del dashboard.
-    Útil para actualizar todo de una vez.
+    Útil para actualizar todo de una vez (usa get_dashboard_snapshot).
     """
+    snapshot = get_dashboard_snapshot()
     return {
-        "tasa": get_current_exchange_rate(),
-        "ordenes_hoy": get_today_orders_count(),
-        "ventas_hoy": get_today_sales(),
-        "ventas_mensuales": get_monthly_sales(),
-        "estado_mesas": get_table_status(),
-        "ultimas_facturas": get_recent_invoices(),
+        "tasa": snapshot.tasa,
+        "ordenes_hoy": snapshot.ordenes_hoy,
+        "ventas_hoy": {"usd": snapshot.ventas_hoy_usd, "ves": snapshot.ventas_hoy_ves},
+        "ventas_mensuales": list(snapshot.ventas_mensuales),
+        "estado_mesas": snapshot.estado_mesas(),
+        "ultimas_facturas": [
+            {"numero": numero, "cliente": cliente, "monto": monto, "hora": hora}
+            for numero, cliente, monto, hora in snapshot.ultimas_facturas
+        ],
     }
 
 
@@ -1,22 +1,29 @@
-from ..db.connection import ConnectionManager
+from ..db.connection import ConnectionManager, revertir_transaccion
+from ..db.busqueda import consulta_prefijo, fts_listo
+from ..db.rollups import acumular_ventas_items
+from ..db.secuencias import SERIE_FACTURA, formatear_numero, reservar_rango
 from ..models import Factura
+from .receta_service import reponer_ingredientes_orden
+from ..utils.fechas import rango_fechas
 from typing import List, Optional, Tuple
+import datetime
 
 
 def obtener_facturas_rango(fecha_inicio: str, fecha_fin: str) -> List[Factura]:
     """
     Devuelve lista de facturas entre dos fechas como objetos Factura.
     """
+    desde, hasta = rango_fechas(fecha_inicio, fecha_fin)
     with ConnectionManager() as conn:
         cur = conn.cursor()
         cur.execute(
             """
             SELECT id, orden_id, numero_factura, fecha, cliente_nombre, forma_pago, total, total_ves
             FROM facturas
-            WHERE fecha BETWEEN ? AND ?
+            WHERE fecha >= ? AND fecha < ?
             ORDER BY fecha DESC
         """,
-            (fecha_inicio, fecha_fin),
+            (desde, hasta),
         )
         rows = cur.fetchall()
         return [Factura(*row) for row in rows]
@@ -25,10 +32,26 @@ def obtener_facturas_rango(fecha_inicio: str, fecha_fin: str) -> List[Factura]:
 def buscar_facturas(termino: str) -> List[Factura]:
     """
     Busca facturas por número O por nombre de cliente.
+    Usa el índice FTS5 (sin tildes, por prefijo de palabra) si existe.
     Retorna objetos Factura.
     """
+    consulta = consulta_prefijo(termino)
     with ConnectionManager() as conn:
         cur = conn.cursor()
+        if consulta and fts_listo(conn, "facturas_fts"):
+            cur.execute(
+                """
+                SELECT f.id, f.orden_id, f.numero_factura, f.fecha, f.cliente_nombre,
+                       f.forma_pago, f.total, f.total_ves
+                FROM facturas_fts
+                JOIN facturas f ON f.id = facturas_fts.rowid
+                WHERE facturas_fts MATCH ?
+                ORDER BY f.fecha DESC
+            """,
+                (consulta,),
+            )
+            return [Factura(*row) for row in cur.fetchall()]
+
         param = f"%{termino}%"
         cur.execute(
             """
@@ -43,6 +66,86 @@ def buscar_facturas(termino: str) -> List[Factura]:
         return [Factura(*row) for row in rows]
 
 
+# Columnas por las que se puede ordenar la lista paginada de facturas
+COLUMNAS_ORDEN_FACTURAS = ("fecha", "numero_factura", "cliente_nombre", "total", "total_ves")
+
+
+def listar_facturas_pagina(
+    limite: int = 200,
+    cursor: Optional[Tuple] = None,
+    orden: str = "fecha",
+    descendente: bool = True,
+    termino: Optional[str] = None,
+    fecha_inicio: Optional[str] = None,
+    fecha_fin: Optional[str] = None,
+) -> Tuple[List[Factura], Optional[Tuple]]:
+    """
+    Devuelve una página de facturas con paginación por clave (keyset).
+
+    `cursor` es el (valor de `orden`, id) de la última factura de la página
+    anterior; None pide la primera página. Cada página continúa con
+    (orden, id) < cursor (o > si es ascendente), que se resuelve como un
+    rango sobre el índice de la columna: el coste no depende de cuántas
+    páginas se hayan leído ni del tamaño del historial.
+
+    `termino` filtra por cliente o número (FTS5 si existe, si no LIKE) y
+    `fecha_inicio`/`fecha_fin` por rango de fechas.
+
+    Retorna (facturas, siguiente_cursor); siguiente_cursor es None cuando
+    no quedan más filas.
+    """
+    if orden not in COLUMNAS_ORDEN_FACTURAS:
+        raise ValueError(f"Columna de orden no válida: {orden}")
+
+    direccion = "DESC" if descendente else "ASC"
+    comparador = "<" if descendente else ">"
+    condiciones = []
+    params: list = []
+    desde_fts = ""
+
+    consulta = consulta_prefijo(termino) if termino else None
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        if consulta and fts_listo(conn, "facturas_fts"):
+            desde_fts = "JOIN facturas_fts ON facturas_fts.rowid = f.id"
+            condiciones.append("facturas_fts MATCH ?")
+            params.append(consulta)
+        elif termino and termino.strip():
+            param = f"%{termino.strip()}%"
+            condiciones.append("(f.cliente_nombre LIKE ? OR f.numero_factura LIKE ?)")
+            params.extend([param, param])
+
+        if fecha_inicio and fecha_fin:
+            desde, hasta = rango_fechas(fecha_inicio, fecha_fin)
+            condiciones.append("f.fecha >= ? AND f.fecha < ?")
+            params.extend([desde, hasta])
+
+        if cursor is not None:
+            condiciones.append(f"(f.{orden}, f.id) {comparador} (?, ?)")
+            params.extend(cursor)
+
+        where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        cur.execute(
+            f"""
+            SELECT f.id, f.orden_id, f.numero_factura, f.fecha, f.cliente_nombre,
+                   f.forma_pago, f.total, f.total_ves
+            FROM facturas f
+            {desde_fts}
+            {where}
+            ORDER BY f.{orden} {direccion}, f.id {direccion}
+            LIMIT ?
+        """,
+            (*params, limite),
+        )
+        facturas = [Factura(*row) for row in cur.fetchall()]
+
+    siguiente = None
+    if len(facturas) == limite:
+        ultima = facturas[-1]
+        siguiente = (getattr(ultima, orden), ultima.id)
+    return facturas, siguiente
+
+
 def obtener_factura_por_id(factura_id: int) -> Optional[Factura]:
     """
     Obtiene una factura por ID.
@@ -62,6 +165,25 @@ def obtener_factura_por_id(factura_id: int) -> Optional[Factura]:
         return Factura(*row) if row else None
 
 
+def reservar_numeros_factura(
+    cantidad: int, serie: str = SERIE_FACTURA, fecha: Optional[str] = None
+) -> Tuple[bool, Optional[str], List[str]]:
+    """
+    Reserva un bloque de `cantidad` números consecutivos de la serie para
+    el día (hoy por defecto), p. ej. para una terminal que factura sin
+    esperar a la BD. Se usan pasando cada número a insertar_factura; los
+    que no se usen quedan como huecos de la serie.
+    Retorna (ok, error, numeros).
+    """
+    fecha = fecha or datetime.date.today().isoformat()
+    try:
+        with ConnectionManager() as conn:
+            primero, ultimo = reservar_rango(conn.cursor(), serie, fecha, int(cantidad))
+        return True, None, [formatear_numero(serie, fecha, n) for n in range(primero, ultimo + 1)]
+    except Exception as e:
+        return False, str(e), []
+
+
 def eliminar_factura(factura_id: int) -> Tuple[bool, Optional[str]]:
     """
     Elimina una factura y sus detalles asociados.
@@ -77,14 +199,19 @@ def eliminar_factura(factura_id: int) -> Tuple[bool, Optional[str]]:
                 return False, "Factura no encontrada"
             orden_id = row[0]
 
+            # descontar la orden del rollup de ventas por item
+            acumular_ventas_items(cur, orden_id, signo=-1)
+            # devolver al inventario los ingredientes consumidos
+            ok, err = reponer_ingredientes_orden(cur, orden_id)
+            if not ok:
+                revertir_transaccion(conn)
+                return False, err
+            # eliminar la factura (primero, referencia a la orden por FK)
+            cur.execute("DELETE FROM facturas WHERE id = ?", (factura_id,))
             # eliminar detalles de la orden
             cur.execute("DELETE FROM orden_detalles WHERE orden_id = ?", (orden_id,))
             # eliminar la orden
             cur.execute("DELETE FROM ordenes WHERE id = ?", (orden_id,))
-            # eliminar la factura
-            cur.execute("DELETE FROM facturas WHERE id = ?", (factura_id,))
-
-            conn.commit()
         return True, None
     except Exception as e:
         return False, str(e)
@@ -1,18 +1,19 @@
 # src/app/services/inventario_service.py
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import sqlite3
 
 from ..db.connection import ConnectionManager
 from ..models import Producto
+from .stock_service import aplicar_movimientos
 
 
 def obtener_productos() -> List[Producto]:
     """
-    Devuelve lista de productos como objetos Producto.
+    Devuelve lista de productos como objetos Producto (sin los dados de baja).
     """
     with ConnectionManager() as conn:
         cur = conn.cursor()
-        cur.execute("SELECT id, nombre, precio, stock FROM productos ORDER BY nombre")
+        cur.execute("SELECT id, nombre, precio, stock FROM productos WHERE activo = 1 ORDER BY nombre")
         rows = cur.fetchall()
         return [Producto(*row) for row in rows]
 
@@ -41,7 +42,13 @@ def crear_producto(nombre: str, precio: float, stock: int) -> Tuple[bool, Option
                 "INSERT INTO productos (nombre, precio, stock) VALUES (?, ?, ?)",
                 (nombre, float(precio), int(stock))
             )
-            return True, None, cur.lastrowid
+            producto_id = cur.lastrowid
+            if int(stock):
+                cur.execute(
+                    "INSERT INTO movimientos_stock (producto_id, cantidad, motivo) VALUES (?, ?, 'alta')",
+                    (producto_id, int(stock))
+                )
+            return True, None, producto_id
     except sqlite3.IntegrityError as e:
         return False, str(e), None
     except Exception as e:
@@ -56,6 +63,12 @@ def actualizar_producto(producto_id: int, nombre: str, precio: float, stock: int
     try:
         with ConnectionManager() as conn:
             cur = conn.cursor()
+            # Registrar la diferencia de stock antes de sobrescribirlo
+            cur.execute(
+                """INSERT INTO movimientos_stock (producto_id, cantidad, motivo)
+                SELECT id, ? - stock, 'edicion' FROM productos WHERE id = ? AND stock != ?""",
+                (int(stock), producto_id, int(stock))
+            )
             cur.execute(
                 "UPDATE productos SET nombre = ?, precio = ?, stock = ? WHERE id = ?",
                 (nombre, float(precio), int(stock), producto_id)
@@ -69,7 +82,9 @@ def actualizar_producto(producto_id: int, nombre: str, precio: float, stock: int
 
 def eliminar_producto(producto_id: int) -> Tuple[bool, Optional[str]]:
     """
-    Elimina un producto.
+    Elimina un producto. Si tiene movimientos de stock se da de baja
+    lógica (activo = 0) para conservar su historial en movimientos_stock.
+    No se elimina si algún item del menú lo usa en su receta.
     Retorna (ok, error).
     """
     try:
@@ -83,7 +98,23 @@ def eliminar_producto(producto_id: int) -> Tuple[bool, Optional[str]]:
             except Exception:
                 # si la tabla no existe o falla la comprobación, continuamos con la eliminación
                 pass
-            cur.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
+            cur.execute(
+                """SELECT DISTINCT mi.nombre FROM recetas r
+                JOIN menu_items mi ON mi.id = r.menu_item_id
+                WHERE r.producto_id = ? ORDER BY mi.nombre""",
+                (producto_id,)
+            )
+            platos = [row[0] for row in cur.fetchall()]
+            if platos:
+                return False, (
+                    "El producto se usa en las recetas de: " + ", ".join(platos)
+                    + ". Quítelo de esas recetas antes de eliminarlo."
+                )
+            cur.execute("SELECT 1 FROM movimientos_stock WHERE producto_id = ? LIMIT 1", (producto_id,))
+            if cur.fetchone():
+                cur.execute("UPDATE productos SET activo = 0 WHERE id = ?", (producto_id,))
+            else:
+                cur.execute("DELETE FROM productos WHERE id = ?", (producto_id,))
             return True, None
     except Exception as e:
         return False, str(e)
@@ -97,16 +128,46 @@ def ajustar_stock(producto_id: int, cantidad: int) -> Tuple[bool, Optional[str]]
     try:
         with ConnectionManager() as conn:
             cur = conn.cursor()
-            cur.execute(
-                "UPDATE productos SET stock = stock + ? WHERE id = ?",
-                (cantidad, producto_id)
+            # diff positivo consume stock: sumar `cantidad` es un diff de -cantidad
+            return aplicar_movimientos(cur, {producto_id: -int(cantidad)}, "ajuste")
+    except Exception as e:
+        return False, str(e)
+
+
+def registrar_conteo(conteos: Dict[int, int], referencia: Optional[str] = None) -> Tuple[bool, Optional[str]]:
+    """
+    Registra un conteo físico de inventario: {producto_id: stock_contado}.
+    Solo los productos cuyo stock difiere generan movimiento ('conteo');
+    todo el lote se aplica en una transacción con dos executemany. Si algún
+    id no existe no se registra nada.
+    Retorna (ok, error).
+    """
+    if not conteos:
+        return True, None
+    for producto_id, contado in conteos.items():
+        if int(contado) < 0:
+            return False, f"Conteo negativo para producto id={producto_id}"
+    conteos = {int(pid): int(contado) for pid, contado in conteos.items()}
+    try:
+        with ConnectionManager() as conn:
+            cur = conn.cursor()
+            ids = list(conteos)
+            placeholders = ",".join("?" for _ in ids)
+            cur.execute(f"SELECT id FROM productos WHERE id IN ({placeholders})", ids)
+            existentes = {int(row[0]) for row in cur.fetchall()}
+            desconocidos = [pid for pid in ids if pid not in existentes]
+            if desconocidos:
+                return False, "\n".join(f"Producto no existe id={pid}" for pid in desconocidos)
+            # El movimiento se calcula con el stock previo, antes del UPDATE
+            cur.executemany(
+                """INSERT INTO movimientos_stock (producto_id, cantidad, motivo, referencia)
+                SELECT id, ? - stock, 'conteo', ? FROM productos WHERE id = ? AND stock != ?""",
+                [(contado, referencia, pid, contado) for pid, contado in conteos.items()]
+            )
+            cur.executemany(
+                "UPDATE productos SET stock = ? WHERE id = ? AND stock != ?",
+                [(contado, pid, contado) for pid, contado in conteos.items()]
             )
-            # Verificar que el stock no sea negativo
-            cur.execute("SELECT stock FROM productos WHERE id = ?", (producto_id,))
-            row = cur.fetchone()
-            if row and row[0] < 0:
-                conn.rollback()
-                return False, "El stock no puede ser negativo"
             return True, None
     except Exception as e:
-        return False, str(e)
\ No newline at end of file
+        return False, str(e)
@@ -1,8 +1,76 @@
 # src/app/services/menu_service.py
 from typing import List, Optional, Tuple
 import sqlite3
+import threading
 from ..db.connection import ConnectionManager
-from ..models import MenuSection, MenuItem
+from ..db.busqueda import consulta_prefijo, fts_listo
+from ..models import MenuSection, MenuItem, MenuItemVariant, MenuCatalog
+
+
+# --------------------------
+# Catálogo en memoria
+# --------------------------
+# El menú cambia pocas veces por semana y se lee cada vez que se abre una
+# orden: se carga completo con una sola consulta y se comparte entre
+# OrdenDialog, MenuView y la búsqueda. Las funciones de este módulo que lo
+# modifican llaman a invalidar_catalogo() tras el commit; los cambios de
+# otra instancia llegan por el despachador de cambios (MainWindow).
+
+_catalogo: Optional[MenuCatalog] = None
+_catalogo_version = 0
+_catalogo_lock = threading.Lock()
+
+
+def _cargar_catalogo(version: int) -> MenuCatalog:
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT s.id, s.nombre, s.descripcion, s.position, s.active,
+                   i.id, i.section_id, i.nombre, i.descripcion, i.precio,
+                   i.disponible, i.position, i.created_at,
+                   v.id, v.menu_item_id, v.clave, v.nombre, v.precio,
+                   v.sku, v.position, v.active
+            FROM menu_sections s
+            LEFT JOIN menu_items i ON i.section_id = s.id
+            LEFT JOIN menu_item_variant v ON v.menu_item_id = i.id
+            ORDER BY s.position, s.nombre, s.id, i.position, i.nombre, i.id, v.position, v.id
+            """
+        )
+        secciones, items, variantes = {}, {}, []
+        for row in cur.fetchall():
+            if row[0] not in secciones:
+                secciones[row[0]] = MenuSection(*row[0:5])
+            if row[5] is not None and row[5] not in items:
+                items[row[5]] = MenuItem(*row[5:13])
+            if row[13] is not None:
+                variantes.append(MenuItemVariant(*row[13:21]))
+    return MenuCatalog(
+        version, tuple(secciones.values()), tuple(items.values()), tuple(variantes)
+    )
+
+
+def obtener_catalogo() -> MenuCatalog:
+    """
+    Devuelve el catálogo del menú, cargándolo solo si fue invalidado.
+    Los objetos devueltos son compartidos: no modificarlos.
+    """
+    global _catalogo
+    catalogo = _catalogo
+    if catalogo is not None:
+        return catalogo
+    with _catalogo_lock:
+        if _catalogo is None:
+            _catalogo = _cargar_catalogo(_catalogo_version)
+        return _catalogo
+
+
+def invalidar_catalogo() -> None:
+    """Descarta el catálogo en memoria; la próxima lectura lo recarga."""
+    global _catalogo, _catalogo_version
+    with _catalogo_lock:
+        _catalogo_version += 1
+        _catalogo = None
 
 
 # --------------------------
@@ -15,20 +83,7 @@ def listar_secciones(only_active: bool = True) -> List[MenuSection]:
     Devuelve lista de secciones del menú.
     Retorna objetos MenuSection en lugar de tuplas.
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        if only_active:
-            cur.execute(
-                """SELECT id, nombre, descripcion, position, active 
-                FROM menu_sections WHERE active=1 ORDER BY position, nombre"""
-            )
-        else:
-            cur.execute(
-                """SELECT id, nombre, descripcion, position, active 
-                FROM menu_sections ORDER BY position, nombre"""
-            )
-        rows = cur.fetchall()
-        return [MenuSection(*row) for row in rows]
+    return obtener_catalogo().listar_secciones(only_active)
 
 
 def crear_seccion(
@@ -53,8 +108,8 @@ def crear_seccion(
                 VALUES (?, ?, ?)""",
                 (nombre, descripcion, position),
             )
-            conn.commit()
-            return True, None, cur.lastrowid
+        invalidar_catalogo()
+        return True, None, cur.lastrowid
     except sqlite3.IntegrityError:
         return False, "Ya existe una sección con ese nombre", None
     except Exception as e:
@@ -63,15 +118,7 @@ def crear_seccion(
 
 def obtener_seccion_por_id(section_id: int) -> Optional[MenuSection]:
     """Obtiene una sección por ID, retorna MenuSection o None"""
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            """SELECT id, nombre, descripcion, position, active 
-            FROM menu_sections WHERE id = ?""",
-            (section_id,),
-        )
-        row = cur.fetchone()
-        return MenuSection(*row) if row else None
+    return obtener_catalogo().obtener_seccion(section_id)
 
 
 def actualizar_seccion(
@@ -90,7 +137,7 @@ def actualizar_seccion(
                 WHERE id = ?""",
                 (nombre, descripcion, position, active, section_id),
             )
-            conn.commit()
+        invalidar_catalogo()
         return True, None
     except sqlite3.IntegrityError:
         return False, "Ya existe una sección con ese nombre"
@@ -113,7 +160,7 @@ def eliminar_seccion(section_id: int, soft: bool = True) -> Tuple[bool, Optional
                 )
             else:
                 cur.execute("DELETE FROM menu_sections WHERE id = ?", (section_id,))
-            conn.commit()
+        invalidar_catalogo()
         return True, None
     except Exception as e:
         return False, str(e)
@@ -131,32 +178,7 @@ def listar_items_por_seccion(
     Devuelve lista de items en una sección.
     Retorna objetos MenuItem en lugar de tuplas.
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        if only_disponible:
-            cur.execute(
-                """
-                SELECT id, section_id, nombre, descripcion, precio, 
-                       disponible, position, created_at
-                FROM menu_items
-                WHERE section_id = ? AND disponible = 1
-                ORDER BY position, nombre
-            """,
-                (section_id,),
-            )
-        else:
-            cur.execute(
-                """
-                SELECT id, section_id, nombre, descripcion, precio, 
-                       disponible, position, created_at
-                FROM menu_items
-                WHERE section_id = ?
-                ORDER BY position, nombre
-            """,
-                (section_id,),
-            )
-        rows = cur.fetchall()
-        return [MenuItem(*row) for row in rows]
+    return obtener_catalogo().items_de_seccion(section_id, only_disponible)
 
 
 def crear_item(
@@ -193,8 +215,8 @@ def crear_item(
             """,
                 (section_id, nombre, descripcion, precio, disponible, position),
             )
-            conn.commit()
-            return True, None, cur.lastrowid
+        invalidar_catalogo()
+        return True, None, cur.lastrowid
     except sqlite3.IntegrityError:
         return False, "Registro duplicado o error de integridad", None
     except Exception as e:
@@ -203,18 +225,7 @@ def crear_item(
 
 def obtener_item_por_id(item_id: int) -> Optional[MenuItem]:
     """Obtiene un item por ID, retorna MenuItem o None"""
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, section_id, nombre, descripcion, precio, 
-                   disponible, position, created_at
-            FROM menu_items WHERE id = ?
-        """,
-            (item_id,),
-        )
-        row = cur.fetchone()
-        return MenuItem(*row) if row else None
+    return obtener_catalogo().obtener_item(item_id)
 
 
 def actualizar_item(
@@ -246,7 +257,7 @@ def actualizar_item(
                     item_id,
                 ),
             )
-            conn.commit()
+        invalidar_catalogo()
         return True, None
     except sqlite3.IntegrityError:
         return False, "Registro duplicado o error de integridad"
@@ -259,7 +270,7 @@ def eliminar_item(item_id: int) -> Tuple[bool, Optional[str]]:
         with ConnectionManager() as conn:
             cur = conn.cursor()
             cur.execute("DELETE FROM menu_items WHERE id = ?", (item_id,))
-            conn.commit()
+        invalidar_catalogo()
         return True, None
     except Exception as e:
         return False, str(e)
@@ -283,7 +294,7 @@ def toggle_disponibilidad_item(
                 "UPDATE menu_items SET disponible = ? WHERE id = ?",
                 (1 if disponible else 0, item_id),
             )
-            conn.commit()
+        invalidar_catalogo()
         return True, None
     except Exception as e:
         return False, str(e)
@@ -311,42 +322,33 @@ def intercambiar_positions_items(
             cur.execute(
                 "UPDATE menu_items SET position = ? WHERE id = ?", (pos1, item_id_2)
             )
-
-            conn.commit()
-            return True, None
+        invalidar_catalogo()
+        return True, None
     except Exception as e:
         return False, str(e)
 
 
 def buscar_items_por_nombre(term: str, only_disponible: bool = True) -> List[MenuItem]:
     """
-    Búsqueda simple por nombre en todo el menú.
+    Búsqueda por nombre o descripción en todo el menú, sin distinguir
+    mayúsculas ni tildes y por prefijo de cada palabra (índice FTS5).
     Retorna objetos MenuItem en lugar de tuplas.
     """
-    like = f"%{term}%"
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        if only_disponible:
-            cur.execute(
-                """
-                SELECT id, section_id, nombre, descripcion, precio, 
-                       disponible, position, created_at
-                FROM menu_items
-                WHERE nombre LIKE ? AND disponible = 1
-                ORDER BY section_id, position, nombre
-            """,
-                (like,),
-            )
-        else:
-            cur.execute(
-                """
-                SELECT id, section_id, nombre, descripcion, precio, 
-                       disponible, position, created_at
-                FROM menu_items
-                WHERE nombre LIKE ?
-                ORDER BY section_id, position, nombre
-            """,
-                (like,),
-            )
-        rows = cur.fetchall()
-        return [MenuItem(*row) for row in rows]
+    catalogo = obtener_catalogo()
+    consulta = consulta_prefijo(term)
+    if consulta:
+        with ConnectionManager() as conn:
+            if fts_listo(conn, "menu_items_fts"):
+                cur = conn.cursor()
+                cur.execute(
+                    "SELECT rowid FROM menu_items_fts WHERE menu_items_fts MATCH ?",
+                    (consulta,),
+                )
+                items = [catalogo.obtener_item(row[0]) for row in cur.fetchall()]
+                items = [
+                    i for i in items
+                    if i is not None and (i.disponible or not only_disponible)
+                ]
+                items.sort(key=lambda i: (i.section_id, i.position or 0, i.nombre))
+                return items
+    return catalogo.buscar_items(term, only_disponible)
@@ -1,5 +1,6 @@
 from typing import List, Optional, Tuple
-from ..db.connection import crear_conexion, ConnectionManager
+import sqlite3
+from ..db.connection import crear_conexion, ConnectionManager, revertir_transaccion
 from ..models import Mesa, Seccion
 
 
@@ -137,7 +138,7 @@ def crear_mesa(seccion_id: int) -> Tuple[bool, Optional[str], Optional[int]]:
             )
             return True, None, cur.lastrowid
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e), None
 
 
@@ -162,7 +163,7 @@ def actualizar_mesa(
             )
             return True, None
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e)
 
 
@@ -185,8 +186,11 @@ def eliminar_mesa(mesa_id: int) -> Tuple[bool, Optional[str]]:
                 pass
             cur.execute("DELETE FROM mesas WHERE id = ?", (mesa_id,))
             return True, None
+        except sqlite3.IntegrityError:
+            revertir_transaccion(conn)
+            return False, "No se puede eliminar: la mesa tiene órdenes registradas"
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e)
 
 
@@ -202,7 +206,7 @@ def cambiar_estado_mesa(mesa_id: int, nuevo_estado: str) -> Tuple[bool, Optional
             )
             return True, None
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e)
 
 
@@ -241,10 +245,9 @@ def crear_seccion(nombre: str) -> Tuple[bool, Optional[str], Optional[int]]:
         try:
             cur = conn.cursor()
             cur.execute("INSERT INTO secciones (nombre) VALUES (?)", (nombre,))
-            conn.commit()
             return True, None, cur.lastrowid
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e), None
 
 
@@ -264,8 +267,7 @@ def eliminar_seccion(seccion_id: int) -> Tuple[bool, Optional[str]]:
                 return False, "No se puede eliminar: la sección tiene mesas asociadas"
 
             cur.execute("DELETE FROM secciones WHERE id = ?", (seccion_id,))
-            conn.commit()
             return True, None
         except Exception as e:
-            conn.rollback()
+            revertir_transaccion(conn)
             return False, str(e)
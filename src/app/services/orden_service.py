@@ -3,8 +3,12 @@ from typing import List, Tuple, Optional, Dict
 import sqlite3
 import datetime
 
-from ..db.connection import ConnectionManager
+from ..db.connection import ConnectionManager, revertir_transaccion
+from ..db.busqueda import consulta_prefijo, fts_listo
+from ..db.rollups import acumular_ventas_items
+from ..db.secuencias import SERIE_FACTURA, siguiente_numero
 from ..models import Orden, OrdenDetalle
+from .receta_service import descontar_ingredientes_orden
 
 
 # --------------------------
@@ -58,6 +62,16 @@ def _now_iso() -> str:
     return datetime.datetime.now().isoformat(sep=" ", timespec="seconds")
 
 
+def _precios_por_id(cur, tabla: str, ids) -> Dict[int, float]:
+    """Precios de `tabla` (menu_items o menu_item_variant) para los ids dados, en una consulta."""
+    ids = sorted(set(ids))
+    if not ids:
+        return {}
+    marcadores = ", ".join("?" * len(ids))
+    cur.execute(f"SELECT id, precio FROM {tabla} WHERE id IN ({marcadores})", ids)
+    return {row[0]: float(row[1]) for row in cur.fetchall()}
+
+
 def _validar_y_calcular_detalles(
     cur, productos: List[Dict]
 ) -> Tuple[bool, Optional[str], List[Dict], float]:
@@ -65,59 +79,76 @@ def _validar_y_calcular_detalles(
     Normaliza y valida la lista de productos recibidos.
     Cada dict entrante debe ser:
       - {"menu_item_id": X, "variant_id": optional, "cantidad": N, "subtotal": optional}
+    Los precios de todos los items y variantes se leen con una consulta IN
+    por tabla; si hay líneas inválidas el mensaje las reporta todas, una
+    por renglón.
     Retorna: (ok, msg_error, detalles_normalizados, total)
     detalle normalizado ejemplo:
       {"menu_item_id": int, "variant_id": Optional[int], "cantidad": int,
        "precio_unitario": float, "subtotal": float, "fuente": "menu"}
     """
-    detalles = []
-    total = 0.0
+    errores = []
+    lineas = []
 
+    # 1) Validar forma de cada línea sin tocar la BD
     for p in productos:
-        # validar cantidad
         try:
             cantidad = int(p.get("cantidad", 1))
             if cantidad <= 0:
-                return False, f"Cantidad inválida para línea: {p}", [], 0.0
+                raise ValueError
         except Exception:
-            return False, f"Cantidad inválida para línea: {p}", [], 0.0
+            errores.append(f"Cantidad inválida para línea: {p}")
+            continue
 
-        menu_item_id = p.get("menu_item_id")
-        variant_id = p.get("variant_id")
+        try:
+            menu_item_id = int(p["menu_item_id"])
+            variant_id = p.get("variant_id")
+            variant_id = int(variant_id) if variant_id is not None else None
+        except Exception:
+            errores.append(f"Detalle sin menu_item_id válido: {p}")
+            continue
 
-        if menu_item_id is None:
-            return False, f"Detalle sin menu_item_id válido: {p}", [], 0.0
+        subtotal = p.get("subtotal")
+        if subtotal not in (None, ""):
+            try:
+                subtotal = round(float(subtotal), 2)
+            except Exception:
+                errores.append(f"Subtotal inválido en línea: {p}")
+                continue
+        else:
+            subtotal = None
 
-        # obtener precio base del item de menú
-        cur.execute("SELECT precio FROM menu_items WHERE id = ?", (int(menu_item_id),))
-        row = cur.fetchone()
-        if not row:
-            return False, f"Item de menú no existe (id={menu_item_id})", [], 0.0
-        precio = float(row[0])
+        lineas.append((menu_item_id, variant_id, cantidad, subtotal))
+
+    # 2) Precios de todos los items y variantes referenciados
+    precios_item = _precios_por_id(cur, "menu_items", (l[0] for l in lineas))
+    precios_variante = _precios_por_id(
+        cur, "menu_item_variant", (l[1] for l in lineas if l[1] is not None)
+    )
+
+    # 3) Calcular en memoria
+    detalles = []
+    total = 0.0
+    for menu_item_id, variant_id, cantidad, subtotal in lineas:
+        if menu_item_id not in precios_item:
+            errores.append(f"Item de menú no existe (id={menu_item_id})")
+            continue
+        precio = precios_item[menu_item_id]
 
         # si viene variante, preferir precio de variante
         if variant_id is not None:
-            cur.execute(
-                "SELECT precio FROM menu_item_variant WHERE id = ?", (int(variant_id),)
-            )
-            vr = cur.fetchone()
-            if not vr:
-                return False, f"Variante no existe (id={variant_id})", [], 0.0
-            precio = float(vr[0])
+            if variant_id not in precios_variante:
+                errores.append(f"Variante no existe (id={variant_id})")
+                continue
+            precio = precios_variante[variant_id]
 
-        subtotal = p.get("subtotal")
-        if subtotal in (None, ""):
+        if subtotal is None:
             subtotal = round(precio * cantidad, 2)
-        else:
-            try:
-                subtotal = round(float(subtotal), 2)
-            except Exception:
-                return False, f"Subtotal inválido en línea: {p}", [], 0.0
 
         detalles.append(
             {
-                "menu_item_id": int(menu_item_id),
-                "variant_id": int(variant_id) if variant_id is not None else None,
+                "menu_item_id": menu_item_id,
+                "variant_id": variant_id,
                 "cantidad": cantidad,
                 "precio_unitario": precio,
                 "subtotal": subtotal,
@@ -126,9 +157,94 @@ def _validar_y_calcular_detalles(
         )
         total += subtotal
 
+    if errores:
+        return False, "\n".join(errores), [], 0.0
     return True, None, detalles, round(total, 2)
 
 
+def _sincronizar_detalles(cur, orden_id: int, detalles: List[Dict], nueva: bool) -> None:
+    """
+    Lleva las líneas de la orden a `detalles` tocando solo lo que cambió.
+    Las líneas se emparejan por (menu_item_id, variant_id) en orden de id:
+    las que siguen igual no se escriben (conservan id y estado_cocina), las
+    modificadas se actualizan, las sobrantes se borran y las nuevas se
+    insertan. Si sube la cantidad de una línea vuelve a 'pendiente' para que
+    cocina prepare lo agregado.
+    """
+    existentes: Dict[Tuple, List[Tuple]] = {}
+    if not nueva:
+        cur.execute(
+            """
+            SELECT id, menu_item_id, variant_id, cantidad,
+                   COALESCE(precio_unitario, precio), subtotal
+            FROM orden_detalles
+            WHERE orden_id = ?
+            ORDER BY id
+        """,
+            (orden_id,),
+        )
+        for row in cur.fetchall():
+            existentes.setdefault((row[1], row[2]), []).append(row)
+
+    insertar = []
+    actualizar = []
+    for d in detalles:
+        previas = existentes.get((d["menu_item_id"], d["variant_id"]))
+        if previas:
+            detalle_id, _, _, cantidad, precio_unitario, subtotal = previas.pop(0)
+            if (cantidad, precio_unitario, subtotal) != (
+                d["cantidad"],
+                d["precio_unitario"],
+                d["subtotal"],
+            ):
+                actualizar.append(
+                    (
+                        d["cantidad"],
+                        d["precio_unitario"],  # mantener 'precio' legacy
+                        d["precio_unitario"],
+                        d["subtotal"],
+                        d["cantidad"],
+                        detalle_id,
+                    )
+                )
+        else:
+            insertar.append(
+                (
+                    orden_id,
+                    d["menu_item_id"],
+                    d["variant_id"],
+                    d["cantidad"],
+                    d["precio_unitario"],  # mantener 'precio' legacy
+                    d["precio_unitario"],
+                    d["subtotal"],
+                )
+            )
+    borrar = [(row[0],) for filas in existentes.values() for row in filas]
+
+    if borrar:
+        cur.executemany("DELETE FROM orden_detalles WHERE id = ?", borrar)
+    if actualizar:
+        # En SET, `cantidad` es el valor anterior de la fila
+        cur.executemany(
+            """
+            UPDATE orden_detalles
+            SET cantidad = ?, precio = ?, precio_unitario = ?, subtotal = ?,
+                estado_cocina = CASE WHEN ? > cantidad THEN 'pendiente' ELSE estado_cocina END
+            WHERE id = ?
+        """,
+            actualizar,
+        )
+    if insertar:
+        cur.executemany(
+            """
+            INSERT INTO orden_detalles
+            (orden_id, menu_item_id, variant_id, cantidad, precio, precio_unitario, subtotal)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            insertar,
+        )
+
+
 # --------------------------
 # Crear / Actualizar órdenes
 # --------------------------
@@ -154,14 +270,11 @@ def crear_o_actualizar_orden(
                 return False, None, msg
 
             if orden_id:
-                # actualizar cabecera y reemplazar detalles
+                # actualizar cabecera; los detalles se sincronizan abajo
                 cur.execute(
                     "UPDATE ordenes SET cliente_nombre = ?, total = ?, actualizado_en = ? WHERE id = ?",
                     (cliente_nombre, float(total), ahora, orden_id),
                 )
-                cur.execute(
-                    "DELETE FROM orden_detalles WHERE orden_id = ?", (orden_id,)
-                )
                 nuevo_id = orden_id
             else:
                 # crear orden nueva
@@ -176,26 +289,8 @@ def crear_o_actualizar_orden(
                         "UPDATE mesas SET estado = 'ocupado' WHERE id = ?", (mesa_id,)
                     )
 
-            # Insertar detalles normalizados (solo fuente 'menu')
-            for d in detalles_norm:
-                cur.execute(
-                    """
-                    INSERT INTO orden_detalles
-                    (orden_id, menu_item_id, variant_id, cantidad, precio, precio_unitario, subtotal)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        nuevo_id,
-                        d["menu_item_id"],
-                        d.get("variant_id"),
-                        d["cantidad"],
-                        d["precio_unitario"],  # mantener 'precio' legacy
-                        d["precio_unitario"],
-                        d["subtotal"],
-                    ),
-                )
-
-            conn.commit()
+            # Aplicar las líneas normalizadas (solo fuente 'menu')
+            _sincronizar_detalles(cur, nuevo_id, detalles_norm, nueva=not orden_id)
         return True, nuevo_id, None
     except sqlite3.IntegrityError as e:
         return False, None, f"Integridad DB: {e}"
@@ -232,33 +327,39 @@ def cancelar_orden(orden_id: int) -> Tuple[bool, Optional[str]]:
                 cur.execute(
                     "UPDATE mesas SET estado = 'libre' WHERE id = ?", (mesa_id,)
                 )
-
-            conn.commit()
         return True, None
     except Exception as e:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
         return False, str(e)
 
 
 def insertar_factura(
     orden_id: int,
-    numero_factura: str,
+    numero_factura: Optional[str],
     cliente_nombre: str,
     forma_pago: str,
     total: float,
     total_ves: float,
-) -> Tuple[bool, Optional[str]]:
+    serie: str = SERIE_FACTURA,
+) -> Tuple[bool, Optional[str], Optional[str]]:
     """
-    Inserta una factura, marca la orden como cerrada y libera la mesa asociada.
+    Inserta una factura, marca la orden como cerrada, descuenta del
+    inventario los ingredientes de sus recetas y libera la mesa asociada.
+    Si el stock registrado no alcanza para las recetas, la factura se
+    rechaza ("Inventario insuficiente") aunque la comida ya se haya
+    servido; con config.FACTURAR_CON_FALTANTE_STOCK se factura igual y la
+    diferencia queda en faltantes_stock (ver receta_service).
+    Si numero_factura es None se toma el siguiente de la secuencia de
+    `serie` y del día en la misma transacción (sin huecos ni colisiones).
+    Devuelve (ok, numero_factura, mensaje_error).
     """
     try:
         with ConnectionManager() as conn:
             cur = conn.cursor()
             ahora = _now_iso()
 
+            if not numero_factura:
+                numero_factura = siguiente_numero(cur, serie, ahora[:10])
+
             # insertar factura
             cur.execute(
                 """INSERT INTO facturas 
@@ -281,6 +382,16 @@ def insertar_factura(
                 (ahora, orden_id),
             )
 
+            # acumular las líneas en el rollup de ventas por item
+            acumular_ventas_items(cur, orden_id)
+
+            # descontar los ingredientes de las recetas (todo o nada, o con
+            # faltante registrado según FACTURAR_CON_FALTANTE_STOCK)
+            ok, err = descontar_ingredientes_orden(cur, orden_id)
+            if not ok:
+                revertir_transaccion(conn)
+                return False, None, f"Inventario insuficiente:\n{err}"
+
             # liberar mesa asociada si existe
             cur.execute("SELECT mesa_id FROM ordenes WHERE id = ?", (orden_id,))
             row = cur.fetchone()
@@ -289,21 +400,11 @@ def insertar_factura(
                 cur.execute(
                     "UPDATE mesas SET estado = 'libre' WHERE id = ?", (mesa_id,)
                 )
-
-            conn.commit()
-        return True, None
+        return True, numero_factura, None
     except sqlite3.IntegrityError as e:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        return False, f"Integridad DB: {e}"
+        return False, None, f"Integridad DB: {e}"
     except Exception as e:
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        return False, str(e)
+        return False, None, str(e)
 
 
 def listar_ordenes_abiertas(estado: str = "abierta") -> List[Tuple]:
@@ -329,6 +430,39 @@ def listar_ordenes_abiertas(estado: str = "abierta") -> List[Tuple]:
         ]
 
 
+def buscar_ordenes_abiertas_por_cliente(termino: str) -> List[Tuple]:
+    """
+    Busca órdenes abiertas por nombre de cliente (índice FTS5: sin tildes,
+    por prefijo de palabra; LIKE si no existe).
+    Retorna tuplas (orden_id, cliente, total, estado, mesa_numero, mesa_id).
+    """
+    consulta = consulta_prefijo(termino)
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        if consulta and fts_listo(conn, "ordenes_fts"):
+            cur.execute(
+                """
+                SELECT o.id, o.cliente_nombre, o.total, o.estado, m.numero, m.id
+                FROM ordenes_fts
+                JOIN ordenes o ON o.id = ordenes_fts.rowid
+                JOIN mesas m ON o.mesa_id = m.id
+                WHERE ordenes_fts MATCH ? AND o.estado = 'abierta'
+                """,
+                (consulta,),
+            )
+        else:
+            cur.execute(
+                """
+                SELECT o.id, o.cliente_nombre, o.total, o.estado, m.numero, m.id
+                FROM ordenes o
+                JOIN mesas m ON o.mesa_id = m.id
+                WHERE o.cliente_nombre LIKE ? AND o.estado = 'abierta'
+                """,
+                (f"%{termino}%",),
+            )
+        return [tuple(row) for row in cur.fetchall()]
+
+
 def obtener_orden_por_id(orden_id: int) -> Optional[Dict]:
     """
     Obtiene una orden por ID.
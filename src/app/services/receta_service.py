@@ -0,0 +1,198 @@
+# src/app/services/receta_service.py
+"""
+Recetas de los items del menú y consumo de ingredientes por orden.
+
+Al facturar una orden, el consumo de todos sus ingredientes se calcula con
+una sola consulta agregada (líneas x receta, agrupado por producto) y se
+descuenta con el motor de stock en la misma transacción. Al anular la
+factura se repone exactamente lo registrado en movimientos_stock.
+
+Si el stock registrado no alcanza, la política depende de
+config.FACTURAR_CON_FALTANTE_STOCK: por defecto la venta se rechaza; con
+la opción activa se descuenta lo disponible y la diferencia queda en
+faltantes_stock para conciliarla después.
+"""
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from ..config import FACTURAR_CON_FALTANTE_STOCK
+from ..db.connection import ConnectionManager
+from ..models import RecetaIngrediente
+from .stock_service import aplicar_movimientos
+
+logger = logging.getLogger(__name__)
+
+MOTIVO_VENTA = "venta"
+MOTIVO_ANULACION = "anulacion_factura"
+
+
+def _referencia_orden(orden_id: int) -> str:
+    return f"orden:{orden_id}"
+
+
+def obtener_receta(menu_item_id: int, variant_id: Optional[int] = None) -> List[RecetaIngrediente]:
+    """
+    Devuelve las filas de receta del item (variant_id None) o de la variante.
+    """
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT r.id, r.menu_item_id, r.variant_id, r.producto_id, r.cantidad, p.nombre
+            FROM recetas r
+            JOIN productos p ON p.id = r.producto_id
+            WHERE r.menu_item_id = ? AND r.variant_id IS ?
+            ORDER BY p.nombre
+        """,
+            (menu_item_id, variant_id),
+        )
+        return [RecetaIngrediente(*row) for row in cur.fetchall()]
+
+
+def guardar_receta(
+    menu_item_id: int, ingredientes: Dict[int, int], variant_id: Optional[int] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Reemplaza la receta del item (o de la variante) por `ingredientes`
+    ({producto_id: cantidad}). Un dict vacío elimina la receta.
+    Retorna (ok, error).
+    """
+    for producto_id, cantidad in ingredientes.items():
+        if int(cantidad) <= 0:
+            return False, f"Cantidad inválida para producto id={producto_id}"
+    try:
+        with ConnectionManager() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "DELETE FROM recetas WHERE menu_item_id = ? AND variant_id IS ?",
+                (menu_item_id, variant_id),
+            )
+            cur.executemany(
+                "INSERT INTO recetas (menu_item_id, variant_id, producto_id, cantidad) VALUES (?, ?, ?, ?)",
+                [
+                    (menu_item_id, variant_id, int(producto_id), int(cantidad))
+                    for producto_id, cantidad in ingredientes.items()
+                ],
+            )
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
+
+def consumo_ingredientes_orden(cur, orden_id: int) -> Dict[int, int]:
+    """
+    {producto_id: cantidad} que consumen todas las líneas de la orden, en
+    una consulta. Cada línea usa la receta de su variante si existe; si no,
+    la receta base del item.
+    """
+    cur.execute(
+        """
+        SELECT r.producto_id, SUM(r.cantidad * d.cantidad)
+        FROM orden_detalles d
+        JOIN recetas r ON r.menu_item_id = d.menu_item_id
+        WHERE d.orden_id = ?
+          AND (
+                (d.variant_id IS NOT NULL AND r.variant_id = d.variant_id)
+             OR (r.variant_id IS NULL AND NOT EXISTS (
+                    SELECT 1 FROM recetas rv
+                    WHERE rv.menu_item_id = d.menu_item_id AND rv.variant_id = d.variant_id
+                ))
+          )
+        GROUP BY r.producto_id
+    """,
+        (orden_id,),
+    )
+    return {int(row[0]): int(row[1]) for row in cur.fetchall()}
+
+
+def descontar_ingredientes_orden(
+    cur, orden_id: int, registrar_faltante: Optional[bool] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Descuenta del inventario los ingredientes de la orden dentro de la
+    transacción de `cur`. Si falta stock no se descuenta nada y se devuelve
+    (False, mensaje) con todos los productos faltantes, salvo que
+    `registrar_faltante` (por defecto config.FACTURAR_CON_FALTANTE_STOCK)
+    esté activo: entonces se descuenta lo disponible y el resto se
+    registra en faltantes_stock.
+    """
+    if registrar_faltante is None:
+        registrar_faltante = FACTURAR_CON_FALTANTE_STOCK
+    consumo = consumo_ingredientes_orden(cur, orden_id)
+    if not consumo:
+        return True, None
+    referencia = _referencia_orden(orden_id)
+    ok, err = aplicar_movimientos(cur, consumo, MOTIVO_VENTA, referencia)
+    if ok or not registrar_faltante:
+        return ok, err
+    return _descontar_con_faltante(cur, consumo, referencia)
+
+
+def _descontar_con_faltante(cur, consumo: Dict[int, int], referencia: str) -> Tuple[bool, Optional[str]]:
+    """Descuenta hasta el stock disponible y registra la diferencia como faltante."""
+    ids = list(consumo)
+    placeholders = ",".join("?" for _ in ids)
+    cur.execute(f"SELECT id, stock FROM productos WHERE id IN ({placeholders})", ids)
+    stocks = {int(row[0]): int(row[1]) for row in cur.fetchall()}
+    descontar = {pid: min(cantidad, max(stocks.get(pid, 0), 0)) for pid, cantidad in consumo.items()}
+    faltantes = [
+        (pid, cantidad - descontar[pid], referencia)
+        for pid, cantidad in consumo.items()
+        if cantidad > descontar[pid]
+    ]
+    ok, err = aplicar_movimientos(cur, descontar, MOTIVO_VENTA, referencia)
+    if not ok:
+        return ok, err
+    cur.executemany(
+        "INSERT INTO faltantes_stock (producto_id, cantidad, referencia) VALUES (?, ?, ?)",
+        faltantes,
+    )
+    logger.warning(
+        "Venta %s facturada con faltante de stock: %s",
+        referencia,
+        ", ".join(f"producto id={pid} ({cantidad})" for pid, cantidad, _ in faltantes),
+    )
+    return True, None
+
+
+def obtener_faltantes_stock() -> List[Tuple[int, str, int, Optional[str], str]]:
+    """
+    Faltantes registrados al facturar sin stock suficiente:
+    [(producto_id, producto, cantidad, referencia, fecha)], más recientes primero.
+    """
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT f.producto_id, p.nombre, f.cantidad, f.referencia, f.fecha
+            FROM faltantes_stock f
+            JOIN productos p ON p.id = f.producto_id
+            ORDER BY f.fecha DESC, f.id DESC
+        """
+        )
+        return [tuple(row) for row in cur.fetchall()]
+
+
+def reponer_ingredientes_orden(cur, orden_id: int) -> Tuple[bool, Optional[str]]:
+    """
+    Devuelve al inventario lo que descontó la venta de la orden, según
+    movimientos_stock (no según la receta actual, que pudo cambiar). Los
+    faltantes registrados para la venta se descartan.
+    """
+    referencia = _referencia_orden(orden_id)
+    cur.execute("DELETE FROM faltantes_stock WHERE referencia = ?", (referencia,))
+    cur.execute(
+        """
+        SELECT m.producto_id, SUM(m.cantidad)
+        FROM movimientos_stock m
+        WHERE m.referencia = ? AND m.motivo IN (?, ?)
+        GROUP BY m.producto_id
+        HAVING SUM(m.cantidad) != 0
+    """,
+        (referencia, MOTIVO_VENTA, MOTIVO_ANULACION),
+    )
+    # La suma de las salidas es negativa: usada como diff, las repone
+    pendiente = {int(row[0]): int(row[1]) for row in cur.fetchall()}
+    if not pendiente:
+        return True, None
+    return aplicar_movimientos(cur, pendiente, MOTIVO_ANULACION, referencia)
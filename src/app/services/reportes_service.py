@@ -1,6 +1,10 @@
 # src/app/services/reportes_service.py
-from typing import List, Tuple, Dict, Any
+from typing import List, Tuple, Dict, Any, Optional
+import numpy as np
+
 from ..db.connection import ConnectionManager
+from ..utils.fechas import rango_dia, rango_fechas
+from . import tasa_cambio_service
 
 
 # ==========================================
@@ -13,39 +17,36 @@ def obtener_ventas_por_periodo(
 ) -> Tuple[float, float, int, float]:
     """
     Obtiene métricas de ventas para un período.
+    Las órdenes facturadas salen del rollup ventas_diarias; las órdenes
+    aún abiertas se suman desde `ordenes` (pocas filas, vía índice).
 
     Returns:
         Tuple[total_usd, total_ves, num_ordenes, ticket_promedio]
     """
+    desde, hasta = rango_fechas(fecha_inicio, fecha_fin)
     with ConnectionManager() as conn:
         cur = conn.cursor()
 
-        # Total en USD y número de órdenes
         cur.execute(
             """
             SELECT
-                COALESCE(SUM(total), 0) as total_usd,
-                COUNT(*) as num_ordenes
-            FROM ordenes
-            WHERE DATE(fecha) BETWEEN ? AND ?
-            AND estado IN ('abierta', 'cerrada')
+                (SELECT COALESCE(SUM(total_usd), 0) FROM ventas_diarias
+                 WHERE fecha >= ? AND fecha < ?)
+                + (SELECT COALESCE(SUM(total), 0) FROM ordenes
+                   WHERE estado = 'abierta' AND fecha >= ? AND fecha < ?) as total_usd,
+                (SELECT COALESCE(SUM(total_ves), 0) FROM ventas_diarias
+                 WHERE fecha >= ? AND fecha < ?) as total_ves,
+                (SELECT COALESCE(SUM(num_facturas), 0) FROM ventas_diarias
+                 WHERE fecha >= ? AND fecha < ?)
+                + (SELECT COUNT(*) FROM ordenes
+                   WHERE estado = 'abierta' AND fecha >= ? AND fecha < ?) as num_ordenes
             """,
-            (fecha_inicio, fecha_fin),
+            (desde, hasta) * 5,
         )
         row = cur.fetchone()
         total_usd = row[0] if row else 0.0
-        num_ordenes = row[1] if row else 0
-
-        # Total en VES (de facturas)
-        cur.execute(
-            """
-            SELECT COALESCE(SUM(total_ves), 0) as total_ves
-            FROM facturas
-            WHERE DATE(fecha) BETWEEN ? AND ?
-            """,
-            (fecha_inicio, fecha_fin),
-        )
-        total_ves = cur.fetchone()[0] or 0.0
+        total_ves = row[1] if row else 0.0
+        num_ordenes = row[2] if row else 0
 
         # Ticket promedio
         ticket_promedio = total_usd / num_ordenes if num_ordenes > 0 else 0.0
@@ -55,66 +56,186 @@ def obtener_ventas_por_periodo(
 
 def obtener_ventas_diarias(fecha_inicio: str, fecha_fin: str) -> List[Tuple]:
     """
-    Obtiene ventas agrupadas por día.
+    Obtiene ventas agrupadas por día (rollup ventas_diarias + órdenes abiertas).
 
     Returns:
         List[Tuple[fecha, total_usd, num_ordenes]]
     """
+    desde, hasta = rango_fechas(fecha_inicio, fecha_fin)
     with ConnectionManager() as conn:
         cur = conn.cursor()
         cur.execute(
             """
             SELECT
-                DATE(fecha) as fecha,
-                COALESCE(SUM(total), 0) as total_usd,
-                COUNT(*) as num_ordenes
-            FROM ordenes
-            WHERE DATE(fecha) BETWEEN ? AND ?
-            AND estado IN ('abierta', 'cerrada')
-            GROUP BY DATE(fecha)
+                fecha,
+                COALESCE(SUM(total_usd), 0) as total_usd,
+                SUM(num_ordenes) as num_ordenes
+            FROM (
+                SELECT fecha, total_usd, num_facturas as num_ordenes
+                FROM ventas_diarias
+                WHERE fecha >= ? AND fecha < ?
+                UNION ALL
+                SELECT DATE(fecha), total, 1
+                FROM ordenes
+                WHERE estado = 'abierta' AND fecha >= ? AND fecha < ?
+            )
+            GROUP BY fecha
             ORDER BY fecha DESC
             """,
-            (fecha_inicio, fecha_fin),
+            (desde, hasta, desde, hasta),
         )
         return cur.fetchall()
 
 
 # ==========================================
-# REPORTES DE PRODUCTOS (MENU ITEMS)
+# REVALUACIÓN EN BOLÍVARES
 # ==========================================
 
+# julianday('1970-01-01') = 2440587.5: días desde la época, como datetime64[D]
+_JULIANDAY_EPOCA = 2440587.5
 
-def obtener_productos_mas_vendidos(
-    fecha_inicio: str, fecha_fin: str, limit: int = 10
-) -> List[Tuple]:
+
+def _dias_desde_epoca(fechas) -> np.ndarray:
+    return np.array([str(f)[:10] for f in fechas], dtype="datetime64[D]").astype(np.int64)
+
+
+def revaluar_ventas_ves(
+    fecha_inicio: str, fecha_fin: str, tasa: Optional[float] = None
+) -> Dict[str, Any]:
     """
-    Obtiene los items del menú más vendidos por cantidad.
+    Reexpresa en bolívares las ventas facturadas del período.
+
+    Cada factura guarda total_ves congelado con la tasa de su día. Con
+    `tasa` se reexpresa todo a esa tasa; sin ella, cada día se valora con la
+    tasa vigente según el historial de tasas_cambio (la última registrada
+    ese día o antes). Los días anteriores a la primera tasa conservan su
+    total_ves.
+
+    Como la tasa es única por día, se parte del rollup ventas_diarias (una
+    fila por día y forma de pago) en lugar de cada factura: el resultado es
+    el mismo y un año son ~365 filas. Días y tasas se cargan como arreglos
+    NumPy, la tasa de cada día se alinea con searchsorted y totales, serie
+    diaria y diferencias se calculan sin bucles por fila.
 
     Returns:
-        List[Tuple[item_nombre, cantidad_vendida, ingresos_totales]]
+        Dict con num_facturas, dias_sin_tasa, total_usd,
+        total_ves_registrado, total_ves_reexpresado, diferencia_ves y
+        diario: List[Tuple[fecha, usd, ves_registrado, ves_reexpresado, diferencia]]
     """
+    desde, hasta = rango_fechas(fecha_inicio, fecha_fin)
     with ConnectionManager() as conn:
         cur = conn.cursor()
         cur.execute(
-            """
+            f"""
+            SELECT CAST(julianday(fecha) - {_JULIANDAY_EPOCA} AS INTEGER),
+                   SUM(total_usd), SUM(total_ves), SUM(num_facturas)
+            FROM ventas_diarias
+            WHERE fecha >= ? AND fecha < ?
+            GROUP BY fecha
+            ORDER BY fecha
+            """,
+            (desde, hasta),
+        )
+        filas = cur.fetchall()
+
+    datos = np.array([tuple(f) for f in filas], dtype=np.float64).reshape(-1, 4)
+    dias = datos[:, 0].astype(np.int64)
+    usd = datos[:, 1]
+    ves_registrado = datos[:, 2]
+    num_facturas = datos[:, 3]
+
+    if tasa is not None:
+        tasas_dia = np.full(len(dias), float(tasa))
+    else:
+        # Historial ordenado por fecha (caché de tasa_cambio_service)
+        historial = tasa_cambio_service.listar_tasas()[::-1]
+        dias_tasa = _dias_desde_epoca([t.fecha for t in historial])
+        valores_tasa = np.array([t.tasa for t in historial], dtype=np.float64)
+        posicion = np.searchsorted(dias_tasa, dias, side="right") - 1
+        con_tasa = posicion >= 0
+        tasas_dia = np.full(len(dias), np.nan)
+        tasas_dia[con_tasa] = valores_tasa[posicion[con_tasa]]
+
+    sin_tasa = np.isnan(tasas_dia)
+    ves_reexpresado = np.where(sin_tasa, ves_registrado, usd * np.nan_to_num(tasas_dia))
+    fechas_dia = dias.astype("datetime64[D]").astype(str)
+
+    diario = list(
+        zip(
+            fechas_dia.tolist(),
+            np.round(usd, 2).tolist(),
+            np.round(ves_registrado, 2).tolist(),
+            np.round(ves_reexpresado, 2).tolist(),
+            np.round(ves_reexpresado - ves_registrado, 2).tolist(),
+        )
+    )
+
+    total_registrado = float(ves_registrado.sum())
+    total_reexpresado = float(ves_reexpresado.sum())
+    return {
+        "num_facturas": int(num_facturas.sum()),
+        "dias_sin_tasa": int(sin_tasa.sum()),
+        "total_usd": round(float(usd.sum()), 2),
+        "total_ves_registrado": round(total_registrado, 2),
+        "total_ves_reexpresado": round(total_reexpresado, 2),
+        "diferencia_ves": round(total_reexpresado - total_registrado, 2),
+        "diario": diario,
+    }
+
+
+# ==========================================
+# REPORTES DE PRODUCTOS (MENU ITEMS)
+# ==========================================
+
+
+# Ventas por item en el rango: órdenes cerradas desde el rollup
+# ventas_items_diarias y órdenes abiertas desde orden_detalles.
+# Parámetros: (desde, hasta, desde, hasta)
+_VENTAS_ITEMS_RANGO = """
+    SELECT menu_item_id, cantidad, ingresos
+    FROM ventas_items_diarias
+    WHERE fecha >= ? AND fecha < ?
+    UNION ALL
+    SELECT od.menu_item_id, od.cantidad, od.subtotal
+    FROM ordenes o
+    JOIN orden_detalles od ON od.orden_id = o.id
+    WHERE o.estado = 'abierta' AND o.fecha >= ? AND o.fecha < ?
+"""
+
+
+def _ranking_items(fecha_inicio: str, fecha_fin: str, orden: str, limit: int) -> List[Tuple]:
+    desde, hasta = rango_fechas(fecha_inicio, fecha_fin)
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            f"""
             SELECT
                 mi.nombre as item,
-                SUM(od.cantidad) as cantidad_vendida,
-                SUM(od.subtotal) as ingresos_totales
-            FROM orden_detalles od
-            JOIN ordenes o ON od.orden_id = o.id
-            JOIN menu_items mi ON od.menu_item_id = mi.id
-            WHERE DATE(o.fecha) BETWEEN ? AND ?
-            AND o.estado IN ('abierta', 'cerrada')
+                SUM(v.cantidad) as cantidad_vendida,
+                SUM(v.ingresos) as ingresos_totales
+            FROM ({_VENTAS_ITEMS_RANGO}) v
+            JOIN menu_items mi ON v.menu_item_id = mi.id
             GROUP BY mi.id, mi.nombre
-            ORDER BY cantidad_vendida DESC
+            ORDER BY {orden} DESC
             LIMIT ?
             """,
-            (fecha_inicio, fecha_fin, limit),
+            (desde, hasta, desde, hasta, limit),
         )
         return cur.fetchall()
 
 
+def obtener_productos_mas_vendidos(
+    fecha_inicio: str, fecha_fin: str, limit: int = 10
+) -> List[Tuple]:
+    """
+    Obtiene los items del menú más vendidos por cantidad.
+
+    Returns:
+        List[Tuple[item_nombre, cantidad_vendida, ingresos_totales]]
+    """
+    return _ranking_items(fecha_inicio, fecha_fin, "cantidad_vendida", limit)
+
+
 def obtener_productos_por_ingresos(
     fecha_inicio: str, fecha_fin: str, limit: int = 10
 ) -> List[Tuple]:
@@ -124,43 +245,19 @@ def obtener_productos_por_ingresos(
     Returns:
         List[Tuple[item_nombre, cantidad_vendida, ingresos_totales]]
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT
-                mi.nombre as item,
-                SUM(od.cantidad) as cantidad_vendida,
-                SUM(od.subtotal) as ingresos_totales
-            FROM orden_detalles od
-            JOIN ordenes o ON od.orden_id = o.id
-            JOIN menu_items mi ON od.menu_item_id = mi.id
-            WHERE DATE(o.fecha) BETWEEN ? AND ?
-            AND o.estado IN ('abierta', 'cerrada')
-            GROUP BY mi.id, mi.nombre
-            ORDER BY ingresos_totales DESC
-            LIMIT ?
-            """,
-            (fecha_inicio, fecha_fin, limit),
-        )
-        return cur.fetchall()
+    return _ranking_items(fecha_inicio, fecha_fin, "ingresos_totales", limit)
 
 
 def calcular_total_ingresos(fecha_inicio: str, fecha_fin: str) -> float:
     """
     Calcula el total de ingresos para calcular porcentajes.
     """
+    desde, hasta = rango_fechas(fecha_inicio, fecha_fin)
     with ConnectionManager() as conn:
         cur = conn.cursor()
         cur.execute(
-            """
-            SELECT COALESCE(SUM(od.subtotal), 0)
-            FROM orden_detalles od
-            JOIN ordenes o ON od.orden_id = o.id
-            WHERE DATE(o.fecha) BETWEEN ? AND ?
-            AND o.estado IN ('abierta', 'cerrada')
-            """,
-            (fecha_inicio, fecha_fin),
+            f"SELECT COALESCE(SUM(ingresos), 0) FROM ({_VENTAS_ITEMS_RANGO})",
+            (desde, hasta, desde, hasta),
         )
         return cur.fetchone()[0] or 0.0
 
@@ -188,7 +285,7 @@ def calcular_porcentaje(parte: float, total: float) -> float:
 def obtener_resumen_ventas_dia(fecha: str) -> Dict[str, Any]:
     """
     Obtiene el resumen de ventas del día desglosado por método de pago.
-    Basado en la tabla de FACTURAS.
+    Basado en las FACTURAS, leídas del rollup ventas_diarias.
     """
     with ConnectionManager() as conn:
         cur = conn.cursor()
@@ -198,14 +295,14 @@ def obtener_resumen_ventas_dia(fecha: str) -> Dict[str, Any]:
             """
             SELECT 
                 forma_pago,
-                count(*) as cantidad,
-                COALESCE(SUM(total), 0) as total_usd,
+                COALESCE(SUM(num_facturas), 0) as cantidad,
+                COALESCE(SUM(total_usd), 0) as total_usd,
                 COALESCE(SUM(total_ves), 0) as total_ves
-            FROM facturas
-            WHERE DATE(fecha) = ?
+            FROM ventas_diarias
+            WHERE fecha >= ? AND fecha < ?
             GROUP BY forma_pago
             """,
-            (fecha,)
+            rango_dia(fecha),
         )
         
         rows = cur.fetchall()
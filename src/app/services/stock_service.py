@@ -66,12 +66,71 @@ def consultar_stock_batch(producto_ids: List[int]) -> Dict[int, Optional[int]]:
         return {pid: None for pid in producto_ids}
 
 
-def aplicar_cambios_stock_atomic(cambios: Dict[int, int]) -> Tuple[bool, Optional[str]]:
+def aplicar_movimientos(
+    cur, cambios: Dict[int, int], motivo: str, referencia: Optional[str] = None
+) -> Tuple[bool, Optional[str]]:
+    """
+    Aplica un lote de diffs de stock dentro de la transacción de `cur` y
+    los registra en movimientos_stock.
+    'cambios' es dict producto_id -> diff (positivo = reducir stock, negativo = aumentar stock).
+
+    Un solo executemany con guarda (stock >= diff) hace a la vez la
+    validación y la escritura; si el número de filas modificadas no
+    coincide, algún producto no existe o no tiene stock suficiente: el lote
+    se deshace y se devuelve (False, mensaje) con todos los fallos.
+    """
+    lote = [(int(pid), int(diff)) for pid, diff in cambios.items() if diff]
+    if not lote:
+        return True, None
+
+    # El savepoint permite deshacer solo este lote para describir los fallos
+    # con el stock original, sin tocar el resto de la transacción.
+    cur.execute("SAVEPOINT movimientos_stock")
+    try:
+        cur.executemany(
+            "UPDATE productos SET stock = stock - ? WHERE id = ? AND stock >= ?",
+            [(diff, pid, diff) for pid, diff in lote],
+        )
+        if cur.rowcount != len(lote):
+            cur.execute("ROLLBACK TO movimientos_stock")
+            return False, _describir_fallos(cur, lote)
+
+        cur.executemany(
+            "INSERT INTO movimientos_stock (producto_id, cantidad, motivo, referencia) VALUES (?, ?, ?, ?)",
+            [(pid, -diff, motivo, referencia) for pid, diff in lote],
+        )
+    except Exception:
+        cur.execute("ROLLBACK TO movimientos_stock")
+        raise
+    finally:
+        cur.execute("RELEASE movimientos_stock")
+    return True, None
+
+
+def _describir_fallos(cur, lote: List[Tuple[int, int]]) -> str:
+    """Mensaje con los productos inexistentes o sin stock suficiente del lote."""
+    ids = [pid for pid, _ in lote]
+    placeholders = ",".join("?" for _ in ids)
+    cur.execute(f"SELECT id, stock FROM productos WHERE id IN ({placeholders})", ids)
+    stocks = {int(r[0]): int(r[1]) for r in cur.fetchall()}
+    errores = []
+    for pid, diff in lote:
+        if pid not in stocks:
+            errores.append(f"Producto no existe id={pid}")
+        elif stocks[pid] < diff:
+            errores.append(
+                f"Stock insuficiente para producto id={pid} (solicitado={diff}, disponible={stocks[pid]})"
+            )
+    return "\n".join(errores) or "No se pudieron aplicar los cambios de stock"
+
+
+def aplicar_cambios_stock_atomic(
+    cambios: Dict[int, int], motivo: str = "ajuste", referencia: Optional[str] = None
+) -> Tuple[bool, Optional[str]]:
     """
     Aplica diffs de stock de forma atómica (todos o ninguno).
     'cambios' es dict producto_id -> diff (positivo = reducir stock, negativo = aumentar stock).
     Retorna (ok, mensaje_error).
-    Nota: en SQLite usamos transacción explícita. Validamos que no quedará stock negativo.
     """
     if not cambios:
         return True, None
@@ -79,51 +138,35 @@ def aplicar_cambios_stock_atomic(cambios: Dict[int, int]) -> Tuple[bool, Optiona
     try:
         with ConnectionManager() as conn:
             cur = conn.cursor()
-            # Asegurar modo transaccional explícito
-            try:
-                cur.execute("BEGIN")
-            except Exception:
-                pass
-
-            # Validar que todos los productos existen y que los diffs positivos tienen stock suficiente
-            ids = list(cambios.keys())
-            placeholders = ",".join("?" for _ in ids)
-            cur.execute(f"SELECT id, stock FROM productos WHERE id IN ({placeholders})", tuple(ids))
-            rows = {int(r[0]): (int(r[1]) if r[1] is not None else None) for r in cur.fetchall()}
-
-            for pid, diff in cambios.items():
-                if pid not in rows:
-                    conn.rollback()
-                    return False, f"Producto no existe id={pid}"
-                stock_actual = rows[pid]
-                # diff positivo significa consumir stock adicional
-                if diff > 0:
-                    if stock_actual is None:
-                        conn.rollback()
-                        return False, f"Producto id={pid} no tiene campo stock definido"
-                    if stock_actual < diff:
-                        conn.rollback()
-                        return False, f"Stock insuficiente para producto id={pid} (solicitado={diff}, disponible={stock_actual})"
-
-            # Aplicar cambios
-            for pid, diff in cambios.items():
-                # reducir stock si diff>0 => stock = stock - diff
-                # aumentar stock si diff<0 => stock = stock - diff (restar negativo -> sumar)
-                cur.execute("UPDATE productos SET stock = stock - ? WHERE id = ?", (diff, pid))
-
-            conn.commit()
-        return True, None
+            ok, err = aplicar_movimientos(cur, cambios, motivo, referencia)
+        return ok, err
     except sqlite3.IntegrityError as ie:
         logger.exception("Integrity error aplicando cambios de stock: %s", ie)
-        try:
-            conn.rollback()
-        except Exception:
-            pass
         return False, str(ie)
     except Exception as e:
         logger.exception("Error aplicando cambios de stock: %s", e)
-        try:
-            conn.rollback()
-        except Exception:
-            pass
-        return False, str(e)
\ No newline at end of file
+        return False, str(e)
+
+
+def auditar_stock() -> List[Tuple[int, int, int]]:
+    """
+    Compara productos.stock con la suma de sus movimientos.
+    Devuelve [(producto_id, stock, stock_según_movimientos)] de los que no
+    coinciden; lista vacía si el inventario cuadra.
+    """
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT p.id, p.stock, COALESCE(m.total, 0)
+            FROM productos p
+            LEFT JOIN (
+                SELECT producto_id, SUM(cantidad) AS total
+                FROM movimientos_stock
+                GROUP BY producto_id
+            ) m ON m.producto_id = p.id
+            WHERE p.stock != COALESCE(m.total, 0)
+            ORDER BY p.id
+        """
+        )
+        return [tuple(r) for r in cur.fetchall()]
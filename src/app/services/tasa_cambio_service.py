@@ -2,6 +2,44 @@ from ..db.connection import ConnectionManager
 from ..models import TasaCambio
 from typing import Optional, List, Tuple
 from datetime import date
+import bisect
+import threading
+
+# Caché en memoria del historial de tasas (una fila por día), ordenado por
+# fecha ascendente: (fechas, tasas) en listas paralelas para usar bisect.
+# La tasa cambia ~1 vez al día, así que tras la primera lectura conversiones
+# y consultas no tocan la BD. guardar/actualizar/eliminar llaman a
+# invalidar_cache_tasas() tras el commit; los cambios hechos por otra
+# instancia llegan por el despachador de cambios (MainWindow se suscribe a
+# tasas_cambio). Los TasaCambio devueltos son compartidos: no modificarlos.
+_historial: Optional[Tuple[List[str], List[TasaCambio]]] = None
+_historial_lock = threading.Lock()
+
+
+def _cargar_historial() -> Tuple[List[str], List[TasaCambio]]:
+    with ConnectionManager() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT id, fecha, tasa FROM tasas_cambio ORDER BY fecha")
+        tasas = [TasaCambio(*row) for row in cur.fetchall()]
+    return [str(t.fecha) for t in tasas], tasas
+
+
+def _obtener_historial() -> Tuple[List[str], List[TasaCambio]]:
+    global _historial
+    historial = _historial
+    if historial is not None:
+        return historial
+    with _historial_lock:
+        if _historial is None:
+            _historial = _cargar_historial()
+        return _historial
+
+
+def invalidar_cache_tasas() -> None:
+    """Descarta el historial en memoria; la próxima lectura lo recarga."""
+    global _historial
+    with _historial_lock:
+        _historial = None
 
 
 def guardar_tasa(fecha: str, tasa: float) -> Tuple[bool, Optional[str]]:
@@ -9,13 +47,14 @@ def guardar_tasa(fecha: str, tasa: float) -> Tuple[bool, Optional[str]]:
     Guarda o actualiza una tasa de cambio.
     Retorna (ok, error).
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        try:
+    try:
+        with ConnectionManager() as conn:
+            cur = conn.cursor()
             cur.execute("INSERT OR REPLACE INTO tasas_cambio (fecha, tasa) VALUES (?, ?)", (fecha, tasa))
-            return True, None
-        except Exception as e:
-            return False, str(e)
+    except Exception as e:
+        return False, str(e)
+    invalidar_cache_tasas()
+    return True, None
 
 
 def obtener_tasa(fecha: str) -> Optional[TasaCambio]:
@@ -23,11 +62,21 @@ def obtener_tasa(fecha: str) -> Optional[TasaCambio]:
     Obtiene la tasa de cambio para una fecha específica.
     Retorna un objeto TasaCambio o None.
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT id, fecha, tasa FROM tasas_cambio WHERE fecha = ?", (fecha,))
-        row = cur.fetchone()
-        return TasaCambio(*row) if row else None
+    fechas, tasas = _obtener_historial()
+    i = bisect.bisect_left(fechas, str(fecha))
+    if i < len(fechas) and fechas[i] == str(fecha):
+        return tasas[i]
+    return None
+
+
+def obtener_tasa_vigente(fecha: str) -> Optional[TasaCambio]:
+    """
+    Devuelve la tasa vigente en una fecha: la última registrada en esa
+    fecha o antes. Retorna un objeto TasaCambio o None si no hay ninguna.
+    """
+    fechas, tasas = _obtener_historial()
+    i = bisect.bisect_right(fechas, str(fecha))
+    return tasas[i - 1] if i else None
 
 
 def usd_a_ves(monto_usd: float, fecha: str) -> Optional[float]:
@@ -55,11 +104,8 @@ def listar_tasas() -> List[TasaCambio]:
     Lista todas las tasas de cambio ordenadas por fecha descendente.
     Retorna lista de objetos TasaCambio.
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT id, fecha, tasa FROM tasas_cambio ORDER BY fecha DESC")
-        rows = cur.fetchall()
-        return [TasaCambio(*row) for row in rows]
+    _, tasas = _obtener_historial()
+    return tasas[::-1]
 
     
 def eliminar_tasa(fecha: str) -> Tuple[bool, Optional[str]]:
@@ -67,13 +113,14 @@ def eliminar_tasa(fecha: str) -> Tuple[bool, Optional[str]]:
     Elimina una tasa de cambio por fecha.
     Retorna (ok, error).
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        try:
+    try:
+        with ConnectionManager() as conn:
+            cur = conn.cursor()
             cur.execute("DELETE FROM tasas_cambio WHERE fecha = ?", (fecha,))
-            return True, None
-        except Exception as e:
-            return False, str(e)
+    except Exception as e:
+        return False, str(e)
+    invalidar_cache_tasas()
+    return True, None
 
         
 def actualizar_tasa(fecha: str, nueva_tasa: float) -> Tuple[bool, Optional[str]]:
@@ -81,13 +128,14 @@ def actualizar_tasa(fecha: str, nueva_tasa: float) -> Tuple[bool, Optional[str]]
     Actualiza una tasa de cambio existente.
     Retorna (ok, error).
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        try:
+    try:
+        with ConnectionManager() as conn:
+            cur = conn.cursor()
             cur.execute("UPDATE tasas_cambio SET tasa = ? WHERE fecha = ?", (nueva_tasa, fecha))
-            return True, None
-        except Exception as e:
-            return False, str(e)
+    except Exception as e:
+        return False, str(e)
+    invalidar_cache_tasas()
+    return True, None
 
         
 def obtener_tasa_del_dia() -> Optional[TasaCambio]:
@@ -95,11 +143,8 @@ def obtener_tasa_del_dia() -> Optional[TasaCambio]:
     Devuelve la tasa más reciente registrada en la base de datos.
     Retorna un objeto TasaCambio o None.
     """
-    with ConnectionManager() as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT id, fecha, tasa FROM tasas_cambio ORDER BY fecha DESC LIMIT 1")
-        row = cur.fetchone()
-        return TasaCambio(*row) if row else None
+    _, tasas = _obtener_historial()
+    return tasas[-1] if tasas else None
 
 
 def obtener_tasa_actual() -> Optional[float]:
@@ -1,5 +1,6 @@
 # src/app/services/usuarios_service.py
 from typing import List, Optional, Tuple
+import logging
 import sqlite3
 import secrets
 from datetime import datetime, timedelta
@@ -7,6 +8,8 @@ from datetime import datetime, timedelta
 from ..db.connection import ConnectionManager
 from ..models import Usuario
 
+logger = logging.getLogger(__name__)
+
 
 def obtener_usuarios() -> List[Usuario]:
     """
@@ -243,16 +246,43 @@ def eliminar_usuario_por_id(usuario_id: int) -> Tuple[bool, Optional[str]]:
 def validar_credenciales(usuario: str, clave: str) -> Optional[Usuario]:
     """
     Valida las credenciales de un usuario y devuelve el objeto Usuario si son correctas.
+
+    Es lenta a propósito (bcrypt): desde la interfaz hay que llamarla fuera
+    del hilo principal. Si la clave guardada está en un formato anterior
+    (SHA256) se reemplaza por un hash bcrypt al validar.
     """
     user = obtener_usuario_por_username(usuario)
     if not user:
         return None
     
     # Verificar la contraseña
-    if Usuario.verify_password(clave, user.clave):
-        return user
-    
-    return None
+    if not Usuario.verify_password(clave, user.clave):
+        return None
+
+    if Usuario.necesita_rehash(user.clave):
+        _rehashear_clave(user, clave)
+
+    return user
+
+
+def _rehashear_clave(user: Usuario, clave: str) -> None:
+    """
+    Guarda la clave con bcrypt. Solo reemplaza el hash que se verificó: si
+    la clave cambió mientras tanto no se toca. Un fallo aquí no impide el
+    login; se reintenta en el siguiente.
+    """
+    clave_hash = Usuario.hash_password(clave)
+    try:
+        with ConnectionManager() as conn:
+            cur = conn.cursor()
+            cur.execute(
+                "UPDATE usuarios SET clave = ? WHERE id = ? AND clave = ?",
+                (clave_hash, user.id, user.clave),
+            )
+            if cur.rowcount:
+                user.clave = clave_hash
+    except sqlite3.Error as e:
+        logger.warning("No se pudo actualizar el hash de la clave del usuario id=%s: %s", user.id, e)
 
 
 def generar_token_recuperacion(email: str) -> Tuple[bool, Optional[str], Optional[str]]:
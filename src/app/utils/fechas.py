@@ -0,0 +1,34 @@
+# src/app/utils/fechas.py
+"""
+Helpers de rangos de fechas para consultas SQL.
+
+Las columnas `fecha` guardan timestamps 'YYYY-MM-DD HH:MM:SS'. Filtrar con
+`DATE(fecha) = ?` obliga a evaluar la función en cada fila y no puede usar
+índices; en su lugar se compara con un rango semiabierto
+`fecha >= inicio AND fecha < fin_exclusivo`, que sí usa idx_*_fecha.
+"""
+from datetime import date, timedelta
+from typing import Tuple, Union
+
+FechaLike = Union[str, date]
+
+
+def _a_fecha(valor: FechaLike) -> date:
+    if isinstance(valor, date):
+        return valor
+    return date.fromisoformat(str(valor)[:10])
+
+
+def rango_fechas(fecha_inicio: FechaLike, fecha_fin: FechaLike) -> Tuple[str, str]:
+    """
+    Convierte un rango inclusivo de días [inicio, fin] en los límites
+    semiabiertos (inicio, día siguiente a fin) como strings ISO.
+    """
+    inicio = _a_fecha(fecha_inicio)
+    fin_exclusivo = _a_fecha(fecha_fin) + timedelta(days=1)
+    return inicio.isoformat(), fin_exclusivo.isoformat()
+
+
+def rango_dia(fecha: FechaLike) -> Tuple[str, str]:
+    """Límites semiabiertos de un solo día."""
+    return rango_fechas(fecha, fecha)
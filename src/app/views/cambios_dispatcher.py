@@ -0,0 +1,104 @@
+# src/app/views/cambios_dispatcher.py
+"""
+Despachador de cambios de la BD hacia las vistas.
+
+Un único QTimer en el hilo de la interfaz consulta el ObservadorCambios
+(PRAGMA data_version, sin leer tablas si no hubo commits) y llama solo a
+los suscriptores cuyas tablas cambiaron.
+
+Uso en una vista:
+    obtener_dispatcher().suscribir({"ordenes", "mesas"}, self._on_cambios, propietario=self)
+
+    def _on_cambios(self, tablas):  # tablas: set con las tablas modificadas
+        ...
+
+Con `propietario` la suscripción se elimina cuando Qt destruye la vista.
+Al cerrar la aplicación, detener_dispatcher() para el timer y cierra la
+conexión del observador.
+"""
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, QTimer
+
+from ..db.cambios import ObservadorCambios
+
+# Intervalo de comprobación (ms): los cambios llegan a las vistas en <1 s
+INTERVALO_MS = 500
+
+
+class CambiosDispatcher(QObject):
+    """Notifica a cada suscriptor las tablas observadas que cambiaron."""
+
+    def __init__(self, observador: Optional[ObservadorCambios] = None, parent=None):
+        super().__init__(parent)
+        self.observador = observador or ObservadorCambios()
+        self._suscriptores: List[Tuple[Set[str], Callable[[Set[str]], None]]] = []
+        self._timer = QTimer(self)
+        self._timer.setInterval(INTERVALO_MS)
+        self._timer.timeout.connect(self.comprobar)
+
+    def suscribir(
+        self,
+        tablas: Iterable[str],
+        callback: Callable[[Set[str]], None],
+        propietario: Optional[QObject] = None,
+    ) -> None:
+        self._suscriptores.append((set(tablas), callback))
+        if propietario is not None:
+            # La lambda no depende del propietario, que ya se está destruyendo
+            propietario.destroyed.connect(lambda *_: self.desuscribir(callback))
+        if not self._timer.isActive():
+            # Fijar la línea base antes de empezar a notificar
+            self.observador.comprobar()
+            self._timer.start()
+
+    def desuscribir(self, callback: Callable[[Set[str]], None]) -> None:
+        restantes = [(t, cb) for t, cb in self._suscriptores if cb != callback]
+        if len(restantes) == len(self._suscriptores):
+            return  # ya no estaba suscrito (p. ej. tras detener())
+        self._suscriptores = restantes
+        if not restantes:
+            try:
+                self._timer.stop()
+            except RuntimeError:
+                pass  # el timer ya fue destruido (cierre de la aplicación)
+
+    def comprobar(self) -> None:
+        cambiadas = self.observador.comprobar()
+        if not cambiadas:
+            return
+        for tablas, callback in list(self._suscriptores):
+            afectadas = tablas & cambiadas
+            if afectadas:
+                try:
+                    callback(afectadas)
+                except RuntimeError:
+                    # Suscripción sin propietario cuyo widget ya fue destruido por Qt
+                    self.desuscribir(callback)
+                except Exception as e:
+                    print(f"Error notificando cambios ({', '.join(sorted(afectadas))}): {e}")
+
+    def detener(self) -> None:
+        # Las vistas que se destruyan después ya no encuentran su suscripción
+        self._suscriptores = []
+        self._timer.stop()
+        self.observador.cerrar()
+
+
+_dispatcher: Optional[CambiosDispatcher] = None
+
+
+def obtener_dispatcher() -> CambiosDispatcher:
+    """Devuelve el despachador compartido (se crea en el primer uso)."""
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = CambiosDispatcher()
+    return _dispatcher
+
+
+def detener_dispatcher() -> None:
+    """Detiene el despachador compartido, si se creó (al salir de la aplicación)."""
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.detener()
+        _dispatcher = None
@@ -7,39 +7,139 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QScrollArea, QFrame, QGridLayout, QMessageBox, QSizePolicy
 )
+import time
+
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont
 
 from ...services import cocina_service
+from ..cambios_dispatcher import obtener_dispatcher
+
+# Tablas cuyos cambios refrescan la vista de cocina
+TABLAS_COCINA = {"ordenes", "orden_detalles", "mesas"}
+
+
+# Estilo del botón de "listo" (verde)
+ESTILO_BOTON_LISTO = """
+    QPushButton {
+        background-color: #27ae60;
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-weight: bold;
+    }
+    QPushButton:hover {
+        background-color: #2ecc71;
+    }
+"""
+
+ICONOS_ESTADO = {'pendiente': "⏳", 'preparando': "🔥", 'listo': "✅"}
+
+
+class ItemCocinaRow(QWidget):
+    """Fila de un item (clave: detalle_id); se actualiza en sitio"""
+    
+    def __init__(self, item: dict, card):
+        super().__init__()
+        self.card = card
+        self.detalle_id = item['detalle_id']
+        self.item = None
+        
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.item_text = QLabel()
+        self.item_text.setFont(QFont("Segoe UI", 11))
+        layout.addWidget(self.item_text)
+        
+        layout.addStretch()
+        
+        # Un solo botón cuyo texto/estilo depende del estado
+        self.btn = QPushButton()
+        self.btn.clicked.connect(self._on_click)
+        layout.addWidget(self.btn)
+        
+        self.actualizar(item)
+    
+    def actualizar(self, item: dict):
+        if item == self.item:
+            return
+        anterior = self.item
+        self.item = item
+        
+        estado = item['estado_cocina']
+        icono = ICONOS_ESTADO.get(estado, "✅")
+        self.item_text.setText(f"{icono} {item['cantidad']}x {item['nombre']}")
+        
+        if anterior is not None and anterior['estado_cocina'] == estado:
+            return
+        # Botón según estado
+        if estado == 'pendiente':
+            self.btn.setText("Preparar")
+            self.btn.setStyleSheet("")
+            self.btn.show()
+        elif estado == 'preparando':
+            self.btn.setText("¡Listo!")
+            self.btn.setStyleSheet(ESTILO_BOTON_LISTO)
+            self.btn.show()
+        else:
+            self.btn.hide()
+    
+    def _on_click(self):
+        if self.item['estado_cocina'] == 'pendiente':
+            self.card.marcar_preparando(self.detalle_id)
+        elif self.item['estado_cocina'] == 'preparando':
+            self.card.marcar_listo(self.detalle_id)
 
 
 class OrdenCard(QFrame):
-    """Widget que representa una orden en la vista de cocina"""
+    """
+    Widget que representa una orden en la vista de cocina.
+    Se crea una vez por orden y se actualiza con actualizar(): solo cambian
+    los textos, botones y filas de item que realmente cambiaron.
+    """
     
     def __init__(self, orden_data: dict, parent_view):
         super().__init__()
-        self.orden_data = orden_data
+        self.orden_data = None
         self.parent_view = parent_view
+        # Momento de la lectura: el tiempo transcurrido se actualiza
+        # localmente, sin volver a consultar la BD
+        self._leido_en = time.monotonic()
+        self._bg_color = None
+        # Filas de items por detalle_id, en orden de aparición
+        self._filas = {}
         self.setup_ui()
+        self.actualizar(orden_data)
     
-    def setup_ui(self):
-        self.setObjectName("ordenCard")
-        self.setFrameShape(QFrame.StyledPanel)
-        
-        # Determinar color según tiempo y estado
-        minutos = self.orden_data['minutos_transcurridos']
-        tiene_pendientes = any(i['estado_cocina'] == 'pendiente' for i in self.orden_data['items'])
+    def _color_fondo(self, minutos):
+        """Determinar color según tiempo y estado"""
         tiene_preparando = any(i['estado_cocina'] == 'preparando' for i in self.orden_data['items'])
-        
         if minutos > 20:
-            bg_color = "#c0392b"  # Rojo - urgente
+            return "#c0392b"  # Rojo - urgente
         elif minutos > 10:
-            bg_color = "#e67e22"  # Naranja - atención
+            return "#e67e22"  # Naranja - atención
         elif tiene_preparando:
-            bg_color = "#2980b9"  # Azul - en preparación
-        else:
-            bg_color = "#27ae60"  # Verde - reciente
-        
+            return "#2980b9"  # Azul - en preparación
+        return "#27ae60"  # Verde - reciente
+    
+    def minutos_actuales(self):
+        transcurrido = int((time.monotonic() - self._leido_en) // 60)
+        return self.orden_data['minutos_transcurridos'] + transcurrido
+    
+    def actualizar_tiempo(self):
+        """Actualiza el tiempo y el color de la tarjeta sin consultar la BD"""
+        minutos = self.minutos_actuales()
+        texto = f"⏱️ {minutos} min"
+        if self.tiempo_label.text() != texto:
+            self.tiempo_label.setText(texto)
+        self._aplicar_estilo(self._color_fondo(minutos))
+    
+    def _aplicar_estilo(self, bg_color):
+        if bg_color == self._bg_color:
+            return
+        self._bg_color = bg_color
         self.setStyleSheet(f"""
             #ordenCard {{
                 background-color: {bg_color};
@@ -62,6 +162,10 @@ class OrdenCard(QFrame):
                 background-color: rgba(255,255,255,0.3);
             }}
         """)
+    
+    def setup_ui(self):
+        self.setObjectName("ordenCard")
+        self.setFrameShape(QFrame.StyledPanel)
         
         layout = QVBoxLayout(self)
         layout.setSpacing(8)
@@ -69,22 +173,22 @@ class OrdenCard(QFrame):
         # Header: Mesa + Tiempo
         header = QHBoxLayout()
         
-        mesa_label = QLabel(self.orden_data['mesa_nombre'])
-        mesa_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
-        header.addWidget(mesa_label)
+        self.mesa_label = QLabel()
+        self.mesa_label.setFont(QFont("Segoe UI", 16, QFont.Bold))
+        header.addWidget(self.mesa_label)
         
         header.addStretch()
         
-        tiempo_label = QLabel(f"⏱️ {minutos} min")
-        tiempo_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
-        header.addWidget(tiempo_label)
+        self.tiempo_label = QLabel()
+        self.tiempo_label.setFont(QFont("Segoe UI", 12, QFont.Bold))
+        header.addWidget(self.tiempo_label)
         
         layout.addLayout(header)
         
         # Cliente
-        cliente_label = QLabel(f"👤 {self.orden_data['cliente_nombre']}")
-        cliente_label.setFont(QFont("Segoe UI", 11))
-        layout.addWidget(cliente_label)
+        self.cliente_label = QLabel()
+        self.cliente_label.setFont(QFont("Segoe UI", 11))
+        layout.addWidget(self.cliente_label)
         
         # Separador
         sep = QFrame()
@@ -93,79 +197,64 @@ class OrdenCard(QFrame):
         sep.setMaximumHeight(1)
         layout.addWidget(sep)
         
-        # Items
-        for item in self.orden_data['items']:
-            item_layout = QHBoxLayout()
-            
-            # Estado icono
-            estado = item['estado_cocina']
-            if estado == 'pendiente':
-                icono = "⏳"
-            elif estado == 'preparando':
-                icono = "🔥"
-            else:
-                icono = "✅"
-            
-            item_text = QLabel(f"{icono} {item['cantidad']}x {item['nombre']}")
-            item_text.setFont(QFont("Segoe UI", 11))
-            item_layout.addWidget(item_text)
-            
-            item_layout.addStretch()
-            
-            # Botón según estado
-            if estado == 'pendiente':
-                btn = QPushButton("Preparar")
-                btn.clicked.connect(lambda checked, d=item['detalle_id']: self.marcar_preparando(d))
-                item_layout.addWidget(btn)
-            elif estado == 'preparando':
-                btn = QPushButton("¡Listo!")
-                btn.setStyleSheet("""
-                    QPushButton {
-                        background-color: #27ae60;
-                        color: white;
-                        border: none;
-                        border-radius: 6px;
-                        padding: 8px 12px;
-                        font-weight: bold;
-                    }
-                    QPushButton:hover {
-                        background-color: #2ecc71;
-                    }
-                """)
-                btn.clicked.connect(lambda checked, d=item['detalle_id']: self.marcar_listo(d))
-                item_layout.addWidget(btn)
-            
-            layout.addLayout(item_layout)
-        
-        # Botones de acción masiva
+        # Items (las filas se agregan en actualizar)
+        self.items_layout = QVBoxLayout()
+        self.items_layout.setSpacing(8)
+        layout.addLayout(self.items_layout)
+        
+        # Botones de acción masiva (visibles según el estado de los items)
         layout.addSpacing(10)
         btn_layout = QHBoxLayout()
         
-        if tiene_pendientes:
-            btn_todos_prep = QPushButton("🔥 Preparar Todos")
-            btn_todos_prep.clicked.connect(self.preparar_todos)
-            btn_layout.addWidget(btn_todos_prep)
-        
-        if tiene_preparando:
-            btn_todos_listo = QPushButton("✅ Todo Listo")
-            btn_todos_listo.setStyleSheet("""
-                QPushButton {
-                    background-color: #27ae60;
-                    color: white;
-                    border: none;
-                    border-radius: 6px;
-                    padding: 8px 12px;
-                    font-weight: bold;
-                }
-                QPushButton:hover {
-                    background-color: #2ecc71;
-                }
-            """)
-            btn_todos_listo.clicked.connect(self.todo_listo)
-            btn_layout.addWidget(btn_todos_listo)
+        self.btn_todos_prep = QPushButton("🔥 Preparar Todos")
+        self.btn_todos_prep.clicked.connect(self.preparar_todos)
+        btn_layout.addWidget(self.btn_todos_prep)
+        
+        self.btn_todos_listo = QPushButton("✅ Todo Listo")
+        self.btn_todos_listo.setStyleSheet(ESTILO_BOTON_LISTO)
+        self.btn_todos_listo.clicked.connect(self.todo_listo)
+        btn_layout.addWidget(self.btn_todos_listo)
         
         layout.addLayout(btn_layout)
     
+    def actualizar(self, orden_data: dict):
+        """Reconcilia la tarjeta con los datos nuevos de la orden"""
+        anterior = self.orden_data
+        self.orden_data = orden_data
+        self._leido_en = time.monotonic()
+        
+        if anterior is None or anterior['mesa_nombre'] != orden_data['mesa_nombre']:
+            self.mesa_label.setText(orden_data['mesa_nombre'])
+        if anterior is None or anterior['cliente_nombre'] != orden_data['cliente_nombre']:
+            self.cliente_label.setText(f"👤 {orden_data['cliente_nombre']}")
+        
+        if anterior is None or anterior['items'] != orden_data['items']:
+            self._reconciliar_items(orden_data['items'])
+            estados = {i['estado_cocina'] for i in orden_data['items']}
+            self.btn_todos_prep.setVisible('pendiente' in estados)
+            self.btn_todos_listo.setVisible('preparando' in estados)
+        
+        self.actualizar_tiempo()
+    
+    def _reconciliar_items(self, items):
+        nuevos = {item['detalle_id'] for item in items}
+        for detalle_id in [d for d in self._filas if d not in nuevos]:
+            fila = self._filas.pop(detalle_id)
+            self.items_layout.removeWidget(fila)
+            fila.deleteLater()
+        
+        for posicion, item in enumerate(items):
+            fila = self._filas.get(item['detalle_id'])
+            if fila is None:
+                fila = ItemCocinaRow(item, self)
+                self._filas[item['detalle_id']] = fila
+                self.items_layout.insertWidget(posicion, fila)
+            else:
+                fila.actualizar(item)
+                if self.items_layout.indexOf(fila) != posicion:
+                    self.items_layout.removeWidget(fila)
+                    self.items_layout.insertWidget(posicion, fila)
+    
     def marcar_preparando(self, detalle_id):
         ok, err = cocina_service.marcar_preparando(detalle_id)
         if ok:
@@ -198,15 +287,23 @@ class OrdenCard(QFrame):
 class CocinaView(QWidget):
     """Vista principal de cocina"""
     
+    MAX_COLS = 3
+    
     def __init__(self, parent=None):
         super().__init__(parent)
+        # Tarjetas por orden_id y orden actual en el grid
+        self._cards = {}
+        self._orden_grid = []
         self.setup_ui()
         self.refrescar()
         
-        # Auto-refresh cada 10 segundos
+        # Refresco por cambios en la BD (órdenes/items) en lugar de sondeo
+        obtener_dispatcher().suscribir(TABLAS_COCINA, self._on_cambios, propietario=self)
+        
+        # Cada minuto solo se actualiza el tiempo de las tarjetas (sin consultas)
         self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refrescar)
-        self.timer.start(10000)
+        self.timer.timeout.connect(self.actualizar_tiempos)
+        self.timer.setInterval(60000)
     
     def setup_ui(self):
         layout = QVBoxLayout(self)
@@ -293,51 +390,79 @@ class CocinaView(QWidget):
     
     def refrescar(self):
         """Recarga las órdenes desde la base de datos"""
-        # Limpiar grid
-        while self.grid.count():
-            item = self.grid.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        # Obtener órdenes
         ordenes = cocina_service.obtener_ordenes_para_cocina()
         conteos = cocina_service.obtener_conteo_estados()
-        
+        self.renderizar(ordenes, conteos)
+    
+    def renderizar(self, ordenes, conteos):
+        """
+        Reconcilia el tablero con los datos: las tarjetas se identifican por
+        orden_id y solo se crean, actualizan o eliminan las que cambiaron.
+        """
         # Actualizar contadores
         self.label_pendientes.setText(f"⏳ Pendientes: {conteos['pendiente']}")
         self.label_preparando.setText(f"🔥 Preparando: {conteos['preparando']}")
         
-        if not ordenes:
-            self.scroll.hide()
-            self.label_sin_ordenes.show()
-            return
+        # Quitar órdenes terminadas
+        ids = [orden['orden_id'] for orden in ordenes]
+        vigentes = set(ids)
+        for orden_id in [o for o in self._cards if o not in vigentes]:
+            self._quitar_card(orden_id)
         
-        self.scroll.show()
-        self.label_sin_ordenes.hide()
+        # Crear o actualizar el resto
+        for orden in ordenes:
+            card = self._cards.get(orden['orden_id'])
+            if card is None:
+                card = OrdenCard(orden, self)
+                card.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
+                self._cards[orden['orden_id']] = card
+            else:
+                card.actualizar(orden)
         
-        # Agregar cards al grid (3 columnas)
-        col = 0
-        row = 0
-        max_cols = 3
+        if ids != self._orden_grid:
+            self._reubicar(ids)
         
-        for orden in ordenes:
-            card = OrdenCard(orden, self)
-            card.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-            self.grid.addWidget(card, row, col)
-            
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
+        if not ordenes:
+            self.scroll.hide()
+            self.label_sin_ordenes.show()
+        else:
+            self.scroll.show()
+            self.label_sin_ordenes.hide()
+    
+    def _quitar_card(self, orden_id):
+        card = self._cards.pop(orden_id)
+        self.grid.removeWidget(card)
+        card.deleteLater()
+    
+    def _reubicar(self, ids):
+        """Recoloca las tarjetas en el grid (3 columnas) sin recrearlas"""
+        self.grid.setRowStretch(len(self._orden_grid) // self.MAX_COLS + 1, 0)
+        for orden_id in ids:
+            self.grid.removeWidget(self._cards[orden_id])
+        for posicion, orden_id in enumerate(ids):
+            row, col = divmod(posicion, self.MAX_COLS)
+            self.grid.addWidget(self._cards[orden_id], row, col)
         
         # Agregar espaciador al final
-        self.grid.setRowStretch(row + 1, 1)
+        self.grid.setRowStretch(len(ids) // self.MAX_COLS + 1, 1)
+        self._orden_grid = ids
+    
+    def _on_cambios(self, tablas):
+        """Cambios en la BD: refrescar solo si la vista está visible"""
+        if self.isVisible():
+            self.refrescar()
+    
+    def actualizar_tiempos(self):
+        for card in self._cards.values():
+            card.actualizar_tiempo()
     
     def showEvent(self, event):
         """Se llama cuando la vista se muestra"""
         super().showEvent(event)
         self.refrescar()
+        self.timer.start()
     
     def hideEvent(self, event):
         """Se llama cuando la vista se oculta"""
         super().hideEvent(event)
+        self.timer.stop()
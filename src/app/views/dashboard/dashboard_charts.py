@@ -0,0 +1,246 @@
+# src/app/views/dashboard/dashboard_charts.py
+"""
+Renderizado off-screen de los gráficos del dashboard.
+
+Los gráficos se dibujan con el backend Agg (sin widgets de Qt) y se
+devuelven como QImage, de modo que pueden generarse en un hilo de trabajo
+y entregarse ya terminados al hilo de la interfaz.
+"""
+import threading
+from abc import ABC, abstractmethod
+from typing import Tuple
+
+from PySide6.QtGui import QImage
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Wedge
+
+BG_COLOR = "#2b2b2b"
+TABLE_COLORS = ["#4CAF50", "#F44336", "#FFC107"]
+
+# Tamaño por defecto en pulgadas (el mismo que usaban los FigureCanvas)
+SALES_FIGSIZE = (6, 3)
+TABLE_FIGSIZE = (3, 3)
+DEFAULT_DPI = 100
+
+
+def figure_to_qimage(figure: Figure) -> QImage:
+    """Dibuja la figura con Agg y la copia a un QImage independiente."""
+    canvas = figure.canvas
+    if not isinstance(canvas, FigureCanvasAgg):
+        canvas = FigureCanvasAgg(figure)
+    canvas.draw()
+    width, height = canvas.get_width_height(physical=True)
+    buffer = canvas.buffer_rgba()
+    # copy(): el QImage no debe depender del buffer de matplotlib
+    return QImage(buffer, width, height, QImage.Format_RGBA8888).copy()
+
+
+def _new_figure(size_px: Tuple[int, int], default_figsize, dpi: float) -> Figure:
+    width, height = size_px
+    if width > 50 and height > 50:
+        figsize = (width / dpi, height / dpi)
+    else:
+        figsize = default_figsize
+    figure = Figure(figsize=figsize, dpi=dpi, facecolor=BG_COLOR)
+    FigureCanvasAgg(figure)
+    return figure
+
+
+def _style_sales_axes(ax) -> None:
+    ax.set_facecolor(BG_COLOR)
+    ax.tick_params(colors="#ffffff", labelsize=7)
+    ax.spines["bottom"].set_color("#404040")
+    ax.spines["left"].set_color("#404040")
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.grid(True, alpha=0.2, color="#ffffff")
+    ax.set_ylabel("Ventas ($)", color="#ffffff", fontsize=8)
+
+
+# ==========================================
+# GRÁFICOS PERSISTENTES (actualización incremental)
+# ==========================================
+
+
+class _PersistentChart(ABC):
+    """
+    Figura que se crea una sola vez y conserva sus artistas entre refrescos.
+
+    update() solo modifica los artistas cuando los datos cambian y solo
+    re-dibuja en ese caso; con los mismos datos y tamaño devuelve la última
+    imagen sin tocar matplotlib. Un lock protege la figura porque puede
+    usarse desde el worker y desde el hilo de la interfaz.
+    """
+
+    default_figsize: Tuple[float, float] = (1, 1)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.figure = None
+        self.ax = None
+        self._size_px = None
+        self._dpi = None
+        self._data = None
+        self._image = None
+        # Contadores para diagnóstico/benchmarks
+        self.draw_count = 0
+        self.skip_count = 0
+
+    def update(self, data, size_px: Tuple[int, int] = (0, 0), dpi: float = DEFAULT_DPI) -> QImage:
+        with self._lock:
+            size_px = tuple(size_px)
+            if (
+                self._image is not None
+                and data == self._data
+                and size_px == self._size_px
+                and dpi == self._dpi
+            ):
+                self.skip_count += 1
+                return self._image
+
+            relayout = False
+            if self.figure is None:
+                self.figure = _new_figure(size_px, self.default_figsize, dpi)
+                self.ax = self.figure.add_subplot(111)
+                self._setup_axes()
+                relayout = True
+            elif size_px != self._size_px or dpi != self._dpi:
+                self._resize(size_px, dpi)
+                relayout = True
+
+            relayout = self._apply_data(data) or relayout
+            if relayout:
+                self.figure.tight_layout()
+
+            self._size_px, self._dpi, self._data = size_px, dpi, data
+            self._image = figure_to_qimage(self.figure)
+            self.draw_count += 1
+            return self._image
+
+    def _resize(self, size_px, dpi) -> None:
+        width, height = size_px
+        self.figure.set_dpi(dpi)
+        if width > 50 and height > 50:
+            self.figure.set_size_inches(width / dpi, height / dpi)
+        else:
+            self.figure.set_size_inches(*self.default_figsize)
+
+    @abstractmethod
+    def _setup_axes(self) -> None:
+        """Configura self.ax y crea los artistas (una sola vez)."""
+
+    @abstractmethod
+    def _apply_data(self, data) -> bool:
+        """Actualiza los artistas; devuelve True si hace falta re-maquetar."""
+
+
+class SalesChart(_PersistentChart):
+    """Barras de ventas mensuales; update(((mes, total), ...))."""
+
+    default_figsize = SALES_FIGSIZE
+
+    def __init__(self):
+        super().__init__()
+        self._bars = []
+        self._months = None
+
+    def _setup_axes(self) -> None:
+        _style_sales_axes(self.ax)
+
+    def _apply_data(self, data) -> bool:
+        months = [mes for mes, _ in data]
+        sales = [float(total or 0) for _, total in data]
+
+        relayout = False
+        if len(sales) != len(self._bars):
+            # Cambia el número de barras: recrearlas (la figura y el estilo se conservan)
+            for bar in self._bars:
+                bar.remove()
+            self._bars = list(
+                self.ax.bar(
+                    range(len(sales)),
+                    sales,
+                    color="#42A5F5",
+                    edgecolor="#1976D2",
+                    linewidth=1.5,
+                    alpha=0.8,
+                )
+            )
+            self.ax.set_xticks(range(len(sales)))
+            relayout = True
+        else:
+            for bar, value in zip(self._bars, sales):
+                bar.set_height(value)
+
+        if months != self._months:
+            self.ax.set_xticklabels(months)
+            self._months = months
+            relayout = True
+
+        top = max(sales, default=0)
+        self.ax.set_ylim(0, top * 1.05 if top > 0 else 1)
+        if len(sales):
+            self.ax.set_xlim(-0.6, len(sales) - 0.4)
+        return relayout
+
+
+class TableStatusChart(_PersistentChart):
+    """Dona con el estado de las mesas; update((libres, ocupadas, reservadas))."""
+
+    default_figsize = TABLE_FIGSIZE
+    START_ANGLE = 90
+
+    def __init__(self):
+        super().__init__()
+        self._wedges = []
+        self._total_text = None
+
+    def _setup_axes(self) -> None:
+        self.ax.set_aspect("equal")
+        self.ax.set_xlim(-1.1, 1.1)
+        self.ax.set_ylim(-1.1, 1.1)
+        self.ax.axis("off")
+        # Mismo aspecto que ax.pie(..., wedgeprops=dict(width=0.4, ...))
+        for color in TABLE_COLORS:
+            wedge = Wedge(
+                (0, 0),
+                1,
+                self.START_ANGLE,
+                self.START_ANGLE,
+                width=0.4,
+                facecolor=color,
+                edgecolor=BG_COLOR,
+                linewidth=2,
+            )
+            self.ax.add_patch(wedge)
+            self._wedges.append(wedge)
+
+        # Texto en el centro
+        self._total_text = self.ax.text(
+            0,
+            0,
+            "0",
+            ha="center",
+            va="center",
+            fontsize=18,
+            fontweight="bold",
+            color="#ffffff",
+        )
+        self.ax.text(0, -0.3, "Total", ha="center", va="center", fontsize=10, color="#cccccc")
+
+    def _apply_data(self, data) -> bool:
+        sizes = [max(0, int(value or 0)) for value in data]
+        total = sum(sizes)
+
+        # Ángulos acumulados en sentido antihorario desde START_ANGLE (como ax.pie)
+        theta = self.START_ANGLE
+        for wedge, value in zip(self._wedges, sizes):
+            span = 360.0 * value / total if total else 0.0
+            wedge.set_theta1(theta)
+            wedge.set_theta2(theta + span)
+            wedge.set_visible(span > 0)
+            theta += span
+
+        self._total_text.set_text(str(total))
+        return False
@@ -8,8 +8,10 @@ from PySide6.QtWidgets import (
     QTableWidgetItem,
     QHeaderView,
     QPushButton,
+    QSizePolicy,
 )
-from PySide6.QtCore import Qt, QTimer, QDateTime
+from PySide6.QtCore import Qt, QTimer, QDateTime, QThreadPool
+from PySide6.QtGui import QPixmap
 
 # Configurar matplotlib para ejecutables de PyInstaller
 import sys
@@ -22,10 +24,30 @@ if getattr(sys, "frozen", False):
 
     matplotlib.use("Qt5Agg")
 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
 from ...services import dashboard_service
+from . import dashboard_charts
+from .dashboard_worker import DashboardRefreshTask
+from ..cambios_dispatcher import obtener_dispatcher
+
+# Tablas cuyos cambios refrescan el dashboard
+TABLAS_DASHBOARD = {"ordenes", "facturas", "mesas", "tasas_cambio"}
+
+# Meses de ejemplo para el gráfico placeholder
+PLACEHOLDER_MONTHS = [
+    "Ene",
+    "Feb",
+    "Mar",
+    "Abr",
+    "May",
+    "Jun",
+    "Jul",
+    "Ago",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dic",
+]
+PLACEHOLDER_SALES = [1200, 1500, 1800, 1600, 2000, 2200, 2100, 2500, 2700, 3000, 3200, 3500]
 
 
 class DashboardView(QWidget):
@@ -39,13 +61,31 @@ class DashboardView(QWidget):
         self.timer.timeout.connect(self.update_datetime)
         self.timer.start(1000)
 
-        # Timer para actualizar datos cada 30 segundos
-        self.data_timer = QTimer(self)
-        self.data_timer.timeout.connect(self.load_real_data)
-        self.data_timer.start(30000)  # 30 segundos
-
-        # Cargar datos reales
-        self.load_real_data()
+        # Refresco en segundo plano: un solo hilo para que las peticiones
+        # se serialicen; cada petición tiene un número de generación y los
+        # resultados de generaciones anteriores se descartan.
+        self._refresh_pool = QThreadPool(self)
+        self._refresh_pool.setMaxThreadCount(1)
+        self._refresh_generation = 0
+        self._refresh_task = None
+        self._last_snapshot = None
+        # (sales_size, table_size, dpi) del último render mostrado
+        self._last_render_sizes = None
+
+        # Los gráficos son pixmaps de tamaño fijo: al redimensionar se
+        # vuelven a renderizar, agrupando los eventos de un mismo arrastre
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(200)
+        self._resize_timer.timeout.connect(self.request_refresh)
+
+        # Gráficos persistentes: conservan sus artistas entre refrescos
+        self._sales_chart = dashboard_charts.SalesChart()
+        self._table_chart = dashboard_charts.TableStatusChart()
+
+        # Refresco por cambios en la BD en lugar de un timer fijo; mientras
+        # la vista está oculta se ignoran (showEvent siempre refresca)
+        obtener_dispatcher().suscribir(TABLAS_DASHBOARD, self._on_cambios, propietario=self)
 
     def setup_ui(self):
         """Configura la interfaz principal del dashboard"""
@@ -321,11 +361,12 @@ class DashboardView(QWidget):
         )
         layout.addWidget(title)
 
-        # Gráfico
-        self.sales_figure = Figure(figsize=(6, 3), facecolor="#2b2b2b")
-        self.sales_canvas = FigureCanvas(self.sales_figure)
-        self.sales_ax = self.sales_figure.add_subplot(111)
-        layout.addWidget(self.sales_canvas)
+        # Gráfico (renderizado off-screen y mostrado como imagen)
+        self.sales_chart_label = QLabel()
+        self.sales_chart_label.setAlignment(Qt.AlignCenter)
+        self.sales_chart_label.setMinimumSize(300, 150)
+        self.sales_chart_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        layout.addWidget(self.sales_chart_label, stretch=1)
 
         return card
 
@@ -358,11 +399,14 @@ class DashboardView(QWidget):
         )
         layout.addWidget(title)
 
-        # Gráfico de dona
-        self.table_figure = Figure(figsize=(3, 3), facecolor="#2b2b2b")
-        self.table_canvas = FigureCanvas(self.table_figure)
-        self.table_ax = self.table_figure.add_subplot(111)
-        layout.addWidget(self.table_canvas, alignment=Qt.AlignCenter)
+        # Gráfico de dona (renderizado off-screen y mostrado como imagen)
+        self.table_chart_label = QLabel()
+        self.table_chart_label.setAlignment(Qt.AlignCenter)
+        self.table_chart_label.setFixedSize(
+            dashboard_charts.TABLE_FIGSIZE[0] * dashboard_charts.DEFAULT_DPI,
+            dashboard_charts.TABLE_FIGSIZE[1] * dashboard_charts.DEFAULT_DPI,
+        )
+        layout.addWidget(self.table_chart_label, alignment=Qt.AlignCenter)
 
         # Labels de estado
         status_layout = QHBoxLayout()
@@ -574,80 +618,161 @@ class DashboardView(QWidget):
         time_str = now.toString("hh:mm:ss AP")
         self.datetime_label.setText(f"{date_str}\n{time_str}")
 
+    # ==========================================
+    # REFRESCO EN SEGUNDO PLANO
+    # ==========================================
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.request_refresh()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._resize_timer.stop()
+        self.cancel_refresh()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._resize_timer.start()
+
+    def _on_cambios(self, tablas):
+        self.request_refresh()
+
+    def cancel_refresh(self):
+        """Cancela el refresco en curso; su resultado se descartará"""
+        self._refresh_generation += 1
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+    def request_refresh(self):
+        """Lanza un refresco en el pool: consulta y gráficos fuera del hilo UI"""
+        if not self.isVisible():
+            return
+        self.cancel_refresh()
+
+        task = DashboardRefreshTask(
+            self._refresh_generation,
+            self._sales_chart,
+            self._table_chart,
+            *self._render_sizes(),
+            self._last_snapshot,
+            self._last_render_sizes,
+        )
+        task.signals.finished.connect(self._on_refresh_finished)
+        task.signals.failed.connect(self._on_refresh_failed)
+        self._refresh_task = task
+        self._refresh_pool.start(task)
+
+    def _on_refresh_finished(self, generation, result):
+        if generation != self._refresh_generation:
+            return  # resultado obsoleto
+        self._refresh_task = None
+        if not result.changed:
+            return  # mismo snapshot y tamaño: la vista ya muestra estos datos
+        self.apply_snapshot(result.snapshot, result.sales_image, result.table_image)
+        self._last_render_sizes = result.sizes
+
+    def _on_refresh_failed(self, generation, message):
+        if generation != self._refresh_generation:
+            return
+        self._refresh_task = None
+        print(f"Error cargando datos del dashboard: {message}")
+        self.load_placeholder_data()
+
+    def _render_sizes(self):
+        """(sales_size, table_size, dpi) para renderizar con el tamaño actual"""
+        return (
+            self._chart_size_px(self.sales_chart_label),
+            self._chart_size_px(self.table_chart_label),
+            dashboard_charts.DEFAULT_DPI * self.devicePixelRatioF(),
+        )
+
+    def _chart_size_px(self, label):
+        dpr = self.devicePixelRatioF()
+        return int(label.width() * dpr), int(label.height() * dpr)
+
+    def _set_chart_image(self, label, image):
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(self.devicePixelRatioF())
+        label.setPixmap(pixmap)
+
     def load_real_data(self):
-        """Carga datos reales desde el servicio"""
+        """
+        Carga datos reales de forma síncrona (una sola lectura coherente).
+        El refresco periódico usa request_refresh en segundo plano.
+        """
         try:
-            # Obtener tasa de cambio
-            tasa = dashboard_service.get_current_exchange_rate()
-
-            # Obtener órdenes del día
-            ordenes_hoy = dashboard_service.get_today_orders_count()
-
-            # Obtener ventas del día
-            ventas = dashboard_service.get_today_sales()
-
-            # Actualizar métricas
-            self.update_metrics(tasa, ordenes_hoy, ventas["usd"], ventas["ves"])
-
-            # Cargar gráfico de ventas mensuales
-            self.load_sales_chart_real()
-
-            # Cargar estado de mesas
-            self.load_table_status_real()
-
-            # Cargar últimas facturas
-            self.load_recent_invoices_real()
-            
-            # Verificar estado de la tasa (si ya se registró hoy)
-            # dashboard_service.get_current_exchange_rate() devuelve el valor, 
-            # pero necesitamos saber si es DE HOY.
-            
-            # Opcion 1: Usar tasa_cambio_service directamente
-            from ...services import tasa_cambio_service
-            from datetime import date
-            hoy = date.today().isoformat()
-            tasa_hoy = tasa_cambio_service.obtener_tasa(hoy)
-            
-            if tasa_hoy:
-                # Tasa registrada -> VERDE
-                if self.btn_tasa is not None:
-                    self.btn_tasa.setStyleSheet("""
-                        QPushButton {
-                            background-color: #27ae60;
-                            color: white;
-                            border: none;
-                            border-radius: 8px;
-                            padding: 15px 20px;
-                            font-size: 13px;
-                            font-weight: bold;
-                        }
-                        QPushButton:hover { background-color: #2ecc71; }
-                    """)
-                    self.btn_tasa.setText(f"💱 Tasa Actualizada ({tasa_hoy.tasa} Bs)")
-            else:
-                # Tasa NO registrada -> ROJO
-                if self.btn_tasa is not None:
-                    self.btn_tasa.setStyleSheet("""
-                        QPushButton {
-                            background-color: #c0392b;
-                            color: white;
-                            border: none;
-                            border-radius: 8px;
-                            padding: 15px 20px;
-                            font-size: 13px;
-                            font-weight: bold;
-                        }
-                        QPushButton:hover { background-color: #e74c3c; }
-                    """)
-                    self.btn_tasa.setText("⚠️ ACTUALIZAR TASA")
-
+            snapshot = dashboard_service.get_dashboard_snapshot()
+            self.apply_snapshot(snapshot)
+            self._last_render_sizes = self._render_sizes()
         except Exception as e:
             print(f"Error cargando datos del dashboard: {e}")
             # Fallback a datos de ejemplo si hay error
             self.load_placeholder_data()
 
+    def apply_snapshot(self, snapshot, sales_image=None, table_image=None):
+        """
+        Pinta un DashboardSnapshot en todas las secciones de la vista.
+        Si se reciben las imágenes ya renderizadas (worker) solo se asignan.
+        """
+        self._last_snapshot = snapshot
+        self.update_metrics(
+            snapshot.tasa,
+            snapshot.ordenes_hoy,
+            snapshot.ventas_hoy_usd,
+            snapshot.ventas_hoy_ves,
+        )
+        self.load_sales_chart_real(snapshot.ventas_mensuales, sales_image)
+        self.load_table_status(
+            snapshot.mesas_libres,
+            snapshot.mesas_ocupadas,
+            snapshot.mesas_reservadas,
+            table_image,
+        )
+        self.load_recent_invoices_real(snapshot.ultimas_facturas)
+        self.update_rate_button(snapshot.tasa_hoy)
+
+    def update_rate_button(self, tasa_hoy):
+        """Colorea el botón de tasa según si ya se registró la tasa de hoy"""
+        if self.btn_tasa is None:
+            return
+
+        if tasa_hoy:
+            # Tasa registrada -> VERDE
+            self.btn_tasa.setStyleSheet("""
+                QPushButton {
+                    background-color: #27ae60;
+                    color: white;
+                    border: none;
+                    border-radius: 8px;
+                    padding: 15px 20px;
+                    font-size: 13px;
+                    font-weight: bold;
+                }
+                QPushButton:hover { background-color: #2ecc71; }
+            """)
+            self.btn_tasa.setText(f"💱 Tasa Actualizada ({tasa_hoy} Bs)")
+        else:
+            # Tasa NO registrada -> ROJO
+            self.btn_tasa.setStyleSheet("""
+                QPushButton {
+                    background-color: #c0392b;
+                    color: white;
+                    border: none;
+                    border-radius: 8px;
+                    padding: 15px 20px;
+                    font-size: 13px;
+                    font-weight: bold;
+                }
+                QPushButton:hover { background-color: #e74c3c; }
+            """)
+            self.btn_tasa.setText("⚠️ ACTUALIZAR TASA")
+
     def load_placeholder_data(self):
         """Carga datos de ejemplo (fallback)"""
+        self._last_snapshot = None
+        self._last_render_sizes = None
         self.update_metrics(39.50, 15, 1250.00, 48750.00)
         self.load_sales_chart()
         self.load_table_status(12, 8, 0)
@@ -663,75 +788,17 @@ class DashboardView(QWidget):
 
     def load_sales_chart(self):
         """Carga el gráfico de ventas mensuales"""
-        months = [
-            "Ene",
-            "Feb",
-            "Mar",
-            "Abr",
-            "May",
-            "Jun",
-            "Jul",
-            "Ago",
-            "Sep",
-            "Oct",
-            "Nov",
-            "Dic",
-        ]
-        sales = [1200, 1500, 1800, 1600, 2000, 2200, 2100, 2500, 2700, 3000, 3200, 3500]
-
-        self.sales_ax.clear()
-        bars = self.sales_ax.bar(
-            months, sales, color="#42A5F5", edgecolor="#1976D2", linewidth=1.5
-        )
-
-        for bar in bars:
-            bar.set_alpha(0.8)
-
-        self.sales_ax.set_facecolor("#2b2b2b")
-        self.sales_ax.tick_params(colors="#ffffff", labelsize=7)
-        self.sales_ax.spines["bottom"].set_color("#404040")
-        self.sales_ax.spines["left"].set_color("#404040")
-        self.sales_ax.spines["top"].set_visible(False)
-        self.sales_ax.spines["right"].set_visible(False)
-        self.sales_ax.grid(True, alpha=0.2, color="#ffffff")
-        self.sales_ax.set_ylabel("Ventas ($)", color="#ffffff", fontsize=8)
+        self.load_sales_chart_real(list(zip(PLACEHOLDER_MONTHS, PLACEHOLDER_SALES)))
 
-        self.sales_figure.tight_layout()
-        self.sales_canvas.draw()
-
-    def load_table_status(self, libres, ocupadas, reservadas):
+    def load_table_status(self, libres, ocupadas, reservadas, image=None):
         """Carga el gráfico de estado de mesas"""
-        sizes = [libres, ocupadas, reservadas]
-        colors = ["#4CAF50", "#F44336", "#FFC107"]
-
-        self.table_ax.clear()
-
-        # Crear gráfico de dona
-        self.table_ax.pie(
-            sizes,
-            colors=colors,
-            startangle=90,
-            wedgeprops=dict(width=0.4, edgecolor="#2b2b2b", linewidth=2),
-        )
-
-        # Agregar texto en el centro
-        total = sum(sizes)
-        self.table_ax.text(
-            0,
-            0,
-            str(total),
-            ha="center",
-            va="center",
-            fontsize=18,
-            fontweight="bold",
-            color="#ffffff",
-        )
-        self.table_ax.text(
-            0, -0.3, "Total", ha="center", va="center", fontsize=10, color="#cccccc"
-        )
-
-        self.table_figure.tight_layout()
-        self.table_canvas.draw()
+        if image is None:
+            image = self._table_chart.update(
+                (libres, ocupadas, reservadas),
+                self._chart_size_px(self.table_chart_label),
+                dashboard_charts.DEFAULT_DPI * self.devicePixelRatioF(),
+            )
+        self._set_chart_image(self.table_chart_label, image)
 
         # Actualizar labels
         self.libres_label.value_label.setText(str(libres))
@@ -761,37 +828,23 @@ class DashboardView(QWidget):
     # MÉTODOS CON DATOS REALES
     # ==========================================
 
-    def load_sales_chart_real(self):
+    def load_sales_chart_real(self, monthly_data=None, image=None):
         """Carga el gráfico de ventas con datos reales"""
-        monthly_data = dashboard_service.get_monthly_sales()
-
-        if not monthly_data:
-            # Si no hay datos, usar placeholder
-            self.load_sales_chart()
-            return
-
-        months = [item[0] for item in monthly_data]
-        sales = [item[1] for item in monthly_data]
-
-        self.sales_ax.clear()
-        bars = self.sales_ax.bar(
-            months, sales, color="#42A5F5", edgecolor="#1976D2", linewidth=1.5
-        )
-
-        for bar in bars:
-            bar.set_alpha(0.8)
-
-        self.sales_ax.set_facecolor("#2b2b2b")
-        self.sales_ax.tick_params(colors="#ffffff", labelsize=7)
-        self.sales_ax.spines["bottom"].set_color("#404040")
-        self.sales_ax.spines["left"].set_color("#404040")
-        self.sales_ax.spines["top"].set_visible(False)
-        self.sales_ax.spines["right"].set_visible(False)
-        self.sales_ax.grid(True, alpha=0.2, color="#ffffff")
-        self.sales_ax.set_ylabel("Ventas ($)", color="#ffffff", fontsize=8)
-
-        self.sales_figure.tight_layout()
-        self.sales_canvas.draw()
+        if image is None:
+            if monthly_data is None:
+                monthly_data = dashboard_service.get_monthly_sales()
+
+            if not monthly_data:
+                # Si no hay datos, usar placeholder
+                self.load_sales_chart()
+                return
+
+            image = self._sales_chart.update(
+                tuple(tuple(item) for item in monthly_data),
+                self._chart_size_px(self.sales_chart_label),
+                dashboard_charts.DEFAULT_DPI * self.devicePixelRatioF(),
+            )
+        self._set_chart_image(self.sales_chart_label, image)
 
     def load_table_status_real(self):
         """Carga el estado de mesas con datos reales"""
@@ -803,9 +856,16 @@ class DashboardView(QWidget):
 
         self.load_table_status(libres, ocupadas, reservadas)
 
-    def load_recent_invoices_real(self):
-        """Carga las últimas facturas con datos reales"""
-        invoices = dashboard_service.get_recent_invoices()
+    def load_recent_invoices_real(self, invoices=None):
+        """
+        Carga las últimas facturas con datos reales.
+        invoices: tuplas (numero, cliente, monto, hora) del snapshot.
+        """
+        if invoices is None:
+            invoices = [
+                (inv["numero"], inv["cliente"], inv["monto"], inv["hora"])
+                for inv in dashboard_service.get_recent_invoices()
+            ]
 
         if not invoices:
             # Si no hay facturas, usar placeholder
@@ -813,13 +873,13 @@ class DashboardView(QWidget):
             return
 
         self.invoices_table.setRowCount(0)
-        for invoice in invoices:
+        for numero, cliente, monto, hora in invoices:
             row = self.invoices_table.rowCount()
             self.invoices_table.insertRow(row)
-            self.invoices_table.setItem(row, 0, QTableWidgetItem(invoice["numero"]))
-            self.invoices_table.setItem(row, 1, QTableWidgetItem(invoice["cliente"]))
-            self.invoices_table.setItem(row, 2, QTableWidgetItem(invoice["monto"]))
-            self.invoices_table.setItem(row, 3, QTableWidgetItem(invoice["hora"]))
+            self.invoices_table.setItem(row, 0, QTableWidgetItem(numero))
+            self.invoices_table.setItem(row, 1, QTableWidgetItem(cliente))
+            self.invoices_table.setItem(row, 2, QTableWidgetItem(monto))
+            self.invoices_table.setItem(row, 3, QTableWidgetItem(hora))
 
     # ==========================================
     # ACCIONES RÁPIDAS
@@ -835,7 +895,7 @@ class DashboardView(QWidget):
 
             # Recargar datos del dashboard después de cerrar el diálogo
             if result:
-                self.load_real_data()
+                self.request_refresh()
         except Exception as e:
             print(f"Error abriendo nueva orden: {e}")
 
@@ -845,7 +905,7 @@ class DashboardView(QWidget):
             from ..main.rate_update_dialog import RateUpdateDialog
             dialog = RateUpdateDialog(parent=self)
             if dialog.exec():
-                self.load_real_data() # Recargar para actualizar color del botón
+                self.request_refresh() # Recargar para actualizar color del botón
         except Exception as e:
             print(f"Error abriendo dialogo tasa: {e}")
 
@@ -0,0 +1,118 @@
+# src/app/views/dashboard/dashboard_worker.py
+"""
+Refresco del dashboard fuera del hilo de la interfaz.
+
+DashboardRefreshTask lee el snapshot de la BD y renderiza los gráficos
+off-screen en un hilo del QThreadPool; al terminar emite el resultado por
+señal y la vista solo tiene que asignar textos y pixmaps.
+
+Los gráficos son objetos persistentes de la vista (SalesChart,
+TableStatusChart): solo se re-dibujan si los datos cambiaron. Si el
+snapshot y los tamaños pedidos son iguales a los del último render no se
+renderiza nada y el resultado llega con changed=False.
+"""
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+from PySide6.QtGui import QImage
+
+from ...services import dashboard_service
+from . import dashboard_charts
+
+
+@dataclass
+class DashboardRefreshResult:
+    """Resultado de un refresco: snapshot y gráficos ya renderizados"""
+    snapshot: object
+    sales_image: Optional[QImage]
+    table_image: Optional[QImage]
+    changed: bool = True
+    # (sales_size, table_size, dpi) con que se renderizaron las imágenes
+    sizes: Optional[tuple] = None
+
+
+class DashboardRefreshSignals(QObject):
+    """Señales del worker (QRunnable no es QObject)"""
+    # (generación, DashboardRefreshResult)
+    finished = Signal(int, object)
+    # (generación, mensaje de error)
+    failed = Signal(int, str)
+
+
+class DashboardRefreshTask(QRunnable):
+    """
+    Tarea de refresco. `generation` identifica la petición: la vista
+    descarta resultados de generaciones anteriores. cancel() evita el
+    trabajo pendiente si la tarea aún no terminó.
+    """
+
+    def __init__(
+        self,
+        generation: int,
+        sales_chart: dashboard_charts.SalesChart,
+        table_chart: dashboard_charts.TableStatusChart,
+        sales_size: Tuple[int, int],
+        table_size: Tuple[int, int],
+        dpi: float,
+        previous_snapshot=None,
+        previous_sizes=None,
+    ):
+        super().__init__()
+        self.generation = generation
+        self.sales_chart = sales_chart
+        self.table_chart = table_chart
+        self.previous_snapshot = previous_snapshot
+        self.previous_sizes = previous_sizes
+        self.sales_size = sales_size
+        self.table_size = table_size
+        self.dpi = dpi
+        self.signals = DashboardRefreshSignals()
+        self._cancelled = False
+        self.setAutoDelete(True)
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            snapshot = dashboard_service.get_dashboard_snapshot()
+            if self._cancelled:
+                return
+
+            sizes = (self.sales_size, self.table_size, self.dpi)
+            if snapshot == self.previous_snapshot and sizes == self.previous_sizes:
+                # Nada cambió (ni datos ni tamaño): no se toca ningún gráfico
+                self.signals.finished.emit(
+                    self.generation,
+                    DashboardRefreshResult(snapshot, None, None, changed=False, sizes=sizes),
+                )
+                return
+
+            sales_image = None
+            if snapshot.ventas_mensuales:
+                sales_image = self.sales_chart.update(
+                    snapshot.ventas_mensuales, self.sales_size, self.dpi
+                )
+            if self._cancelled:
+                return
+
+            table_image = self.table_chart.update(
+                (
+                    snapshot.mesas_libres,
+                    snapshot.mesas_ocupadas,
+                    snapshot.mesas_reservadas,
+                ),
+                self.table_size,
+                self.dpi,
+            )
+            if self._cancelled:
+                return
+
+            self.signals.finished.emit(
+                self.generation,
+                DashboardRefreshResult(snapshot, sales_image, table_image, sizes=sizes),
+            )
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.failed.emit(self.generation, str(e))
@@ -2,10 +2,11 @@ from PySide6.QtWidgets import (
     QWidget, QLabel, QLineEdit, QPushButton,
     QVBoxLayout, QHBoxLayout, QMessageBox, QFrame
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThreadPool
 from PySide6.QtGui import QFont, QPixmap, QIcon
 from ..main.main_window import MainWindow
 from ...config import resource_path
+from .login_worker import LoginTask
 
 
 class LoginWindow(QWidget):
@@ -16,6 +17,12 @@ class LoginWindow(QWidget):
         icon_path = resource_path("icons", "pizza.png")
         self.setWindowIcon(QIcon(str(icon_path)))
         self.setFixedSize(800, 500)
+
+        # La verificación de la clave (bcrypt) corre en este pool
+        self._login_pool = QThreadPool(self)
+        self._login_pool.setMaxThreadCount(1)
+        self._login_en_curso = False
+
         self.setup_ui()
 
     def setup_ui(self):
@@ -93,10 +100,10 @@ class LoginWindow(QWidget):
         self.input_clave.setEchoMode(QLineEdit.Password)
         self.input_clave.setMinimumHeight(44)
 
-        btn_login = QPushButton("INGRESAR")
-        btn_login.setObjectName("btn_login")
-        btn_login.setMinimumHeight(48)
-        btn_login.clicked.connect(self.validar_login)
+        self.btn_login = QPushButton("INGRESAR")
+        self.btn_login.setObjectName("btn_login")
+        self.btn_login.setMinimumHeight(48)
+        self.btn_login.clicked.connect(self.validar_login)
 
         # Opcional: enlace de "olvidé mi contraseña"
         link_forgot = QLabel("<a style='color:#9fb7d6' href='#'>¿Olvidaste tu contraseña?</a>")
@@ -109,7 +116,7 @@ class LoginWindow(QWidget):
         layout_derecho.addWidget(titulo)
         layout_derecho.addWidget(self.input_usuario)
         layout_derecho.addWidget(self.input_clave)
-        layout_derecho.addWidget(btn_login)
+        layout_derecho.addWidget(self.btn_login)
         layout_derecho.addWidget(link_forgot)
         layout_derecho.addStretch(1)
 
@@ -123,8 +130,9 @@ class LoginWindow(QWidget):
         frame_derecho.update()
 
     def validar_login(self):
-        from ...services.usuarios_service import validar_credenciales
-        
+        if self._login_en_curso:
+            return
+
         usuario = self.input_usuario.text()
         clave = self.input_clave.text()
 
@@ -132,9 +140,22 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Error", "Todos los campos son obligatorios")
             return
 
-        # Usar el servicio de validación de credenciales
-        usuario_obj = validar_credenciales(usuario, clave)
-
+        # Validar en segundo plano; la ventana sigue respondiendo
+        self._set_verificando(True)
+        task = LoginTask(usuario, clave)
+        task.signals.finished.connect(self._on_login_finished)
+        task.signals.failed.connect(self._on_login_failed)
+        self._login_pool.start(task)
+
+    def _set_verificando(self, verificando: bool):
+        self._login_en_curso = verificando
+        self.input_usuario.setEnabled(not verificando)
+        self.input_clave.setEnabled(not verificando)
+        self.btn_login.setEnabled(not verificando)
+        self.btn_login.setText("VERIFICANDO..." if verificando else "INGRESAR")
+
+    def _on_login_finished(self, usuario_obj):
+        self._set_verificando(False)
         if usuario_obj:
             # Pasar objeto Usuario completo a MainWindow
             self.main_window = MainWindow(usuario_obj)
@@ -142,6 +163,11 @@ class LoginWindow(QWidget):
             self.close()
         else:
             QMessageBox.critical(self, "Error", "Credenciales incorrectas")
+            self.input_clave.setFocus()
+
+    def _on_login_failed(self, message):
+        self._set_verificando(False)
+        QMessageBox.critical(self, "Error", f"No se pudo validar el usuario: {message}")
 
     def abrir_recuperar_password(self):
         """Abre el diálogo de recuperación de contraseña"""
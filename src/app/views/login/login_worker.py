@@ -0,0 +1,38 @@
+# src/app/views/login/login_worker.py
+"""
+Verificación de credenciales fuera del hilo de la interfaz.
+
+bcrypt.checkpw tarda a propósito; ejecutado en el hilo principal congela
+la ventana de login. LoginTask llama a validar_credenciales en un hilo del
+QThreadPool y entrega el resultado por señal.
+"""
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from ...services.usuarios_service import validar_credenciales
+
+
+class LoginSignals(QObject):
+    """Señales del worker (QRunnable no es QObject)"""
+    # Usuario si las credenciales son correctas, None si no
+    finished = Signal(object)
+    # mensaje de error
+    failed = Signal(str)
+
+
+class LoginTask(QRunnable):
+    """Valida (usuario, clave) y emite el resultado."""
+
+    def __init__(self, usuario: str, clave: str):
+        super().__init__()
+        self.usuario = usuario
+        self.clave = clave
+        self.signals = LoginSignals()
+        self.setAutoDelete(True)
+
+    def run(self):
+        try:
+            usuario_obj = validar_credenciales(self.usuario, self.clave)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(usuario_obj)
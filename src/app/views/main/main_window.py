@@ -12,7 +12,13 @@ from ..usuarios.mi_perfil_view import MiPerfilView
 from ..dashboard.dashboard_view import DashboardView
 from ..menu.menu_view import MenuView
 from ..cocina.cocina_view import CocinaView  # Importar vista de cocina
+from ..cambios_dispatcher import obtener_dispatcher
 from ...config import resource_path
+from ...services.menu_service import invalidar_catalogo
+from ...services.tasa_cambio_service import invalidar_cache_tasas
+
+# Tablas que forman el catálogo del menú en memoria (menu_service)
+TABLAS_MENU = {"menu_sections", "menu_items", "menu_item_variant"}
 
 
 class MainWindow(QMainWindow):
@@ -36,6 +42,13 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         layout_main.addWidget(self.stacked_widget)
 
+        # Cachés en memoria de los servicios: se descartan cuando otra
+        # instancia modifica sus tablas. Se suscriben antes que las vistas
+        # para que estas ya lean los datos nuevos al refrescarse.
+        obtener_dispatcher().suscribir(
+            {"tasas_cambio"} | TABLAS_MENU, self._on_cambios_cache, propietario=self
+        )
+
         # Instanciar vistas - pasando usuario para control de permisos
         self.dashboard_view = DashboardView(usuario=self.usuario)
         self.mesas_view = MesasView(usuario=self.usuario)
@@ -77,6 +90,12 @@ class MainWindow(QMainWindow):
         else:
             self.mostrar_dashboard()
 
+    def _on_cambios_cache(self, tablas):
+        if "tasas_cambio" in tablas:
+            invalidar_cache_tasas()
+        if tablas & TABLAS_MENU:
+            invalidar_catalogo()
+
     def _configurar_sidebar(self):
         """Configura la visibilidad y conexiones del sidebar según el rol"""
         
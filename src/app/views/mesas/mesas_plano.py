@@ -0,0 +1,313 @@
+# src/app/views/mesas/mesas_plano.py
+"""
+Plano de mesas virtualizado para locales grandes (salones, food courts).
+
+En lugar de un MesaWidget por mesa, las mesas viven en un QAbstractListModel
+y un delegado pinta cada tarjeta: la vista (QListView en modo icono) solo
+pinta las mesas visibles en pantalla, así que memoria y tiempo de refresco
+no crecen con el número de mesas. Los filtros de sección, estado y nombre
+se aplican con un QSortFilterProxyModel.
+
+Las acciones de la tarjeta (Abrir/Continuar, Ver Orden, Reservar, Liberar)
+se pintan como botones y se resuelven en el delegado por posición del clic.
+"""
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import (
+    QAbstractListModel,
+    QEvent,
+    QModelIndex,
+    QRect,
+    QSize,
+    QSortFilterProxyModel,
+    Qt,
+    Signal,
+)
+from PySide6.QtGui import QColor, QFont, QPainter, QPen
+from PySide6.QtWidgets import QListView, QStyle, QStyledItemDelegate
+
+# Roles del modelo
+MesaIdRole = Qt.UserRole + 1
+EstadoRole = Qt.UserRole + 2
+SeccionIdRole = Qt.UserRole + 3
+SeccionNombreRole = Qt.UserRole + 4
+
+# Mismo tamaño y colores que MesaWidget / styles.py
+CARD_SIZE = QSize(220, 120)
+CARD_BG = QColor("#333333")
+CARD_BG_HOVER = QColor("#808080")
+CARD_BORDER = QColor("#f5f5f5")
+BADGE_COLORS = {
+    "libre": (QColor("#16a085"), QColor("white")),
+    "ocupado": (QColor("#c0392b"), QColor("white")),
+    "reservada": (QColor("#f39c12"), QColor("black")),
+}
+BADGE_TEXT = {"libre": "Libre", "ocupado": "Ocupada", "reservada": "Reservada"}
+BTN_COLORS = {
+    "abrir": QColor("#2d86c9"),
+    "ver": QColor("#7d8b95"),
+    "reservar": QColor("#f39c12"),
+    "liberar": QColor("#95a5a6"),
+}
+BTN_TEXT = {"ver": "Ver Orden", "reservar": "Reservar", "liberar": "Liberar"}
+
+
+def _estado_normalizado(estado: Optional[str]) -> str:
+    estado = (estado or "libre").lower()
+    # Algunas rutas guardan "ocupada"; el plano usa los mismos estados que MesaWidget
+    return "ocupado" if estado == "ocupada" else estado
+
+
+def acciones_por_estado(estado: str) -> List[str]:
+    """Botones visibles según el estado (misma lógica que MesaWidget)."""
+    if estado == "libre":
+        return ["abrir", "reservar"]
+    if estado == "reservada":
+        return ["abrir", "liberar"]
+    return ["abrir", "ver"]
+
+
+class MesasModel(QAbstractListModel):
+    """Lista de mesas; actualizar() emite solo los cambios necesarios."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filas: List[tuple] = []  # (id, numero, estado, seccion_id, seccion_nombre)
+        self._fila_por_id: Dict[int, int] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        mesa_id, numero, estado, seccion_id, seccion_nombre = self._filas[index.row()]
+        if role == Qt.DisplayRole:
+            return numero
+        if role == MesaIdRole:
+            return mesa_id
+        if role == EstadoRole:
+            return estado
+        if role == SeccionIdRole:
+            return seccion_id
+        if role == SeccionNombreRole:
+            return seccion_nombre
+        if role == Qt.ToolTipRole:
+            return f"{numero} — Sección: {seccion_nombre}"
+        return None
+
+    def actualizar(self, mesas, nombres_seccion: Dict[int, str]) -> None:
+        """
+        Sincroniza el modelo con la lista de mesas. Si el conjunto de mesas
+        no cambió solo se emite dataChanged para las filas modificadas;
+        altas o bajas reinician el modelo.
+        """
+        filas = [
+            (
+                mesa.id,
+                mesa.numero,
+                _estado_normalizado(mesa.estado),
+                mesa.seccion_id,
+                nombres_seccion.get(mesa.seccion_id, "Sin sección") if mesa.seccion_id else "Sin sección",
+            )
+            for mesa in mesas
+        ]
+        if [f[0] for f in filas] != [f[0] for f in self._filas]:
+            self.beginResetModel()
+            self._filas = filas
+            self._fila_por_id = {f[0]: i for i, f in enumerate(filas)}
+            self.endResetModel()
+            return
+
+        for i, fila in enumerate(filas):
+            if fila != self._filas[i]:
+                self._filas[i] = fila
+                idx = self.index(i)
+                self.dataChanged.emit(idx, idx)
+
+    def fila_de(self, mesa_id: int) -> Optional[int]:
+        return self._fila_por_id.get(mesa_id)
+
+
+class MesasFilterProxy(QSortFilterProxyModel):
+    """Filtra por sección, estado y nombre; ordena por sección y nombre."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._seccion_id = None
+        self._estado = None
+        self._texto = ""
+        self.setDynamicSortFilter(True)
+
+    def set_filtros(self, seccion_id=None, estado=None, texto: str = "") -> None:
+        filtros = (seccion_id, estado, (texto or "").strip().lower())
+        if filtros == (self._seccion_id, self._estado, self._texto):
+            return
+        self._seccion_id, self._estado, self._texto = filtros
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        model = self.sourceModel()
+        idx = model.index(source_row, 0, source_parent)
+        if self._seccion_id is not None and idx.data(SeccionIdRole) != self._seccion_id:
+            return False
+        if self._estado and idx.data(EstadoRole) != self._estado:
+            return False
+        if self._texto and self._texto not in str(idx.data(Qt.DisplayRole)).lower():
+            return False
+        return True
+
+    def lessThan(self, left, right):
+        clave_izq = (left.data(SeccionIdRole) or 0, str(left.data(Qt.DisplayRole)))
+        clave_der = (right.data(SeccionIdRole) or 0, str(right.data(Qt.DisplayRole)))
+        return clave_izq < clave_der
+
+
+class MesaDelegate(QStyledItemDelegate):
+    """Pinta la tarjeta de una mesa y resuelve los clics en sus botones."""
+
+    # (mesa_id, acción) con acción en abrir/ver/reservar/liberar
+    accion = Signal(int, str)
+
+    MARGEN = 6
+    PADDING = 8
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._font_nombre = QFont("Segoe UI", 11, QFont.Bold)
+        self._font_badge = QFont("Segoe UI", 9)
+        self._font_btn = QFont("Segoe UI", 9, QFont.Bold)
+
+    def sizeHint(self, option, index):
+        return CARD_SIZE
+
+    def _rect_tarjeta(self, rect: QRect) -> QRect:
+        return rect.adjusted(self.MARGEN, self.MARGEN, -self.MARGEN, -self.MARGEN)
+
+    def _rects_botones(self, rect: QRect, estado: str):
+        card = self._rect_tarjeta(rect)
+        acciones = acciones_por_estado(estado)
+        ancho = (card.width() - 2 * self.PADDING - 8 * (len(acciones) - 1)) // len(acciones)
+        y = card.bottom() - self.PADDING - 28
+        x = card.left() + self.PADDING
+        rects = []
+        for nombre in acciones:
+            rects.append((nombre, QRect(x, y, ancho, 28)))
+            x += ancho + 8
+        return rects
+
+    def paint(self, painter: QPainter, option, index):
+        estado = index.data(EstadoRole)
+        card = self._rect_tarjeta(option.rect)
+        hover = bool(option.state & QStyle.State_MouseOver)
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # Tarjeta
+        painter.setPen(QPen(QColor("#ffffff") if hover else CARD_BORDER, 2 if hover else 1))
+        painter.setBrush(CARD_BG_HOVER if hover else CARD_BG)
+        painter.drawRoundedRect(card, 8, 8)
+
+        # Nombre
+        painter.setFont(self._font_nombre)
+        painter.setPen(QColor("#ffffff"))
+        nombre_rect = QRect(card.left() + self.PADDING, card.top() + self.PADDING,
+                            card.width() - 2 * self.PADDING, 22)
+        painter.drawText(nombre_rect, Qt.AlignLeft | Qt.AlignVCenter, str(index.data(Qt.DisplayRole)))
+
+        # Badge de estado
+        fondo, texto = BADGE_COLORS.get(estado, BADGE_COLORS["libre"])
+        painter.setFont(self._font_badge)
+        etiqueta = f"Estado: {BADGE_TEXT.get(estado, 'Libre')}"
+        ancho = painter.fontMetrics().horizontalAdvance(etiqueta) + 12
+        badge_rect = QRect(nombre_rect.left(), nombre_rect.bottom() + 6, ancho, 22)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(fondo)
+        painter.drawRoundedRect(badge_rect, 6, 6)
+        painter.setPen(texto)
+        painter.drawText(badge_rect, Qt.AlignCenter, etiqueta)
+
+        # Botones
+        painter.setFont(self._font_btn)
+        for nombre, rect in self._rects_botones(option.rect, estado):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(BTN_COLORS[nombre])
+            painter.drawRoundedRect(rect, 6, 6)
+            painter.setPen(QColor("white"))
+            if nombre == "abrir":
+                texto_btn = "Continuar" if estado == "ocupado" else "Abrir"
+            else:
+                texto_btn = BTN_TEXT[nombre]
+            painter.drawText(rect, Qt.AlignCenter, texto_btn)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            pos = event.position().toPoint()
+            for nombre, rect in self._rects_botones(option.rect, index.data(EstadoRole)):
+                if rect.contains(pos):
+                    self.accion.emit(index.data(MesaIdRole), nombre)
+                    return True
+        return super().editorEvent(event, model, option, index)
+
+
+class MesasPlanoView(QListView):
+    """
+    Vista en cuadrícula del plano virtualizado. Expone las mismas señales
+    que MesaWidget, con el id de la mesa.
+    """
+
+    abrir_orden = Signal(int)
+    ver_orden = Signal(int)
+    reservar_mesa = Signal(int)
+    liberar_mesa = Signal(int)
+    # (mesa_id, estado, posición global) para el menú contextual
+    menu_mesa = Signal(int, str, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("mesasPlano")
+        self.modelo = MesasModel(self)
+        self.proxy = MesasFilterProxy(self)
+        self.proxy.setSourceModel(self.modelo)
+        self.proxy.sort(0)
+        self.setModel(self.proxy)
+
+        self.delegado = MesaDelegate(self)
+        self.delegado.accion.connect(self._on_accion)
+        self.setItemDelegate(self.delegado)
+
+        # Cuadrícula de tarjetas de tamaño fijo: el layout no mide cada item
+        self.setViewMode(QListView.IconMode)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setUniformItemSizes(True)
+        self.setGridSize(CARD_SIZE)
+        self.setLayoutMode(QListView.Batched)
+        self.setBatchSize(200)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setMouseTracking(True)
+        self.setSpacing(4)
+
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._on_menu)
+
+    def _on_accion(self, mesa_id: int, accion: str):
+        senales = {
+            "abrir": self.abrir_orden,
+            "ver": self.ver_orden,
+            "reservar": self.reservar_mesa,
+            "liberar": self.liberar_mesa,
+        }
+        senales[accion].emit(mesa_id)
+
+    def _on_menu(self, pos):
+        index = self.indexAt(pos)
+        if index.isValid():
+            self.menu_mesa.emit(
+                index.data(MesaIdRole), index.data(EstadoRole), self.viewport().mapToGlobal(pos)
+            )
@@ -1,5 +1,5 @@
 # src/app/views/mesas/mesas_view.py
-from typing import List
+from typing import Dict, List, Optional
 from PySide6.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -30,11 +30,18 @@ from ...services.mesas_service import (
 )
 from ...services import orden_service as orden_service_module
 
+from ...config import MESAS_PLANO_VIRTUAL_UMBRAL
 from .mesas_widget import MesaWidget
+from .mesas_plano import MesasPlanoView
+from ..cambios_dispatcher import obtener_dispatcher
 from ..orden.orden_view import OrdenDialog
 from ..orden.orden_view_dialog import OrdenViewDialog
 
 
+# Tablas cuyos cambios refrescan el plano de mesas
+TABLAS_MESAS = {"mesas", "secciones", "ordenes"}
+
+
 class MesasView(QWidget):
     mesa_seleccionada = Signal(int)
     estado_mesa_cambiado = Signal()
@@ -43,14 +50,25 @@ class MesasView(QWidget):
         super().__init__()
         self.usuario = usuario
         self._widgets_mesa: List[MesaWidget] = []
+        # Registro de widgets por mesa.id y grupos por sección (se reutilizan)
+        self._widgets_por_id: Dict[int, MesaWidget] = {}
+        self._grupos: Dict[Optional[int], tuple] = {}
+        # Mesas colocadas en el grid de cada sección y orden de las secciones
+        self._colocacion: Dict[Optional[int], List[int]] = {}
+        self._orden_grupos: List[Optional[int]] = []
+        self._nombres_seccion: Dict[int, str] = {}
         self._all_mesas_cache = []
         self._all_ordenes_cache = []
         self._is_updating = False
         self._is_modal_active = False  # Nueva protección contra actualización concurrente con modales
+        self._cambios_pendientes = False  # Cambios recibidos mientras no se podía refrescar
         self.setup_ui()
         self.cargar_secciones()
         self.actualizar_mesas()
 
+        # Refresco por cambios en la BD (mesas, secciones, órdenes)
+        obtener_dispatcher().suscribir(TABLAS_MESAS, self._on_cambios, propietario=self)
+
     def setup_ui(self):
         root = QHBoxLayout(self)
         root.setContentsMargins(12, 12, 12, 12)
@@ -80,8 +98,25 @@ class MesasView(QWidget):
 
         self.grid.setSpacing(16)
         self.scroll.setWidget(self.scroll_content)
+
+        # Mensaje cuando no hay mesas (fila propia, al final del grid)
+        self._placeholder = QLabel("No hay mesas registradas")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.hide()
+        self.grid.addWidget(self._placeholder, 1000, 0)
         main_v.addWidget(self.scroll, stretch=1)
 
+        # Plano virtualizado para locales con muchas mesas (ver actualizar_mesas)
+        self.plano_virtual = MesasPlanoView()
+        self.plano_virtual.abrir_orden.connect(self._on_widget_abrir_orden)
+        self.plano_virtual.ver_orden.connect(self._on_widget_ver_orden_readonly)
+        self.plano_virtual.reservar_mesa.connect(self._on_widget_reservar_mesa)
+        self.plano_virtual.liberar_mesa.connect(self._on_widget_liberar_mesa)
+        self.plano_virtual.menu_mesa.connect(self._menu_mesa)
+        self.plano_virtual.hide()
+        main_v.addWidget(self.plano_virtual, stretch=1)
+        self._plano_virtual_activo = False
+
         root.addWidget(main_area, stretch=3)
 
         # Right: sidebar
@@ -189,127 +224,209 @@ class MesasView(QWidget):
             rows = []
         self._all_ordenes_cache = rows
 
-    # Eliminado _clear_layout ya que usaremos reemplazo total de contenedor
-
     def _on_filter_changed(self, source):
-        print(f"DEBUG: Filtro cambiado desde: {source}")
-        self.actualizar_mesas()
+        # Los filtros solo muestran/ocultan widgets existentes: sin consultas
+        self._aplicar_filtros()
 
     def actualizar_mesas(self):
-        if self._is_updating:
-            print("DEBUG: MesasView.actualizar_mesas() ignorado (ya en ejecución)")
-            return
-        
-        if self._is_modal_active:
-            print("DEBUG: MesasView.actualizar_mesas() BLOQUEADO (diálogo modal activo)")
+        """
+        Sincroniza el plano con la BD. Los widgets se identifican por mesa.id:
+        solo se crean/destruyen los de mesas nuevas/eliminadas y el resto se
+        actualiza en sitio (MesaWidget.actualizar_estado).
+        """
+        if self._is_updating or self._is_modal_active:
             return
-        
+
         self._is_updating = True
-        print("DEBUG: MesasView.actualizar_mesas() iniciado (Estrategia: Reemplazo de Contenedor)")
-        
+        self._cambios_pendientes = False
         try:
             self.cargar_cache_mesas_y_ordenes()
-            
-            # DEBUG: Ver qué datos trajo el cache
-            print("DEBUG: Estado de mesas en DB:")
-            for m in self._all_mesas_cache:
-                print(f"  - Mesa {m.numero} (ID={m.id}): {m.estado}")
-            
-            # 1. Crear el NUEVO contenedor y su layout
-            nuevo_scroll_content = QWidget()
-            nuevo_scroll_content.setObjectName("mesasScrollContent")
-            nuevo_grid = QGridLayout(nuevo_scroll_content)
-            nuevo_grid.setContentsMargins(8, 8, 8, 8)
-            nuevo_grid.setSpacing(16)
-            
-            # 2. Reiniciar lista de widgets
-            nuevos_widgets = []
-
-            seccion_filtrar = self.combo_secciones.currentData()
-            nombre_buscar = (self.input_buscar_nombre.text() or "").strip().lower()
-            estado_filtrar = self.combo_estado.currentData()
-
-            # Agrupar mesas por sección
-            mesas_por_seccion = {}
-            for mesa in self._all_mesas_cache:
-                mesas_por_seccion.setdefault(mesa.seccion_id, []).append(mesa)
-
-            if not mesas_por_seccion:
-                placeholder = QLabel("No hay mesas registradas")
-                placeholder.setAlignment(Qt.AlignCenter)
-                nuevo_grid.addWidget(placeholder, 0, 0)
-            else:
-                cols = 3
-                row_block = 0
-
-                for sec_id, lista in sorted(
-                    mesas_por_seccion.items(), key=lambda t: (t[0] or 0)
-                ):
-                    if seccion_filtrar is not None and sec_id != seccion_filtrar:
-                        continue
-
-                    # Obtener nombre de sección
-                    sec_nombre = "Sin sección"
-                    if sec_id:
-                        secciones = obtener_secciones()
-                        for s in secciones:
-                            if s.id == sec_id:
-                                sec_nombre = s.nombre
-                                break
-
-                    group = QGroupBox(sec_nombre)
-                    inner = QGridLayout()
-                    inner.setSpacing(12)
-                    r = 0
-                    c = 0
-
-                    for mesa in sorted(lista, key=lambda x: x.numero):
-                        if nombre_buscar and nombre_buscar not in str(mesa.numero).lower():
-                            continue
-                        if estado_filtrar and mesa.estado.lower() != estado_filtrar:
-                            continue
-
-                        mesa_tuple = (mesa.id, mesa.numero, mesa.estado, mesa.seccion_id, sec_nombre)
-                        widget = MesaWidget(mesa_tuple, parent=nuevo_scroll_content)
-                        widget.abrir_orden.connect(self._on_widget_abrir_orden)
-                        widget.ver_orden.connect(self._on_widget_ver_orden_readonly)
-                        widget.reservar_mesa.connect(self._on_widget_reservar_mesa)
-                        widget.liberar_mesa.connect(self._on_widget_liberar_mesa)
-                        widget.setContextMenuPolicy(Qt.CustomContextMenu)
-                        widget.customContextMenuRequested.connect(
-                            lambda pos, w=widget: self.mostrar_menu_contextual(w, pos)
-                        )
-                        inner.addWidget(widget, r, c)
-                        nuevos_widgets.append(widget)
-                        c += 1
-                        if c >= cols:
-                            c = 0
-                            r += 1
-
-                    group.setLayout(inner)
-                    nuevo_grid.addWidget(group, row_block, 0)
-                    row_block += 1
-            
-            # 3. CAMBIO CRÍTICO: Reemplazar el widget del scroll de una sola vez
-            print("DEBUG: Aplicando nuevo contenedor al scroll area")
-            old_widget = self.scroll.takeWidget()
-            if old_widget:
-                old_widget.deleteLater()
-            
-            self.scroll.setWidget(nuevo_scroll_content)
-            self.scroll_content = nuevo_scroll_content
-            self.grid = nuevo_grid
-            self._widgets_mesa = nuevos_widgets
-            
-            print(f"DEBUG: MesasView.actualizar_mesas() finalizado. Widgets creados: {len(self._widgets_mesa)}")
-            
+            # Secciones: una sola consulta por refresco
+            self._nombres_seccion = {s.id: s.nombre for s in obtener_secciones()}
+
+            # Con muchas mesas se usa el plano virtualizado y se liberan los widgets
+            usar_virtual = len(self._all_mesas_cache) > MESAS_PLANO_VIRTUAL_UMBRAL
+            if usar_virtual:
+                self.plano_virtual.modelo.actualizar(self._all_mesas_cache, self._nombres_seccion)
+
+            vigentes = set() if usar_virtual else {mesa.id for mesa in self._all_mesas_cache}
+            for mesa_id in [m for m in self._widgets_por_id if m not in vigentes]:
+                widget = self._widgets_por_id.pop(mesa_id)
+                widget.setParent(None)
+                widget.deleteLater()
+            if usar_virtual:
+                self._liberar_grupos()
+
+            for mesa in [] if usar_virtual else self._all_mesas_cache:
+                sec_nombre = self._nombre_seccion(mesa.seccion_id)
+                widget = self._widgets_por_id.get(mesa.id)
+                if widget is None:
+                    widget = self._crear_widget_mesa(mesa, sec_nombre)
+                    self._widgets_por_id[mesa.id] = widget
+                else:
+                    if widget.numero != mesa.numero:
+                        widget.numero = mesa.numero
+                        widget.label_nombre.setText(mesa.numero)
+                    widget.seccion_id = mesa.seccion_id
+                    widget.seccion_nombre = sec_nombre
+                    widget.actualizar_estado(mesa.estado)
+
+            self._widgets_mesa = list(self._widgets_por_id.values())
+            self._set_plano_virtual(usar_virtual)
+            self._aplicar_filtros()
         except Exception as e:
-            print(f"DEBUG: Error crítico en actualizar_mesas: {e}")
+            print(f"Error en actualizar_mesas: {e}")
             import traceback
             traceback.print_exc()
         finally:
             self._is_updating = False
-            print("DEBUG: MesasView.actualizar_mesas() flag reset")
+
+    def _set_plano_virtual(self, activo: bool):
+        if activo == self._plano_virtual_activo:
+            return
+        self._plano_virtual_activo = activo
+        self.scroll.setVisible(not activo)
+        self.plano_virtual.setVisible(activo)
+
+    def _nombre_seccion(self, sec_id):
+        if not sec_id:
+            return "Sin sección"
+        return self._nombres_seccion.get(sec_id, "Sin sección")
+
+    def _crear_widget_mesa(self, mesa, sec_nombre) -> MesaWidget:
+        mesa_tuple = (mesa.id, mesa.numero, mesa.estado, mesa.seccion_id, sec_nombre)
+        widget = MesaWidget(mesa_tuple, parent=self.scroll_content)
+        widget.abrir_orden.connect(self._on_widget_abrir_orden)
+        widget.ver_orden.connect(self._on_widget_ver_orden_readonly)
+        widget.reservar_mesa.connect(self._on_widget_reservar_mesa)
+        widget.liberar_mesa.connect(self._on_widget_liberar_mesa)
+        widget.setContextMenuPolicy(Qt.CustomContextMenu)
+        widget.customContextMenuRequested.connect(
+            lambda pos, w=widget: self.mostrar_menu_contextual(w, pos)
+        )
+        return widget
+
+    def _grupo_seccion(self, sec_id):
+        grupo = self._grupos.get(sec_id)
+        if grupo is None:
+            box = QGroupBox(self._nombre_seccion(sec_id), self.scroll_content)
+            inner = QGridLayout(box)
+            inner.setSpacing(12)
+            grupo = (box, inner)
+            self._grupos[sec_id] = grupo
+            self._colocacion[sec_id] = []
+        return grupo
+
+    def _liberar_grupos(self):
+        """
+        Destruye los grupos de sección del plano con widgets. Al pasar al
+        plano virtual los widgets se liberan; si la colocación quedara
+        guardada, al volver al plano con widgets las mesas recreadas con los
+        mismos ids no se añadirían a ningún grid.
+        """
+        for box, _ in self._grupos.values():
+            self.grid.removeWidget(box)
+            box.deleteLater()
+        self._grupos.clear()
+        self._colocacion.clear()
+        self._orden_grupos = []
+
+    def _aplicar_filtros(self):
+        """
+        Coloca los widgets existentes según los filtros: los que no cumplen
+        se ocultan y el grid de una sección solo se rehace si cambió la
+        lista de mesas visibles en ella.
+        """
+        seccion_filtrar = self.combo_secciones.currentData()
+        nombre_buscar = (self.input_buscar_nombre.text() or "").strip().lower()
+        estado_filtrar = self.combo_estado.currentData()
+        cols = 3
+
+        if self._plano_virtual_activo:
+            # El proxy filtra sin tocar el modelo ni crear widgets
+            self.plano_virtual.proxy.set_filtros(seccion_filtrar, estado_filtrar, nombre_buscar)
+            return
+
+        # Agrupar mesas por sección
+        mesas_por_seccion = {}
+        for widget in self._widgets_por_id.values():
+            mesas_por_seccion.setdefault(widget.seccion_id, []).append(widget)
+
+        # Secciones que ya no tienen mesas
+        for sec_id in [s for s in self._grupos if s not in mesas_por_seccion]:
+            box, _ = self._grupos.pop(sec_id)
+            self._colocacion.pop(sec_id, None)
+            self.grid.removeWidget(box)
+            box.deleteLater()
+
+        visibles_por_seccion = {}
+        for sec_id, lista in mesas_por_seccion.items():
+            visibles = []
+            for widget in sorted(lista, key=lambda w: w.numero):
+                if seccion_filtrar is not None and sec_id != seccion_filtrar:
+                    continue
+                if nombre_buscar and nombre_buscar not in str(widget.numero).lower():
+                    continue
+                if estado_filtrar and widget.estado.lower() != estado_filtrar:
+                    continue
+                visibles.append(widget.mesa_id)
+            visibles_por_seccion[sec_id] = visibles
+
+        # Quitar primero de los grids que cambian (una mesa puede cambiar de sección)
+        cambiadas = []
+        for sec_id, visibles in visibles_por_seccion.items():
+            self._grupo_seccion(sec_id)
+            if self._colocacion[sec_id] != visibles:
+                cambiadas.append(sec_id)
+                _, inner = self._grupos[sec_id]
+                for mesa_id in self._colocacion[sec_id]:
+                    widget = self._widgets_por_id.get(mesa_id)
+                    if widget is not None:
+                        inner.removeWidget(widget)
+
+        visibles_total = set()
+        for sec_id in cambiadas:
+            box, inner = self._grupos[sec_id]
+            for posicion, mesa_id in enumerate(visibles_por_seccion[sec_id]):
+                r, c = divmod(posicion, cols)
+                inner.addWidget(self._widgets_por_id[mesa_id], r, c)
+            self._colocacion[sec_id] = visibles_por_seccion[sec_id]
+        for visibles in visibles_por_seccion.values():
+            visibles_total.update(visibles)
+
+        for mesa_id, widget in self._widgets_por_id.items():
+            widget.setVisible(mesa_id in visibles_total)
+
+        # Grupos de sección en orden, ocultando los filtrados
+        orden = sorted(self._grupos, key=lambda s: (s or 0))
+        if orden != self._orden_grupos:
+            for sec_id in orden:
+                self.grid.removeWidget(self._grupos[sec_id][0])
+            for row_block, sec_id in enumerate(orden):
+                self.grid.addWidget(self._grupos[sec_id][0], row_block, 0)
+            self._orden_grupos = orden
+        for sec_id, (box, _) in self._grupos.items():
+            titulo = self._nombre_seccion(sec_id)
+            if box.title() != titulo:
+                box.setTitle(titulo)
+            box.setVisible(seccion_filtrar is None or sec_id == seccion_filtrar)
+
+        self._placeholder.setVisible(not self._widgets_por_id)
+
+    def _on_cambios(self, tablas):
+        """Cambios en la BD: refrescar ahora o al volver a estar disponible"""
+        if not self.isVisible() or self._is_modal_active or self._is_updating:
+            self._cambios_pendientes = True
+            return
+        self.actualizar_mesas()
+
+    def _refrescar_si_pendiente(self):
+        if self._cambios_pendientes:
+            self.actualizar_mesas()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._refrescar_si_pendiente()
 
     def _on_widget_abrir_orden(self, mesa_id: int):
         self.abrir_orden(mesa_id)
@@ -379,14 +496,11 @@ class MesasView(QWidget):
             # from PySide6.QtCore import QTimer
             # dialog.estado_mesa_cambiado.connect(...)  <-- ELIMINADO PARA EVITAR CRASH
             
-            print("DEBUG: Abriendo OrdenDialog.exec()...")
             self._is_modal_active = True
             try:
                 dialog.exec()
             finally:
                 self._is_modal_active = False
-                
-            print("DEBUG: OrdenDialog.exec() finalizado")
             
             # Forzar proceso de eventos para limpiar la UI antes de destruir nada
             from PySide6.QtCore import QCoreApplication
@@ -396,15 +510,15 @@ class MesasView(QWidget):
             dialog = None
             
         except Exception as e:
-            print(f"DEBUG: Error en abrir_orden: {e}")
+            print(f"Error en abrir_orden: {e}")
             import traceback
             traceback.print_exc()
             QMessageBox.critical(self, "Error", f"No se pudo abrir orden: {e}")
         finally:
-            # Siempre refrescar al cerrar, independientemente de errores
-            print("DEBUG: Programando actualizar_mesas diferido (500ms)")
+            # Refrescar al cerrar solo si llegaron cambios durante el diálogo
+            # (diferido para que el diálogo termine de destruirse)
             from PySide6.QtCore import QTimer
-            QTimer.singleShot(500, self.actualizar_mesas)
+            QTimer.singleShot(500, self._refrescar_si_pendiente)
 
     def agregar_mesa(self):
         seccion_id = self.combo_secciones.currentData()
@@ -476,26 +590,32 @@ class MesasView(QWidget):
             QMessageBox.critical(self, "Error", error or "No se pudo eliminar la mesa")
 
     def mostrar_menu_contextual(self, widget: MesaWidget, pos):
+        nuevo = self._menu_mesa(widget.mesa_id, widget.estado, widget.mapToGlobal(pos))
+        if nuevo:
+            widget.actualizar_estado(nuevo)
+
+    def _menu_mesa(self, mesa_id: int, estado: str, global_pos):
+        """Menú contextual de una mesa; devuelve el estado nuevo si se alternó."""
         m = QMenu(self)
         act_editar = m.addAction("Editar Mesa")
         act_toggle = m.addAction("Alternar Estado")
         act_abrir = m.addAction("Abrir Orden")
-        accion = m.exec_(widget.mapToGlobal(pos))
+        accion = m.exec_(global_pos)
 
         if accion == act_editar:
-            self.editar_mesa(widget.mesa_id)
+            self.editar_mesa(mesa_id)
         elif accion == act_toggle:
-            nuevo = "libre" if widget.estado != "libre" else "ocupada"
-            ok, error = cambiar_estado_mesa(widget.mesa_id, nuevo)
+            nuevo = "libre" if estado != "libre" else "ocupada"
+            ok, error = cambiar_estado_mesa(mesa_id, nuevo)
             if ok:
-                widget.actualizar_estado(nuevo)
                 self.estado_mesa_cambiado.emit()
-            else:
-                QMessageBox.critical(
-                    self, "Error", error or "No se pudo cambiar el estado"
-                )
+                return nuevo
+            QMessageBox.critical(
+                self, "Error", error or "No se pudo cambiar el estado"
+            )
         elif accion == act_abrir:
-            self.abrir_orden(widget.mesa_id)
+            self.abrir_orden(mesa_id)
+        return None
 
     def agregar_seccion(self):
         nombre, ok = QInputDialog.getText(
@@ -798,21 +918,9 @@ class MesasView(QWidget):
 
         # Buscar órdenes
         try:
-            from ...db.connection import crear_conexion
-
-            conn = crear_conexion()
-            cur = conn.cursor()
-            cur.execute(
-                """
-                SELECT o.id, o.cliente_nombre, o.total, o.estado, m.numero, m.id
-                FROM ordenes o
-                JOIN mesas m ON o.mesa_id = m.id
-                WHERE o.cliente_nombre LIKE ? AND o.estado = 'abierta'
-            """,
-                (f"%{nombre_cliente}%",),
+            resultados = orden_service_module.buscar_ordenes_abiertas_por_cliente(
+                nombre_cliente
             )
-            resultados = cur.fetchall()
-            conn.close()
 
             if not resultados:
                 QMessageBox.information(
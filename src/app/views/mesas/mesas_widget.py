@@ -50,6 +50,7 @@ class MesaWidget(QWidget):
         self.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
         self.setFixedSize(220, 120)
 
+        self._estado_aplicado = None
         self._build_ui()
         self.actualizar_estado(self.estado)
 
@@ -133,6 +134,10 @@ class MesaWidget(QWidget):
     def actualizar_estado(self, nuevo_estado: str):
         self.estado = nuevo_estado or "libre"
         estado = self.estado.lower()
+        if estado == self._estado_aplicado:
+            # Sin cambios: evitar re-estilizar (unpolish/polish) en cada refresco
+            return
+        self._estado_aplicado = estado
 
         # Badge text y color
         if estado == "ocupado":
@@ -26,7 +26,7 @@ class InvoicePreviewDialog(QDialog):
       - productos: List[Dict] each dict: {'nombre','precio','cantidad','subtotal'}
       - total: float
       - forma_pago: Optional[str] default 'Efectivo'
-      - numero_factura: Optional[str] si None el diálogo generará un número temporal
+      - numero_factura: Optional[str] si None el número se asigna al confirmar
     """
 
     def __init__(
@@ -47,12 +47,9 @@ class InvoicePreviewDialog(QDialog):
         self.productos = productos
         self.total = float(total)
         self.forma_pago = forma_pago or "Efectivo"
-        self.numero_factura = numero_factura or self._generar_numero_temporal()
+        self.numero_factura = numero_factura
         self._build_ui()
 
-    def _generar_numero_temporal(self) -> str:
-        return f"TEMP-{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
-
     def _build_ui(self):
         layout = QVBoxLayout(self)
 
@@ -63,7 +60,7 @@ class InvoicePreviewDialog(QDialog):
 
         # Datos factura / cliente
         meta = QLabel(
-            f"<b>Factura #</b> {self.numero_factura} &nbsp;&nbsp;&nbsp; <b>Fecha:</b> {datetime.datetime.now().strftime('%d/%m/%Y %I:%M:%S %p')}<br>"
+            f"<b>Factura #</b> {self.numero_factura or '(se asigna al confirmar)'} &nbsp;&nbsp;&nbsp; <b>Fecha:</b> {datetime.datetime.now().strftime('%d/%m/%Y %I:%M:%S %p')}<br>"
             f"<b>Cliente:</b> {self.cliente}<br>"
         )
         meta.setTextFormat(Qt.RichText)
@@ -130,7 +127,7 @@ class InvoicePreviewDialog(QDialog):
         total = float(self.total)
         forma_pago = self.forma_pago
 
-        ok, err = orden_controller_module.generar_factura_flow(
+        ok, numero, err = orden_controller_module.generar_factura_flow(
             self.orden_id, cliente, total, numero, forma_pago
         )
         if not ok:
@@ -139,6 +136,7 @@ class InvoicePreviewDialog(QDialog):
             )
             return
 
+        self.numero_factura = numero
         QMessageBox.information(
             self, "Factura creada", f"Factura {numero} creada correctamente"
         )
@@ -1,7 +1,6 @@
 # src/app/views/orden/orden_view.py
 from typing import List, Dict, Optional, Tuple
 import datetime
-import random
 import logging
 
 from PySide6.QtWidgets import (
@@ -40,6 +39,9 @@ import traceback
 
 logger = logging.getLogger(__name__)
 
+# (versión del catálogo, productos) compartido entre instancias de OrdenDialog
+_productos_por_version: Optional[Tuple[int, List[Dict]]] = None
+
 
 class OrdenDialog(QDialog):
     estado_mesa_cambiado = Signal()
@@ -321,24 +323,31 @@ class OrdenDialog(QDialog):
         self.list_secciones.setCurrentRow(0)
 
     def cargar_todos_productos_cache(self):
+        """
+        Productos del menú para la tabla de selección. Sale del catálogo en
+        memoria de menu_service (sin consultas si está cargado) y la lista
+        armada se comparte entre diálogos mientras la versión no cambie.
+        """
+        global _productos_por_version
         cache: List[Dict] = []
         try:
-            secciones = menu_service.listar_secciones(only_active=True)
-            for s in secciones:  # s es MenuSection
-                items = menu_service.listar_items_por_seccion(
-                    s.id, only_disponible=True
-                )
-                for it in items:  # it es MenuItem
-                    cache.append(
-                        {
-                            "fuente": "menu",
-                            "id": int(it.id),
-                            "nombre": it.nombre or "",
-                            "descripcion": it.descripcion or "",
-                            "precio": float(it.precio or 0.0),
-                            "section_id": int(it.section_id),
-                        }
-                    )
+            catalogo = menu_service.obtener_catalogo()
+            if _productos_por_version and _productos_por_version[0] == catalogo.version:
+                cache = _productos_por_version[1]
+            else:
+                for s in catalogo.listar_secciones(only_active=True):  # s es MenuSection
+                    for it in catalogo.items_de_seccion(s.id, only_disponible=True):
+                        cache.append(
+                            {
+                                "fuente": "menu",
+                                "id": int(it.id),
+                                "nombre": it.nombre or "",
+                                "descripcion": it.descripcion or "",
+                                "precio": float(it.precio or 0.0),
+                                "section_id": int(it.section_id),
+                            }
+                        )
+                _productos_por_version = (catalogo.version, cache)
         except Exception:
             logger.exception("Error cargando menu_items")
 
@@ -646,14 +655,13 @@ class OrdenDialog(QDialog):
         if not ok or not metodo_pago:
             return
 
-        numero_sugerido = f"FACT-{datetime.datetime.now().strftime('%Y%m%d')}-{random.randint(1000,9999)}"
+        # El número se toma de la secuencia del día al confirmar la factura
         dlg = InvoicePreviewDialog(
             self.orden_id,
             self.input_cliente.text().strip() or "Consumidor final",
             productos_display,
             self._calcular_total(),
             forma_pago=metodo_pago,
-            numero_factura=numero_sugerido,
             parent=self,
         )
         res = dlg.exec()
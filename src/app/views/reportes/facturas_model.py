@@ -0,0 +1,147 @@
+# src/app/views/reportes/facturas_model.py
+"""
+Modelo de tabla de facturas con carga perezosa.
+
+Las filas se piden a factura_service.listar_facturas_pagina por páginas
+(cursor sobre (columna de orden, id)) a medida que la vista se desplaza:
+QTableView llama a canFetchMore/fetchMore al acercarse al final. Abrir la
+pestaña solo lee la primera página, sin importar el tamaño del historial.
+
+El orden y el filtro se resuelven en SQL: cambiarlos reinicia el modelo y
+vuelve a pedir la primera página.
+
+Qt llama a fetchMore desde la vista y descarta cualquier excepción, así
+que los errores de consulta se capturan aquí y se avisan con la señal
+error_carga.
+"""
+from typing import List, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+
+from ...models import Factura
+from ...services.factura_service import listar_facturas_pagina
+
+TAMANO_PAGINA = 200
+
+ENCABEZADOS = ["Número", "Fecha", "Cliente", "Total USD", "Total Bs"]
+
+# Columna visible -> columna SQL de orden
+ORDEN_POR_COLUMNA = {
+    0: "numero_factura",
+    1: "fecha",
+    2: "cliente_nombre",
+    3: "total",
+    4: "total_ves",
+}
+
+
+class FacturasTableModel(QAbstractTableModel):
+    """Facturas paginadas; el id de cada fila va en Qt.UserRole."""
+
+    # Mensaje de error al pedir una página (la carga se detiene)
+    error_carga = Signal(str)
+
+    def __init__(self, parent=None, tamano_pagina: int = TAMANO_PAGINA):
+        super().__init__(parent)
+        self._tamano_pagina = tamano_pagina
+        self._facturas: List[Factura] = []
+        self._cursor = None
+        self._hay_mas = True
+        self._orden = "fecha"
+        self._descendente = True
+        self._termino = ""
+
+    # ---- API de la vista ----
+
+    def recargar(self) -> None:
+        """Descarta las filas cargadas y pide de nuevo la primera página."""
+        self.beginResetModel()
+        self._facturas = []
+        self._cursor = None
+        self._hay_mas = True
+        self.endResetModel()
+        if self.canFetchMore():
+            self.fetchMore()
+
+    def set_filtro(self, termino: str) -> None:
+        termino = (termino or "").strip()
+        if termino == self._termino:
+            return
+        self._termino = termino
+        self.recargar()
+
+    def factura_en(self, row: int) -> Optional[Factura]:
+        if 0 <= row < len(self._facturas):
+            return self._facturas[row]
+        return None
+
+    # ---- QAbstractTableModel ----
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._facturas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(ENCABEZADOS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ENCABEZADOS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        factura = self._facturas[index.row()]
+        col = index.column()
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return factura.numero_factura
+            if col == 1:
+                return str(factura.fecha)
+            if col == 2:
+                return factura.cliente_nombre
+            if col == 3:
+                return factura.get_total_formateado()
+            if col == 4:
+                total_ves = factura.total_ves if factura.total_ves is not None else 0.0
+                return f"{total_ves:,.2f} Bs"
+        if role == Qt.UserRole:
+            return factura.id
+        if role == Qt.TextAlignmentRole and col in (3, 4):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._hay_mas
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._hay_mas:
+            return
+        try:
+            facturas, self._cursor = listar_facturas_pagina(
+                limite=self._tamano_pagina,
+                cursor=self._cursor,
+                orden=self._orden,
+                descendente=self._descendente,
+                termino=self._termino or None,
+            )
+        except Exception as e:
+            # Sin más páginas hasta el próximo recargar(): no reintentar en cada scroll
+            self._hay_mas = False
+            self.error_carga.emit(str(e))
+            return
+        self._hay_mas = self._cursor is not None
+        if not facturas:
+            return
+        inicio = len(self._facturas)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(facturas) - 1)
+        self._facturas.extend(facturas)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        orden = ORDEN_POR_COLUMNA.get(column, "fecha")
+        descendente = order == Qt.DescendingOrder
+        if (orden, descendente) == (self._orden, self._descendente) and self._facturas:
+            return
+        self._orden, self._descendente = orden, descendente
+        self.recargar()
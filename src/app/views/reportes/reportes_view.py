@@ -6,6 +6,8 @@ from PySide6.QtWidgets import (
     QMessageBox,
     QTableWidget,
     QTableWidgetItem,
+    QTableView,
+    QAbstractItemView,
     QHeaderView,
     QLineEdit,
     QPushButton,
@@ -20,12 +22,12 @@ import csv
 from datetime import datetime, timedelta
 
 from ...services.factura_service import (
-    obtener_facturas_rango,
     eliminar_factura,
     obtener_detalles_factura,
 )
 from ...services import reportes_service
 from ...models import Factura
+from .facturas_model import FacturasTableModel
 from .invoice_detail_dialog import InvoiceDetailDialog
 from .invoice_print_dialog import InvoicePrintDialog
 
@@ -86,86 +88,48 @@ class ReportesView(QWidget):
         
         layout.addLayout(search_layout)
 
-        # Tabla
-        self.table_facturas = QTableWidget(0, 5)
-        self.table_facturas.setHorizontalHeaderLabels(
-            ["Número", "Fecha", "Cliente", "Total USD", "Total Bs"]
-        )
+        # Tabla (las filas se cargan por páginas al desplazarse)
+        self.facturas_model = FacturasTableModel(self)
+        self.facturas_model.error_carga.connect(self._on_error_carga_facturas)
+        self.table_facturas = QTableView()
+        self.table_facturas.setModel(self.facturas_model)
         self.table_facturas.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table_facturas.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_facturas.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_facturas.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_facturas.setSelectionMode(QAbstractItemView.SingleSelection)
         self.table_facturas.setAlternatingRowColors(True)
-        self.table_facturas.itemDoubleClicked.connect(self.ver_detalles_factura)
+        self.table_facturas.verticalHeader().setVisible(False)
+        self.table_facturas.doubleClicked.connect(self.ver_detalles_factura)
         layout.addWidget(self.table_facturas)
 
-        # Cargar datos
-        self.cargar_facturas()
+        # Orden en SQL: el clic en el encabezado llama a FacturasTableModel.sort.
+        # Activarlo ordena por fecha descendente, que carga la primera página.
+        self.table_facturas.horizontalHeader().setSortIndicator(1, Qt.DescendingOrder)
+        self.table_facturas.setSortingEnabled(True)
 
         return tab
 
     def cargar_facturas(self):
-        try:
-            facturas = obtener_facturas_rango("2000-01-01", "2050-12-31")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error consultando facturas: {e}")
-            return
-
-        self.table_facturas.setRowCount(0)
-        for factura in facturas:
-            ridx = self.table_facturas.rowCount()
-            self.table_facturas.insertRow(ridx)
-
-            valores = [
-                factura.numero_factura,
-                factura.fecha,
-                factura.cliente_nombre,
-                factura.get_total_formateado(),
-                f"{factura.total_ves:,.2f} Bs" if factura.total_ves is not None else "0.00 Bs",
-            ]
-
-            for col, val in enumerate(valores):
-                item = QTableWidgetItem(str(val))
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                if col == 0:
-                    item.setData(Qt.UserRole, factura.id)
-                self.table_facturas.setItem(ridx, col, item)
+        self.facturas_model.recargar()
 
     def buscar_por_cliente(self):
-        termino = self.input_cliente.text().strip()
-        if not termino:
-            self.cargar_facturas()
-            return
-        try:
-            from ...services.factura_service import buscar_facturas
-            facturas = buscar_facturas(termino)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error buscando facturas: {e}")
-            return
+        self.facturas_model.set_filtro(self.input_cliente.text())
+
+    def _on_error_carga_facturas(self, mensaje):
+        # Los errores de fetchMore llegan por señal (Qt descarta las excepciones)
+        QMessageBox.critical(self, "Error", f"Error consultando facturas: {mensaje}")
 
-        self.table_facturas.setRowCount(0)
-        for factura in facturas:
-            ridx = self.table_facturas.rowCount()
-            self.table_facturas.insertRow(ridx)
-            valores = [
-                factura.numero_factura,
-                factura.fecha,
-                factura.cliente_nombre,
-                factura.get_total_formateado(),
-                f"{factura.total_ves:,.2f} Bs" if factura.total_ves is not None else "0.00 Bs",
-            ]
-            for col, val in enumerate(valores):
-                item = QTableWidgetItem(str(val))
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable) 
-                if col == 0:
-                    item.setData(Qt.UserRole, factura.id)
-                self.table_facturas.setItem(ridx, col, item)
+    def _factura_seleccionada(self):
+        row = self.table_facturas.currentIndex().row()
+        return self.facturas_model.factura_en(row)
 
     def eliminar_factura_seleccionada(self):
-        row = self.table_facturas.currentRow()
-        if row < 0:
+        factura = self._factura_seleccionada()
+        if factura is None:
             QMessageBox.warning(self, "Aviso", "Seleccione una factura")
             return
 
-        factura_id = self.table_facturas.item(row, 0).data(Qt.UserRole)
+        factura_id = factura.id
         reply = QMessageBox.question(
             self,
             "Confirmar",
@@ -182,27 +146,24 @@ class ReportesView(QWidget):
             QMessageBox.information(self, "Éxito", "Factura eliminada")
             self.cargar_facturas()
 
-    def ver_detalles_factura(self, item):
-        row = item.row()
-        factura_id = self.table_facturas.item(row, 0).data(Qt.UserRole)
+    def ver_detalles_factura(self, index):
+        factura_id = index.data(Qt.UserRole)
         dialog = InvoiceDetailDialog(factura_id, self)
         dialog.exec()
 
     def imprimir_factura_seleccionada(self):
         """Abre el diálogo de impresión para la factura seleccionada"""
-        row = self.table_facturas.currentRow()
-        if row < 0:
+        seleccionada = self._factura_seleccionada()
+        if seleccionada is None:
             QMessageBox.warning(self, "Aviso", "Seleccione una factura para imprimir")
             return
 
         try:
             # Obtener datos de la factura
-            # Obtener datos de la factura
-            factura_id = self.table_facturas.item(row, 0).data(Qt.UserRole)
-            numero_factura = self.table_facturas.item(row, 0).text()
-            fecha = self.table_facturas.item(row, 1).text()
-            cliente = self.table_facturas.item(row, 2).text()
-            total_text = self.table_facturas.item(row, 3).text()
+            factura_id = seleccionada.id
+            numero_factura = seleccionada.numero_factura
+            fecha = str(seleccionada.fecha)
+            cliente = seleccionada.cliente_nombre
 
             # Obtener factura completa para forma_pago y total_ves
             from ...services.factura_service import obtener_factura_por_id